@@ -0,0 +1,260 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Catalog-aware validation of A2UI server to client messages.
+
+A schema that lists every catalog component as an alternative makes the
+validator try each alternative for every component. Each component already
+names its type, the single key of the `component` wrapper in v0.8 and the
+`component` string in v0.9, so this validator checks the message without its
+components and then runs only the precompiled schema of each component's type.
+"""
+
+import dataclasses
+from typing import Any, Optional, Sequence
+
+from a2ui.a2ui_validator_registry import (
+    A2uiValidationError,
+    A2uiValidatorRegistry,
+    validator_registry,
+)
+
+_DRAFT_2020_12 = "https://json-schema.org/draft/2020-12/schema"
+
+
+@dataclasses.dataclass(frozen=True)
+class _CatalogLayout:
+  """Where a protocol version keeps components and how they name their type."""
+
+  message_key: str
+  # Path of the component schema inside the message schema
+  component_path: tuple[str, ...]
+  # Replaces that schema, components are checked by their own validators
+  generic_component: dict[str, Any]
+  # Whether the type is the only key of a wrapper object or a string property
+  type_in_wrapper: bool
+
+
+_LAYOUTS = {
+    "0.8": _CatalogLayout(
+        message_key="surfaceUpdate",
+        component_path=(
+            "properties",
+            "surfaceUpdate",
+            "properties",
+            "components",
+            "items",
+            "properties",
+            "component",
+        ),
+        generic_component={
+            "type": "object",
+            "minProperties": 1,
+            "maxProperties": 1,
+        },
+        type_in_wrapper=True,
+    ),
+    "0.9": _CatalogLayout(
+        message_key="updateComponents",
+        component_path=(
+            "$defs",
+            "UpdateComponentsMessage",
+            "properties",
+            "updateComponents",
+            "properties",
+            "components",
+            "items",
+        ),
+        generic_component={
+            "type": "object",
+            "properties": {"component": {"type": "string"}},
+            "required": ["component"],
+        },
+        type_in_wrapper=False,
+    ),
+}
+
+
+class CatalogValidator:
+  """Validates A2UI messages, dispatching each component on its type."""
+
+  def __init__(
+      self,
+      message_schema: dict[str, Any],
+      catalog: dict[str, Any],
+      version: str = "0.8",
+      resources: Sequence[dict[str, Any]] = (),
+      registry: Optional[A2uiValidatorRegistry] = None,
+  ):
+    """Compiles the message and component validators.
+
+    Args:
+        message_schema: The server to client schema of a single message.
+        catalog: The catalog document, its `components` object maps each
+          component type to its schema.
+        version: The A2UI protocol version, "0.8" or "0.9".
+        resources: Other schema documents the schemas `$ref`, like the v0.9
+          common types.
+        registry: The validator registry, the process-wide one by default.
+
+    Raises:
+        ValueError: If the version is not supported.
+    """
+    if version not in _LAYOUTS:
+      raise ValueError(
+          f"Unsupported A2UI version {version!r}, expected one of"
+          f" {sorted(_LAYOUTS)}"
+      )
+    registry = registry or validator_registry
+    self._layout = _LAYOUTS[version]
+    self.version = version
+
+    catalog_id = catalog.get("$id")
+    if catalog_id:
+      # Components keep $refs relative to their catalog, point into it
+      resources = (*resources, catalog)
+    resources = tuple(resource for resource in resources if "$id" in resource)
+
+    self._message_validator = registry.get_validator(
+        _replace_at(
+            message_schema,
+            self._layout.component_path,
+            self._layout.generic_component,
+        ),
+        resources,
+    )
+    self._component_validators = {}
+    for name, component_schema in catalog["components"].items():
+      if catalog_id:
+        component_schema = {
+            "$schema": catalog.get("$schema", _DRAFT_2020_12),
+            "$ref": f"{catalog_id}#/components/{name}",
+        }
+      self._component_validators[name] = registry.get_validator(
+          component_schema, resources
+      )
+
+  @classmethod
+  def from_resolved_schema(
+      cls,
+      message_schema: dict[str, Any],
+      registry: Optional[A2uiValidatorRegistry] = None,
+  ) -> "CatalogValidator":
+    """Builds a v0.8 validator from a schema with the catalog inlined.
+
+    Args:
+        message_schema: A single message schema like
+          `server_to_client_with_standard_catalog.json`, whose component
+          wrapper lists every catalog component as a property.
+        registry: The validator registry, the process-wide one by default.
+
+    Returns:
+        The validator for that schema.
+    """
+    component = message_schema
+    for key in _LAYOUTS["0.8"].component_path:
+      component = component[key]
+    return cls(
+        message_schema,
+        {"components": component["properties"]},
+        "0.8",
+        registry=registry,
+    )
+
+  @property
+  def component_types(self) -> list[str]:
+    """The component types of the catalog."""
+    return list(self._component_validators)
+
+  def __call__(self, message: Any) -> None:
+    """Validates a single message.
+
+    Args:
+        message: The A2UI message.
+
+    Raises:
+        A2uiValidationError: If the message or one of its components is
+          invalid.
+    """
+    self._message_validator(message)
+    body = message.get(self._layout.message_key)
+    if body is None:
+      return
+    for index, component in enumerate(body["components"]):
+      self.validate_component(component, index)
+
+  def validate_messages(self, messages: Sequence[Any]) -> None:
+    """Validates a list of messages.
+
+    Args:
+        messages: The A2UI messages.
+
+    Raises:
+        A2uiValidationError: If the value is not a list or a message is
+          invalid.
+    """
+    if not isinstance(messages, list):
+      raise A2uiValidationError(
+          f"Expected a list of messages, got {type(messages).__name__}."
+      )
+    for index, message in enumerate(messages):
+      try:
+        self(message)
+      except A2uiValidationError as e:
+        raise A2uiValidationError(f"Message {index}: {e.message}") from e
+
+  def validate_component(self, component: dict[str, Any], index: int = 0) -> None:
+    """Validates one component against the schema of its own type.
+
+    Args:
+        component: The component object from the components list.
+        index: Position of the component, used in error messages.
+
+    Raises:
+        A2uiValidationError: If the type is unknown or the component does not
+          match its schema.
+    """
+    component_id = component.get("id", "?")
+    if self._layout.type_in_wrapper:
+      ((component_type, properties),) = component["component"].items()
+    else:
+      component_type, properties = component["component"], component
+
+    validator = self._component_validators.get(component_type)
+    if validator is None:
+      raise A2uiValidationError(
+          f"Component {index} '{component_id}' has unknown type"
+          f" {component_type!r}."
+      )
+    try:
+      validator(properties)
+    except A2uiValidationError as e:
+      raise A2uiValidationError(
+          f"Component {index} '{component_id}' ({component_type}): {e.message}"
+      ) from e
+
+
+def _replace_at(
+    schema: dict[str, Any], path: Sequence[str], value: Any
+) -> dict[str, Any]:
+  """Copies the dicts along a path and sets the value at its end."""
+  if not path:
+    return value
+  head, rest = path[0], path[1:]
+  if head not in schema:
+    return schema
+  replaced = _replace_at(schema[head], rest, value)
+  if replaced is schema[head]:
+    return schema
+  return {**schema, head: replaced}
@@ -0,0 +1,180 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Deterministic repair of near-valid JSON produced by language models."""
+
+import json
+import re
+from typing import Any
+
+_FENCE_OPEN = re.compile(r"^```[A-Za-z0-9_-]*[ \t]*\n?")
+_FENCE_CLOSE = re.compile(r"\n?[ \t]*```$")
+_WORD = re.compile(r"[A-Za-z_$][\w$-]*")
+_LITERALS = {
+    "true": "true",
+    "false": "false",
+    "null": "null",
+    "True": "true",
+    "False": "false",
+    "None": "null",
+}
+_SMART_OPEN = "“"
+_SMART_CLOSE = "”"
+
+
+def strip_code_fence(text: str) -> str:
+  """Removes a markdown code fence around the text, if there is one.
+
+  Only a leading fence line like ```json and a trailing ``` are removed, the
+  text itself is never trimmed character by character.
+
+  Args:
+      text: The text to unwrap.
+
+  Returns:
+      The text inside the fence, stripped of surrounding whitespace.
+  """
+  text = text.strip()
+  text = _FENCE_OPEN.sub("", text, count=1)
+  text = _FENCE_CLOSE.sub("", text, count=1)
+  return text.strip()
+
+
+def repair_json(text: str) -> str:
+  """Rewrites near-valid JSON into valid JSON where the intent is unambiguous.
+
+  Handles code fences, // and /* */ comments, unquoted object keys, trailing
+  commas, curly double quotes used as string delimiters, Python literals and
+  output truncated before its closing quotes and brackets.
+
+  Args:
+      text: The text to repair.
+
+  Returns:
+      The repaired text. It is not guaranteed to parse when the input has
+      problems beyond the ones listed above.
+  """
+  text = strip_code_fence(text)
+  out: list[str] = []
+  closers: list[str] = []
+  index = 0
+  length = len(text)
+  while index < length:
+    char = text[index]
+    if char == '"' or char == _SMART_OPEN or char == _SMART_CLOSE:
+      index = _copy_string(text, index, out)
+      continue
+    if text.startswith("//", index):
+      newline = text.find("\n", index)
+      index = length if newline < 0 else newline
+      continue
+    if text.startswith("/*", index):
+      end = text.find("*/", index + 2)
+      index = length if end < 0 else end + 2
+      continue
+    if char == "{" or char == "[":
+      closers.append("}" if char == "{" else "]")
+      out.append(char)
+    elif char == "}" or char == "]":
+      _drop_trailing_comma(out)
+      if closers:
+        closers.pop()
+      out.append(char)
+    else:
+      match = _WORD.match(text, index)
+      if match:
+        word = match.group()
+        if _next_significant(text, match.end()) == ":":
+          out.append(json.dumps(word))
+        else:
+          out.append(_LITERALS.get(word, word))
+        index = match.end()
+        continue
+      out.append(char)
+    index += 1
+
+  # Truncated output, close whatever is still open
+  _drop_trailing_comma(out)
+  if _last_significant(out) == ":":
+    out.append("null")
+  out.extend(reversed(closers))
+  return "".join(out)
+
+
+def loads_with_repair(text: str) -> tuple[Any, bool]:
+  """Parses JSON, repairing it only when it does not parse as is.
+
+  Args:
+      text: The JSON text.
+
+  Returns:
+      The parsed value and whether a repair was needed.
+
+  Raises:
+      json.JSONDecodeError: If the text does not parse even after repair.
+  """
+  try:
+    return json.loads(text), False
+  except json.JSONDecodeError:
+    return json.loads(repair_json(text)), True
+
+
+def _copy_string(text: str, index: int, out: list[str]) -> int:
+  """Copies the string starting at index as a JSON string, returns its end."""
+  smart = text[index] != '"'
+  parts = ['"']
+  index += 1
+  length = len(text)
+  while index < length:
+    char = text[index]
+    if char == "\\":
+      # A lone backslash at the end of truncated output is dropped
+      parts.append(text[index : index + 2] if index + 1 < length else "")
+      index += 2
+      continue
+    if char == '"' or (smart and char == _SMART_CLOSE):
+      index += 1
+      break
+    if char == "\n":
+      parts.append("\\n")
+    elif char == "\t":
+      parts.append("\\t")
+    else:
+      parts.append(char)
+    index += 1
+  parts.append('"')
+  out.append("".join(parts))
+  return index
+
+
+def _next_significant(text: str, index: int) -> str:
+  while index < len(text) and text[index].isspace():
+    index += 1
+  return text[index] if index < len(text) else ""
+
+
+def _last_significant(out: list[str]) -> str:
+  for piece in reversed(out):
+    if not piece.isspace():
+      return piece
+  return ""
+
+
+def _drop_trailing_comma(out: list[str]) -> None:
+  for position in range(len(out) - 1, -1, -1):
+    if out[position].isspace():
+      continue
+    if out[position] == ",":
+      del out[position]
+    return
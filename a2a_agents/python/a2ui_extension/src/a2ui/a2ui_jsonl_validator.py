@@ -0,0 +1,247 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Validates JSONL captures of A2UI server to client messages.
+
+The file is read line by line and validated in batches, optionally in worker
+processes that each compile the validator of the protocol version once. At
+most a few batches per worker are in flight, so memory stays flat however
+large the file is. E.g.:
+
+    python -m a2ui.a2ui_jsonl_validator capture.jsonl --a2ui-version 0.8 --workers 8
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import dataclasses
+import json
+import os
+import pathlib
+import sys
+import time
+from typing import Callable, Iterator, Optional
+
+from a2ui.a2ui_spec_registry import A2uiSpecRegistry
+from a2ui.a2ui_validator_registry import A2uiValidationError
+
+# Batches queued per worker, enough to keep workers busy while reading
+_BATCHES_PER_WORKER = 2
+
+# Set in each worker process by _init_worker
+_worker_validator = None
+
+
+@dataclasses.dataclass
+class JsonlValidationSummary:
+  """Counts and timing of a JSONL validation run."""
+
+  lines: int = 0
+  invalid: int = 0
+  bytes: int = 0
+  seconds: float = 0.0
+
+  @property
+  def lines_per_second(self) -> float:
+    return self.lines / self.seconds if self.seconds else 0.0
+
+  @property
+  def megabytes_per_second(self) -> float:
+    return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+
+@dataclasses.dataclass
+class _BatchResult:
+  lines: int
+  bytes: int
+  failures: list[tuple[int, str]]
+
+
+def validate_jsonl(
+    path: pathlib.Path,
+    version: str = "0.9",
+    strict: bool = True,
+    workers: int = 1,
+    batch_size: int = 1000,
+    specification_dir: Optional[pathlib.Path] = None,
+    on_failure: Optional[Callable[[int, str], None]] = None,
+) -> JsonlValidationSummary:
+  """Validates every non-empty line of a JSONL file as one A2UI message.
+
+  Args:
+      path: The JSONL file.
+      version: The A2UI protocol version of the messages.
+      strict: Whether objects reject properties their schema does not list.
+      workers: Processes to validate batches in, 1 validates in this process.
+      batch_size: Lines per batch.
+      specification_dir: The `specification` directory, located as by the
+        spec registry when not given.
+      on_failure: Called with the 1-based line number and the reason of each
+        invalid line, in line order.
+
+  Returns:
+      The counts and timing of the run.
+
+  Raises:
+      ValueError: If the version is not supported.
+      FileNotFoundError: If the file or the specification is missing.
+  """
+  summary = JsonlValidationSummary()
+  start = time.perf_counter()
+  init_args = (version, strict, specification_dir)
+  batches = _read_batches(path, batch_size)
+
+  if workers <= 1:
+    _init_worker(*init_args)
+    results = map(_validate_batch, batches)
+  else:
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=init_args
+    )
+    results = _bounded_map(executor, batches, workers * _BATCHES_PER_WORKER)
+
+  for result in results:
+    summary.lines += result.lines
+    summary.bytes += result.bytes
+    summary.invalid += len(result.failures)
+    if on_failure:
+      for line_number, reason in result.failures:
+        on_failure(line_number, reason)
+
+  summary.seconds = time.perf_counter() - start
+  return summary
+
+
+def _read_batches(
+    path: pathlib.Path, batch_size: int
+) -> Iterator[tuple[int, list[bytes]]]:
+  """Yields the first line number and the raw lines of each batch."""
+  with open(path, "rb") as f:
+    first_line = 1
+    batch = []
+    for line in f:
+      batch.append(line)
+      if len(batch) == batch_size:
+        yield first_line, batch
+        first_line += len(batch)
+        batch = []
+    if batch:
+      yield first_line, batch
+
+
+def _bounded_map(
+    executor: concurrent.futures.Executor,
+    batches: Iterator[tuple[int, list[bytes]]],
+    max_pending: int,
+) -> Iterator[_BatchResult]:
+  """Like executor.map, but reads ahead only max_pending batches."""
+  pending = collections.deque()
+  with executor:
+    for batch in batches:
+      pending.append(executor.submit(_validate_batch, batch))
+      if len(pending) >= max_pending:
+        yield pending.popleft().result()
+    while pending:
+      yield pending.popleft().result()
+
+
+def _init_worker(
+    version: str, strict: bool, specification_dir: Optional[pathlib.Path]
+) -> None:
+  global _worker_validator
+  _worker_validator = A2uiSpecRegistry(specification_dir).get_validator(
+      version, strict
+  )
+
+
+def _validate_batch(batch: tuple[int, list[bytes]]) -> _BatchResult:
+  first_line, lines = batch
+  result = _BatchResult(lines=0, bytes=0, failures=[])
+  for line_number, line in enumerate(lines, first_line):
+    result.bytes += len(line)
+    if not line.strip():
+      continue
+    result.lines += 1
+    try:
+      _worker_validator(json.loads(line))
+    except json.JSONDecodeError as e:
+      result.failures.append((line_number, f"Invalid JSON: {e}"))
+    except A2uiValidationError as e:
+      result.failures.append((line_number, e.message))
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+      # Messages that are not objects, or components without a type key
+      result.failures.append((line_number, f"Malformed message: {e!r}"))
+  return result
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+  """Runs the command line validator.
+
+  Args:
+      argv: The command line arguments, sys.argv by default.
+
+  Returns:
+      0 when every line is valid, 1 otherwise.
+  """
+  parser = argparse.ArgumentParser(
+      description="Validates a JSONL file of A2UI server to client messages."
+  )
+  parser.add_argument("path", type=pathlib.Path, help="The JSONL file.")
+  parser.add_argument(
+      "--a2ui-version", default="0.9", help="Protocol version (default: 0.9)."
+  )
+  parser.add_argument(
+      "--lenient",
+      action="store_true",
+      help="Allow properties the specification does not list.",
+  )
+  parser.add_argument(
+      "--workers",
+      type=int,
+      default=1,
+      help="Worker processes, 0 for one per CPU (default: 1).",
+  )
+  parser.add_argument(
+      "--batch-size", type=int, default=1000, help="Lines per batch."
+  )
+  parser.add_argument(
+      "--specification-dir",
+      type=pathlib.Path,
+      help="The A2UI specification directory.",
+  )
+  args = parser.parse_args(argv)
+
+  def report(line_number: int, reason: str) -> None:
+    print(f"{args.path}:{line_number}: {reason}")
+
+  summary = validate_jsonl(
+      args.path,
+      version=args.a2ui_version,
+      strict=not args.lenient,
+      workers=args.workers or os.cpu_count(),
+      batch_size=args.batch_size,
+      specification_dir=args.specification_dir,
+      on_failure=report,
+  )
+  print(
+      f"{summary.lines} lines, {summary.invalid} invalid in"
+      f" {summary.seconds:.2f}s ({summary.lines_per_second:,.0f} lines/s,"
+      f" {summary.megabytes_per_second:.2f} MB/s)",
+      file=sys.stderr,
+  )
+  return 1 if summary.invalid else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,328 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Loads the A2UI specification schemas by protocol version.
+
+The JSON files under `specification/` are read once per process. Schemas that
+`$ref` other files are bundled into a single document whose references all
+point into its own `$defs`, so the same pre-resolved schema serves as prompt
+text and as the source of the compiled validators.
+"""
+
+import dataclasses
+import json
+import os
+import pathlib
+import threading
+import urllib.parse
+from typing import Any, Optional, Sequence
+
+from a2ui.a2ui_catalog_validator import CatalogValidator
+from a2ui.a2ui_validator_registry import A2uiValidatorRegistry, validator_registry
+
+SPECIFICATION_DIR_ENV = "A2UI_SPECIFICATION_DIR"
+
+
+@dataclasses.dataclass(frozen=True)
+class _SpecFiles:
+  """The files of one protocol version, relative to `specification/`."""
+
+  directory: str
+  message: str
+  catalog: Optional[str] = None
+  resources: tuple[str, ...] = ()
+
+
+_SPECS = {
+    # The specification ships v0.8 with the standard catalog already inlined
+    "0.8": _SpecFiles(
+        directory="v0_8/json",
+        message="server_to_client_with_standard_catalog.json",
+    ),
+    "0.9": _SpecFiles(
+        directory="v0_9/json",
+        message="server_to_client.json",
+        catalog="standard_catalog.json",
+        resources=("common_types.json",),
+    ),
+}
+
+# Keywords that close an object to properties its schema does not list
+_CLOSING_KEYWORDS = ("additionalProperties", "unevaluatedProperties")
+
+
+def find_specification_dir(start: Optional[pathlib.Path] = None) -> pathlib.Path:
+  """Locates the `specification` directory of the A2UI repository.
+
+  Args:
+      start: Where to start looking upwards, this module's directory and then
+        the working directory by default.
+
+  Returns:
+      The directory named by the A2UI_SPECIFICATION_DIR environment variable,
+      or the first `specification` directory found walking up from the start.
+
+  Raises:
+      FileNotFoundError: If no specification directory is found.
+  """
+  configured = os.environ.get(SPECIFICATION_DIR_ENV)
+  if configured:
+    return pathlib.Path(configured)
+
+  starts = [start] if start else [pathlib.Path(__file__).parent, pathlib.Path.cwd()]
+  for directory in starts:
+    for parent in (directory.resolve(), *directory.resolve().parents):
+      candidate = parent / "specification"
+      if (candidate / "v0_8").is_dir():
+        return candidate
+  raise FileNotFoundError(
+      "A2UI specification directory not found, set"
+      f" {SPECIFICATION_DIR_ENV} to its path."
+  )
+
+
+def bundle_schema(
+    schema: dict[str, Any], resources: Sequence[dict[str, Any]]
+) -> dict[str, Any]:
+  """Copies every schema a document `$ref`s from other files into its `$defs`.
+
+  Args:
+      schema: The root schema document.
+      resources: The documents its references point to, keyed by their `$id`.
+
+  Returns:
+      A self-contained copy of the schema. Referenced subschemas keep their
+      last pointer segment as name, prefixed with the file name when that name
+      is taken.
+  """
+  base_uri = schema.get("$id", "")
+  documents = {resource["$id"]: resource for resource in resources}
+  documents[base_uri] = schema
+  definitions = dict(schema.get("$defs", {}))
+  names: dict[tuple[str, str], str] = {}
+  pending: list[tuple[str, str, str]] = []
+
+  def reference(ref: str, uri: str) -> str:
+    target_uri, _, pointer = urllib.parse.urljoin(uri, ref).partition("#")
+    if target_uri == base_uri:
+      return f"#{pointer}"
+    key = (target_uri, pointer)
+    if key not in names:
+      name = pointer.rsplit("/", 1)[-1] or _file_stem(target_uri)
+      if name in definitions or name in names.values():
+        name = f"{_file_stem(target_uri)}_{name}"
+      names[key] = name
+      pending.append((target_uri, pointer, name))
+    return f"#/$defs/{names[key]}"
+
+  def rewrite(node: Any, uri: str) -> Any:
+    if isinstance(node, dict):
+      return {
+          key: reference(value, uri)
+          if key == "$ref" and isinstance(value, str)
+          else rewrite(value, uri)
+          for key, value in node.items()
+      }
+    if isinstance(node, list):
+      return [rewrite(item, uri) for item in node]
+    return node
+
+  bundled = rewrite(schema, base_uri)
+  while pending:
+    uri, pointer, name = pending.pop(0)
+    bundled.setdefault("$defs", {})[name] = rewrite(
+        _resolve_pointer(documents[uri], pointer), uri
+    )
+  return bundled
+
+
+def relax_schema(schema: Any) -> Any:
+  """Returns a copy of a schema that allows properties it does not list.
+
+  Args:
+      schema: The schema to relax.
+
+  Returns:
+      The schema without `additionalProperties: false` and
+      `unevaluatedProperties: false`.
+  """
+  if isinstance(schema, dict):
+    return {
+        key: relax_schema(value)
+        for key, value in schema.items()
+        if not (key in _CLOSING_KEYWORDS and value is False)
+    }
+  if isinstance(schema, list):
+    return [relax_schema(item) for item in schema]
+  return schema
+
+
+class A2uiSpecRegistry:
+  """Serves the specification schemas, prompt text and validators by version."""
+
+  def __init__(
+      self,
+      specification_dir: Optional[pathlib.Path] = None,
+      registry: Optional[A2uiValidatorRegistry] = None,
+  ):
+    """Initializes the registry, files are only read on first use.
+
+    Args:
+        specification_dir: The `specification` directory, located with
+          find_specification_dir when not given.
+        registry: The validator registry, the process-wide one by default.
+    """
+    self._specification_dir = specification_dir
+    self._registry = registry or validator_registry
+    self._lock = threading.RLock()
+    self._documents: dict[str, dict[str, Any]] = {}
+    self._schemas: dict[tuple[str, bool], dict[str, Any]] = {}
+    self._prompt_texts: dict[tuple[str, bool], str] = {}
+    self._validators: dict[tuple[str, bool], CatalogValidator] = {}
+
+  @property
+  def specification_dir(self) -> pathlib.Path:
+    """The `specification` directory the schemas are read from."""
+    if self._specification_dir is None:
+      self._specification_dir = find_specification_dir()
+    return self._specification_dir
+
+  @property
+  def versions(self) -> list[str]:
+    """The supported protocol versions."""
+    return list(_SPECS)
+
+  def get_schema(self, version: str, strict: bool = True) -> dict[str, Any]:
+    """Returns the self-contained schema of a single server to client message.
+
+    Args:
+        version: The A2UI protocol version, "0.8" or "0.9".
+        strict: Whether objects reject properties their schema does not list,
+          as in the specification.
+
+    Returns:
+        The pre-resolved schema, shared by every caller so it must not be
+        modified.
+
+    Raises:
+        ValueError: If the version is not supported.
+        FileNotFoundError: If a specification file is missing.
+    """
+    key = (version, strict)
+    schema = self._schemas.get(key)
+    if schema is None:
+      files = self._spec_files(version)
+      with self._lock:
+        schema = self._schemas.get(key)
+        if schema is None:
+          resources = [self._document(files, name) for name in _resource_names(files)]
+          schema = bundle_schema(self._document(files, files.message), resources)
+          if not strict:
+            schema = relax_schema(schema)
+          self._schemas[key] = schema
+    return schema
+
+  def get_prompt_text(self, version: str, strict: bool = True) -> str:
+    """Returns the schema of a single message as JSON text for prompts.
+
+    Args:
+        version: The A2UI protocol version, "0.8" or "0.9".
+        strict: Whether objects reject properties their schema does not list.
+
+    Returns:
+        The indented JSON text of get_schema.
+    """
+    key = (version, strict)
+    text = self._prompt_texts.get(key)
+    if text is None:
+      text = json.dumps(self.get_schema(version, strict), indent=2)
+      self._prompt_texts[key] = text
+    return text
+
+  def get_validator(self, version: str, strict: bool = True) -> CatalogValidator:
+    """Returns the compiled validator of a single message.
+
+    Args:
+        version: The A2UI protocol version, "0.8" or "0.9".
+        strict: Whether objects reject properties their schema does not list.
+
+    Returns:
+        A validator that checks each component against the catalog schema of
+        its type.
+    """
+    key = (version, strict)
+    validator = self._validators.get(key)
+    if validator is None:
+      files = self._spec_files(version)
+      with self._lock:
+        validator = self._validators.get(key)
+        if validator is None:
+          validator = self._build_validator(version, files, strict)
+          self._validators[key] = validator
+    return validator
+
+  def _build_validator(
+      self, version: str, files: _SpecFiles, strict: bool
+  ) -> CatalogValidator:
+    if files.catalog is None:
+      return CatalogValidator.from_resolved_schema(
+          self.get_schema(version, strict), self._registry
+      )
+    # Components are validated on their own, against the catalog document,
+    # so its $refs are resolved by the registry instead of the bundle
+    prepare = (lambda document: document) if strict else relax_schema
+    return CatalogValidator(
+        prepare(self._document(files, files.message)),
+        prepare(self._document(files, files.catalog)),
+        version,
+        [prepare(self._document(files, name)) for name in files.resources],
+        self._registry,
+    )
+
+  def _spec_files(self, version: str) -> _SpecFiles:
+    if version not in _SPECS:
+      raise ValueError(
+          f"Unsupported A2UI version {version!r}, expected one of {sorted(_SPECS)}"
+      )
+    return _SPECS[version]
+
+  def _document(self, files: _SpecFiles, name: str) -> dict[str, Any]:
+    path = f"{files.directory}/{name}"
+    document = self._documents.get(path)
+    if document is None:
+      with self._lock:
+        document = self._documents.get(path)
+        if document is None:
+          document = json.loads((self.specification_dir / path).read_text())
+          self._documents[path] = document
+    return document
+
+
+def _resource_names(files: _SpecFiles) -> list[str]:
+  return [*([files.catalog] if files.catalog else []), *files.resources]
+
+
+def _file_stem(uri: str) -> str:
+  return pathlib.PurePosixPath(urllib.parse.urlparse(uri).path).stem
+
+
+def _resolve_pointer(document: dict[str, Any], pointer: str) -> Any:
+  node = document
+  for token in pointer.split("/")[1:]:
+    token = token.replace("~1", "/").replace("~0", "~")
+    node = node[int(token)] if isinstance(node, list) else node[token]
+  return node
+
+
+spec_registry = A2uiSpecRegistry()
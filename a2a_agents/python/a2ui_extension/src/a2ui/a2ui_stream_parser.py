@@ -0,0 +1,293 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental parser for a streamed JSON array of A2UI messages."""
+
+import json
+from typing import Any, Callable, Optional
+
+from a2ui.a2ui_json_repair import repair_json
+
+DEFAULT_MAX_MESSAGE_SIZE = 1024 * 1024
+
+_BEFORE_ARRAY = 0
+_BETWEEN_MESSAGES = 1
+_IN_MESSAGE = 2
+_DONE = 3
+
+_WHITESPACE = " \t\r\n"
+_CODE_FENCE = "```json"
+_SMART_OPEN = "“"
+_SMART_CLOSE = "”"
+
+_NO_COMMENT = 0
+_COMMENT_START = 1
+_LINE_COMMENT = 2
+_BLOCK_COMMENT = 3
+_BLOCK_COMMENT_END = 4
+
+
+class A2uiStreamError(ValueError):
+  """Raised when the streamed text can no longer be a list of A2UI messages."""
+
+
+class A2uiStreamParser:
+  """Splits a streamed JSON array of A2UI messages into its top level elements.
+
+  The text can be fed in chunks of any size. Each element is parsed, validated
+  and returned as soon as its closing brace arrives, and only the text of the
+  element in progress is kept, so memory stays bounded by the largest message
+  instead of the whole output. A markdown code fence may open the array and
+  anything after the closing bracket is ignored.
+
+  With repair enabled, comments are skipped between messages, messages that do
+  not parse are passed through repair_json, and a message cut off by the end of
+  the stream is closed and returned by close().
+  """
+
+  def __init__(
+      self,
+      validator: Optional[Callable[[Any], None]] = None,
+      max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+      repair: bool = False,
+  ):
+    """Initializes the parser.
+
+    Args:
+        validator: Called with each parsed message, raises to reject it.
+        max_message_size: Largest number of characters a single message may
+          take before the stream is rejected.
+        repair: Whether to repair near-valid JSON instead of rejecting it.
+    """
+    self._validator = validator
+    self._repair = repair
+    self._max_message_size = max_message_size
+    self._state = _BEFORE_ARRAY
+    self._prefix = ""
+    self._expect_comma = False
+    self._chunks: list[str] = []
+    self._size = 0
+    self._depth = 0
+    self._in_string = False
+    self._string_close = '"'
+    self._escaped = False
+    self._comment = _NO_COMMENT
+    self._error: Optional[A2uiStreamError] = None
+    self.message_count = 0
+    self.repaired_count = 0
+
+  @property
+  def done(self) -> bool:
+    """Whether the closing bracket of the array has been read."""
+    return self._state == _DONE
+
+  def feed(self, text: str) -> list[Any]:
+    """Consumes the next chunk of the stream.
+
+    Args:
+        text: The next piece of the streamed text.
+
+    Returns:
+        The messages completed by this chunk, in stream order.
+
+    Raises:
+        A2uiStreamError: If the text is not a valid array of messages. The
+          parser keeps failing with the same error afterwards.
+    """
+    if self._error:
+      raise self._error
+    try:
+      return self._feed(text)
+    except A2uiStreamError as e:
+      self._error = e
+      raise
+
+  def close(self) -> list[Any]:
+    """Checks that the stream ended with a complete array.
+
+    Returns:
+        The message cut off by the end of the stream when repair is enabled,
+        otherwise an empty list.
+
+    Raises:
+        A2uiStreamError: If the stream failed or the array was not closed.
+    """
+    if self._error:
+      raise self._error
+    if self._state == _BEFORE_ARRAY:
+      raise A2uiStreamError("No JSON array found in the stream.")
+    if self._state == _DONE:
+      return []
+    if not self._repair:
+      raise A2uiStreamError(
+          f"Stream ended inside the array after {self.message_count} messages."
+      )
+    self._state = _DONE
+    if not self._chunks:
+      return []
+    try:
+      return [self._complete_message()]
+    except A2uiStreamError as e:
+      self._error = e
+      raise
+
+  def _feed(self, text: str) -> list[Any]:
+    messages = []
+    start = 0
+    index = 0
+    length = len(text)
+    while index < length:
+      if self._state == _DONE:
+        break
+
+      char = text[index]
+      if self._state == _BEFORE_ARRAY:
+        if char == "[":
+          self._state = _BETWEEN_MESSAGES
+        else:
+          self._check_prefix(char)
+        index += 1
+        continue
+
+      if self._comment != _NO_COMMENT and self._skip_comment(char):
+        index += 1
+        continue
+
+      if self._state == _BETWEEN_MESSAGES:
+        if char in _WHITESPACE:
+          pass
+        elif char == "]":
+          self._state = _DONE
+        elif char == "," and self._expect_comma:
+          self._expect_comma = False
+        elif char == "{" and not self._expect_comma:
+          self._state = _IN_MESSAGE
+          self._depth = 1
+          start = index
+        elif char == "/" and self._repair:
+          self._comment = _COMMENT_START
+        else:
+          raise A2uiStreamError(
+              f"Unexpected {char!r} after {self.message_count} messages."
+          )
+        index += 1
+        continue
+
+      # Inside a message, only track strings, comments and nesting until it closes
+      if self._in_string:
+        if self._escaped:
+          self._escaped = False
+        elif char == "\\":
+          self._escaped = True
+        elif char == '"' or char == self._string_close:
+          self._in_string = False
+      elif char == '"' or char == _SMART_OPEN:
+        self._in_string = True
+        self._string_close = _SMART_CLOSE if char == _SMART_OPEN else '"'
+      elif char == "/":
+        self._comment = _COMMENT_START
+      elif char in "{[":
+        self._depth += 1
+      elif char in "}]":
+        self._depth -= 1
+        if self._depth == 0:
+          self._append(text[start : index + 1])
+          messages.append(self._complete_message())
+          self._state = _BETWEEN_MESSAGES
+          self._expect_comma = True
+      index += 1
+
+    if self._state == _IN_MESSAGE:
+      self._append(text[start:])
+    return messages
+
+  def _skip_comment(self, char: str) -> bool:
+    """Advances the comment state by one character, False if it is not part of one."""
+    if self._comment == _COMMENT_START:
+      if char == "/":
+        self._comment = _LINE_COMMENT
+      elif char == "*":
+        self._comment = _BLOCK_COMMENT
+      elif self._state == _BETWEEN_MESSAGES:
+        raise A2uiStreamError(
+            f"Unexpected '/' after {self.message_count} messages."
+        )
+      else:
+        # A stray slash inside a message, left for json.loads to reject
+        self._comment = _NO_COMMENT
+        return False
+    elif self._comment == _LINE_COMMENT:
+      if char == "\n":
+        self._comment = _NO_COMMENT
+    elif self._comment == _BLOCK_COMMENT:
+      if char == "*":
+        self._comment = _BLOCK_COMMENT_END
+    elif char == "/":
+      self._comment = _NO_COMMENT
+    elif char != "*":
+      self._comment = _BLOCK_COMMENT
+    return True
+
+  def _check_prefix(self, char: str) -> None:
+    """Only whitespace and an opening code fence may come before the array."""
+    if char in _WHITESPACE and not self._prefix:
+      return
+    self._prefix += char
+    fence = self._prefix.rstrip()
+    if not _CODE_FENCE.startswith(fence.lower()) or (
+        fence != self._prefix and fence.lower() not in ("```", _CODE_FENCE)
+    ):
+      raise A2uiStreamError(
+          f"Expected a JSON array, found {self._prefix.strip()[:20]!r}."
+      )
+
+  def _repair_message(self, raw: str, error: json.JSONDecodeError) -> Any:
+    if self._repair:
+      try:
+        message = json.loads(repair_json(raw))
+        self.repaired_count += 1
+        return message
+      except json.JSONDecodeError:
+        pass
+    raise A2uiStreamError(
+        f"Message {self.message_count} is not valid JSON: {error}"
+    ) from error
+
+  def _append(self, text: str) -> None:
+    self._size += len(text)
+    if self._size > self._max_message_size:
+      raise A2uiStreamError(
+          f"Message {self.message_count} is larger than"
+          f" {self._max_message_size} characters."
+      )
+    self._chunks.append(text)
+
+  def _complete_message(self) -> Any:
+    raw = "".join(self._chunks)
+    self._chunks = []
+    self._size = 0
+    try:
+      message = json.loads(raw)
+    except json.JSONDecodeError as e:
+      message = self._repair_message(raw, e)
+    if self._validator:
+      try:
+        self._validator(message)
+      except Exception as e:
+        reason = getattr(e, "message", None) or str(e)
+        raise A2uiStreamError(
+            f"Message {self.message_count} is invalid: {reason}"
+        ) from e
+    self.message_count += 1
+    return message
@@ -0,0 +1,232 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide cache of compiled A2UI schema validators.
+
+Checking a schema and building a validator for it costs far more than
+validating a payload, so each distinct schema is parsed and compiled once and
+the validator is shared by every caller. Repeated lookups with the same schema
+object skip hashing its content. When the optional `fastjsonschema`
+package is installed it generates the validation code, otherwise `jsonschema`
+validators are used.
+"""
+
+import collections
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Callable, Sequence, Union
+
+import jsonschema
+import referencing
+import referencing.jsonschema
+
+try:
+  import fastjsonschema
+except ImportError:  # Optional, the jsonschema backend covers every schema
+  fastjsonschema = None
+
+logger = logging.getLogger(__name__)
+
+Schema = Union[dict[str, Any], str]
+Validator = Callable[[Any], None]
+
+# Schema objects remembered by identity, callers that build a new schema per
+# call fall back to hashing without growing the cache
+_MAX_IDENTITY_ENTRIES = 256
+
+
+class A2uiValidationError(ValueError):
+  """Raised by registry validators when an instance does not match its schema.
+
+  Attributes:
+      message: The reason reported by the validation backend.
+  """
+
+  def __init__(self, message: str):
+    super().__init__(message)
+    self.message = message
+
+
+def schema_hash(schema: Schema) -> str:
+  """Returns a stable hash of a schema.
+
+  Args:
+      schema: The schema as a dict or as JSON text.
+
+  Returns:
+      A hex digest. Dicts with the same content hash alike regardless of key
+      order, JSON text is hashed as is.
+  """
+  if not isinstance(schema, str):
+    schema = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+  return hashlib.sha256(schema.encode("utf-8")).hexdigest()
+
+
+class A2uiValidatorRegistry:
+  """Parses, compiles and caches validators by schema hash.
+
+  Schemas are shared by every caller, so they must not be modified after their
+  first lookup.
+  """
+
+  def __init__(self, use_fast_validator: bool = True):
+    """Initializes the registry.
+
+    Args:
+        use_fast_validator: Whether to compile schemas with `fastjsonschema`
+          when it is installed.
+    """
+    self._use_fast_validator = use_fast_validator and fastjsonschema is not None
+    self._lock = threading.Lock()
+    self._schemas: dict[str, dict[str, Any]] = {}
+    self._validators: dict[str, Validator] = {}
+    # (id of the schema, ids of the resources) -> (the objects, validator), the
+    # objects are kept so their ids are not reused while cached
+    self._by_identity: collections.OrderedDict[
+        tuple[int, ...], tuple[tuple[Any, ...], Validator]
+    ] = collections.OrderedDict()
+
+  def load_schema(self, schema_json: str) -> dict[str, Any]:
+    """Parses a JSON schema string once.
+
+    Args:
+        schema_json: The schema as JSON text.
+
+    Returns:
+        The parsed schema, shared by every caller so it must not be modified.
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON.
+    """
+    key = schema_hash(schema_json)
+    schema = self._schemas.get(key)
+    if schema is None:
+      schema = json.loads(schema_json)
+      with self._lock:
+        schema = self._schemas.setdefault(key, schema)
+    return schema
+
+  def get_validator(
+      self, schema: Schema, resources: Sequence[dict[str, Any]] = ()
+  ) -> Validator:
+    """Returns the compiled validator of a schema, building it on first use.
+
+    Args:
+        schema: The schema as a dict or as JSON text.
+        resources: Schema documents with an `$id` that `$ref`s in the schema
+          point to, e.g. a catalog and its common types.
+
+    Returns:
+        A callable that raises A2uiValidationError for invalid instances.
+
+    Raises:
+        jsonschema.exceptions.SchemaError: If the schema itself is invalid.
+    """
+    identity = (id(schema), *(id(resource) for resource in resources))
+    entry = self._by_identity.get(identity)
+    if entry is not None:
+      return entry[1]
+
+    objects = (schema, *resources)
+    key = schema_hash(schema)
+    if resources:
+      key = schema_hash([key, *(schema_hash(resource) for resource in resources)])
+    validator = self._validators.get(key)
+    if validator is None:
+      if isinstance(schema, str):
+        schema = self.load_schema(schema)
+      with self._lock:
+        validator = self._validators.get(key)
+        if validator is None:
+          validator = self._compile(schema, resources)
+          self._validators[key] = validator
+          logger.info(f"Compiled A2UI schema validator {key[:12]}")
+
+    with self._lock:
+      self._by_identity[identity] = (objects, validator)
+      while len(self._by_identity) > _MAX_IDENTITY_ENTRIES:
+        self._by_identity.popitem(last=False)
+    return validator
+
+  def validate(self, instance: Any, schema: Schema) -> None:
+    """Validates an instance with the cached validator of a schema.
+
+    Args:
+        instance: The value to validate.
+        schema: The schema as a dict or as JSON text.
+
+    Raises:
+        A2uiValidationError: If the instance does not match the schema.
+    """
+    self.get_validator(schema)(instance)
+
+  def clear(self) -> None:
+    """Drops every cached schema and validator."""
+    with self._lock:
+      self._schemas.clear()
+      self._validators.clear()
+      self._by_identity.clear()
+
+  def _compile(
+      self, schema: dict[str, Any], resources: Sequence[dict[str, Any]]
+  ) -> Validator:
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+
+    # Cross document references are only resolved by the jsonschema backend
+    if self._use_fast_validator and not resources:
+      try:
+        return _fast_validator(fastjsonschema.compile(schema))
+      except fastjsonschema.JsonSchemaDefinitionException as e:
+        # Drafts or keywords fastjsonschema does not generate code for
+        logger.info(f"Falling back to jsonschema for this schema: {e}")
+
+    if not resources:
+      return _jsonschema_validator(validator_class(schema))
+    registry = referencing.Registry().with_resources(
+        (
+            resource["$id"],
+            referencing.Resource.from_contents(
+                resource,
+                default_specification=referencing.jsonschema.DRAFT202012,
+            ),
+        )
+        for resource in resources
+    )
+    return _jsonschema_validator(validator_class(schema, registry=registry))
+
+
+def _fast_validator(compiled: Callable[[Any], Any]) -> Validator:
+  def validate(instance: Any) -> None:
+    try:
+      compiled(instance)
+    except fastjsonschema.JsonSchemaValueException as e:
+      raise A2uiValidationError(e.message) from e
+
+  return validate
+
+
+def _jsonschema_validator(validator: jsonschema.protocols.Validator) -> Validator:
+  def validate(instance: Any) -> None:
+    # Stops at the first error instead of collecting all of them to rank
+    error = next(validator.iter_errors(instance), None)
+    if error is not None:
+      raise A2uiValidationError(error.message) from error
+
+  return validate
+
+
+validator_registry = A2uiValidatorRegistry()
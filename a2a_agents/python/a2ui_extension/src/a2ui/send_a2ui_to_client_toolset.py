@@ -82,11 +82,10 @@ import json
 import logging
 from typing import Any, Awaitable, Callable, Optional, TypeAlias, Union
 
-import jsonschema
-
 from a2a import types as a2a_types
 from a2ui.a2ui_extension import create_a2ui_part
 from a2ui.a2ui_schema_utils import wrap_as_json_array
+from a2ui.a2ui_validator_registry import Validator, validator_registry
 from google.adk.a2a.converters import part_converter
 from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.models import LlmRequest
@@ -166,6 +165,9 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
 
     def __init__(self, a2ui_schema: Union[dict[str, Any], A2uiSchemaProvider]):
       self._a2ui_schema = a2ui_schema
+      # Validator of the last resolved schema, see _get_validator
+      self._validator_schema = None
+      self._validator = None
       super().__init__(
           name=self.TOOL_NAME,
           description=(
@@ -224,6 +226,25 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
       a2ui_schema = await self._resolve_a2ui_schema(ctx)
       return wrap_as_json_array(a2ui_schema)
 
+    def _get_validator(self, a2ui_schema: dict[str, Any]) -> Validator:
+      """Returns the validator of the wrapped schema.
+
+      The registry is only consulted again when the schema provider returns
+      another schema object, so each call does not hash the schema.
+
+      Args:
+          a2ui_schema: The resolved, unwrapped A2UI schema.
+
+      Returns:
+          The validator of the schema wrapped as a JSON array.
+      """
+      if a2ui_schema is not self._validator_schema:
+        self._validator = validator_registry.get_validator(
+            wrap_as_json_array(a2ui_schema)
+        )
+        self._validator_schema = a2ui_schema
+      return self._validator
+
     async def process_llm_request(
         self, *, tool_context: ToolContext, llm_request: LlmRequest
     ) -> None:
@@ -261,8 +282,9 @@ class SendA2uiToClientToolset(base_toolset.BaseToolset):
           )
           a2ui_json_payload = [a2ui_json_payload]
 
-        a2ui_schema = await self.get_a2ui_schema(tool_context)
-        jsonschema.validate(instance=a2ui_json_payload, schema=a2ui_schema)
+        a2ui_schema = await self._resolve_a2ui_schema(tool_context)
+        # Compiled once per distinct schema and shared across calls
+        self._get_validator(a2ui_schema)(a2ui_json_payload)
 
         logger.info(
             f"Validated call to tool {self.TOOL_NAME} with {self.A2UI_JSON_ARG_NAME}"
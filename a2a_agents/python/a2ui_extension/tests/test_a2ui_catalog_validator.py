@@ -0,0 +1,146 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pathlib
+
+import pytest
+from a2ui.a2ui_catalog_validator import CatalogValidator
+from a2ui.a2ui_validator_registry import A2uiValidationError, A2uiValidatorRegistry
+
+SPECIFICATION_DIR = pathlib.Path(__file__).parents[4] / "specification"
+
+
+def _load(version, name):
+  path = SPECIFICATION_DIR / version / "json" / name
+  if not path.exists():
+    pytest.skip(f"{path} not found")
+  return json.loads(path.read_text())
+
+
+@pytest.fixture
+def registry():
+  return A2uiValidatorRegistry(use_fast_validator=False)
+
+
+@pytest.fixture
+def validator_v08(registry):
+  return CatalogValidator.from_resolved_schema(
+      _load("v0_8", "server_to_client_with_standard_catalog.json"), registry
+  )
+
+
+@pytest.fixture
+def validator_v09(registry):
+  return CatalogValidator(
+      _load("v0_9", "server_to_client.json"),
+      _load("v0_9", "standard_catalog.json"),
+      version="0.9",
+      resources=[_load("v0_9", "common_types.json")],
+      registry=registry,
+  )
+
+
+def _surface_update_v08(*components):
+  return {"surfaceUpdate": {"surfaceId": "main", "components": list(components)}}
+
+
+def _update_components_v09(*components):
+  return {"updateComponents": {"surfaceId": "main", "components": list(components)}}
+
+
+def test_v08_valid_messages(validator_v08):
+  assert "Text" in validator_v08.component_types
+  validator_v08.validate_messages([
+      {"beginRendering": {"surfaceId": "main", "root": "title"}},
+      _surface_update_v08(
+          {"id": "title", "component": {"Text": {"text": {"literalString": "Hi"}}}},
+          {
+              "id": "column",
+              "component": {
+                  "Column": {"children": {"explicitList": ["title"]}}
+              },
+          },
+      ),
+  ])
+
+
+def test_v08_points_at_invalid_component(validator_v08):
+  message = _surface_update_v08(
+      {"id": "title", "component": {"Text": {"text": {"literalString": "Hi"}}}},
+      {"id": "photo", "component": {"Image": {"width": 10}}},
+  )
+  with pytest.raises(A2uiValidationError) as excinfo:
+    validator_v08(message)
+  assert excinfo.value.message.startswith("Component 1 'photo' (Image):")
+
+
+def test_v08_unknown_component_type(validator_v08):
+  message = _surface_update_v08({"id": "x", "component": {"Carousel": {}}})
+  with pytest.raises(A2uiValidationError, match="unknown type 'Carousel'"):
+    validator_v08(message)
+
+
+def test_v08_component_wrapper_with_two_types(validator_v08):
+  message = _surface_update_v08({
+      "id": "x",
+      "component": {
+          "Text": {"text": {"literalString": "Hi"}},
+          "Divider": {},
+      },
+  })
+  with pytest.raises(A2uiValidationError):
+    validator_v08(message)
+
+
+def test_v08_invalid_message_outside_components(validator_v08):
+  with pytest.raises(A2uiValidationError):
+    validator_v08({"beginRendering": {"root": "title"}})
+
+
+def test_v09_valid_message(validator_v09):
+  validator_v09(
+      _update_components_v09(
+          {"id": "root", "component": "Column", "children": ["title"]},
+          {"id": "title", "component": "Text", "text": "Hello", "variant": "h1"},
+      )
+  )
+
+
+def test_v09_points_at_invalid_component(validator_v09):
+  message = _update_components_v09(
+      {"id": "title", "component": "Text", "text": "Hello"},
+      {"id": "subtitle", "component": "Text", "variant": "huge", "text": "Hi"},
+  )
+  with pytest.raises(A2uiValidationError) as excinfo:
+    validator_v09(message)
+  assert excinfo.value.message.startswith("Component 1 'subtitle' (Text):")
+
+
+def test_v09_unknown_component_type(validator_v09):
+  message = _update_components_v09({"id": "x", "component": "Carousel"})
+  with pytest.raises(A2uiValidationError, match="unknown type 'Carousel'"):
+    validator_v09(message)
+
+
+def test_validators_shared_through_registry(registry):
+  schema = _load("v0_8", "server_to_client_with_standard_catalog.json")
+  first = CatalogValidator.from_resolved_schema(schema, registry)
+  second = CatalogValidator.from_resolved_schema(schema, registry)
+  assert first._component_validators["Text"] is second._component_validators["Text"]
+
+
+def test_unsupported_version():
+  with pytest.raises(ValueError, match="Unsupported A2UI version"):
+    CatalogValidator({}, {"components": {}}, version="1.0")
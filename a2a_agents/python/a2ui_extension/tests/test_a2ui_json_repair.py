@@ -0,0 +1,70 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2ui.a2ui_json_repair import loads_with_repair, repair_json, strip_code_fence
+
+
+def test_strip_code_fence_by_prefix():
+  assert strip_code_fence('```json\n[{"a": 1}]\n```') == '[{"a": 1}]'
+  assert strip_code_fence("```\n[]```") == "[]"
+  # Not a character set, leading "j" and "s" of the content are kept
+  assert strip_code_fence('```json\njson_value```') == "json_value"
+  assert strip_code_fence(' {"a": 1} ') == '{"a": 1}'
+
+
+def test_repairs_examples_constructs():
+  text = """[
+    {
+      "surfaceUpdate": {
+        "components": [
+          {"id": "item", weight: 1}, // Populate this with restaurant data
+          /* block */
+        ],
+      },
+    },
+  ]"""
+  assert json.loads(repair_json(text)) == [
+      {"surfaceUpdate": {"components": [{"id": "item", "weight": 1}]}}
+  ]
+
+
+def test_repairs_smart_quotes_and_literals():
+  text = '{“name”: “Han Dynasty”, "open": True, "closed": None}'
+  assert json.loads(repair_json(text)) == {
+      "name": "Han Dynasty",
+      "open": True,
+      "closed": None,
+  }
+
+
+def test_keeps_strings_untouched():
+  text = '{"text": "a // b, /* c */ key: 1, }"}'
+  assert json.loads(repair_json(text)) == {"text": "a // b, /* c */ key: 1, }"}
+
+
+def test_closes_truncated_output():
+  assert json.loads(repair_json('[{"a": [1, 2')) == [{"a": [1, 2]}]
+  assert json.loads(repair_json('[{"a": "trunc')) == [{"a": "trunc"}]
+  assert json.loads(repair_json('[{"a": 1, "b":')) == [{"a": 1, "b": None}]
+  assert json.loads(repair_json('[{"a": 1},')) == [{"a": 1}]
+
+
+def test_loads_with_repair():
+  assert loads_with_repair('{"a": 1}') == ({"a": 1}, False)
+  assert loads_with_repair("{a: 1,}") == ({"a": 1}, True)
+  with pytest.raises(json.JSONDecodeError):
+    loads_with_repair("{a: b c}")
@@ -0,0 +1,81 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pathlib
+
+import pytest
+from a2ui.a2ui_jsonl_validator import main, validate_jsonl
+
+SPECIFICATION_DIR = pathlib.Path(__file__).parents[4] / "specification"
+
+VALID = {"createSurface": {"surfaceId": "main", "catalogId": "a2ui.dev:standard"}}
+INVALID_COMPONENT = {
+    "updateComponents": {
+        "surfaceId": "main",
+        "components": [{"id": "title", "component": "Text"}],
+    }
+}
+
+
+@pytest.fixture
+def capture(tmp_path):
+  if not SPECIFICATION_DIR.is_dir():
+    pytest.skip(f"{SPECIFICATION_DIR} not found")
+  lines = [json.dumps(VALID)] * 5 + [
+      "",
+      json.dumps(INVALID_COMPONENT),
+      '{"createSurface": ',
+      json.dumps(VALID),
+  ]
+  path = tmp_path / "capture.jsonl"
+  path.write_text("\n".join(lines) + "\n")
+  return path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reports_failures_by_line(capture, workers):
+  failures = []
+  summary = validate_jsonl(
+      capture,
+      workers=workers,
+      batch_size=2,
+      specification_dir=SPECIFICATION_DIR,
+      on_failure=lambda line, reason: failures.append((line, reason)),
+  )
+
+  assert summary.lines == 8
+  assert summary.invalid == 2
+  assert summary.bytes == capture.stat().st_size
+  assert [line for line, _ in failures] == [7, 8]
+  assert "'title' (Text)" in failures[0][1]
+  assert failures[1][1].startswith("Invalid JSON")
+
+
+def test_specification_example_is_valid():
+  example = SPECIFICATION_DIR / "v0_9/test/cases/contact_form_example.jsonl"
+  if not example.exists():
+    pytest.skip(f"{example} not found")
+  summary = validate_jsonl(example, specification_dir=SPECIFICATION_DIR)
+  assert summary.lines > 0
+  assert summary.invalid == 0
+  assert summary.lines_per_second > 0
+
+
+def test_main_exit_code(capture, capsys):
+  args = [str(capture), "--specification-dir", str(SPECIFICATION_DIR)]
+  assert main(args) == 1
+  out, err = capsys.readouterr()
+  assert f"{capture}:7:" in out
+  assert "8 lines, 2 invalid" in err
@@ -0,0 +1,163 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pathlib
+
+import jsonschema
+import pytest
+from a2ui.a2ui_spec_registry import (
+    A2uiSpecRegistry,
+    bundle_schema,
+    find_specification_dir,
+    relax_schema,
+)
+from a2ui.a2ui_validator_registry import A2uiValidationError, A2uiValidatorRegistry
+
+SPECIFICATION_DIR = pathlib.Path(__file__).parents[4] / "specification"
+
+UPDATE_COMPONENTS = {
+    "updateComponents": {
+        "surfaceId": "main",
+        "components": [
+            {"id": "root", "component": "Column", "children": ["title"]},
+            {"id": "title", "component": "Text", "text": {"path": "/title"}},
+        ],
+    }
+}
+
+
+@pytest.fixture
+def spec_registry():
+  if not SPECIFICATION_DIR.is_dir():
+    pytest.skip(f"{SPECIFICATION_DIR} not found")
+  return A2uiSpecRegistry(
+      SPECIFICATION_DIR, A2uiValidatorRegistry(use_fast_validator=False)
+  )
+
+
+def test_bundle_schema_inlines_external_references():
+  common = {
+      "$id": "https://example.com/common.json",
+      "$defs": {
+          "Name": {"type": "string", "minLength": 1},
+          "Person": {
+              "type": "object",
+              "properties": {"name": {"$ref": "#/$defs/Name"}},
+          },
+      },
+  }
+  schema = {
+      "$id": "https://example.com/root.json",
+      "type": "object",
+      "properties": {
+          "owner": {"$ref": "common.json#/$defs/Person"},
+          "title": {"$ref": "#/$defs/Name"},
+      },
+      "$defs": {"Name": {"type": "string"}},
+  }
+
+  bundled = bundle_schema(schema, [common])
+
+  assert bundled["properties"]["owner"] == {"$ref": "#/$defs/Person"}
+  assert bundled["properties"]["title"] == {"$ref": "#/$defs/Name"}
+  # The root already defines Name, the external one is prefixed
+  assert bundled["$defs"]["Person"]["properties"]["name"] == {
+      "$ref": "#/$defs/common_Name"
+  }
+  assert bundled["$defs"]["common_Name"] == common["$defs"]["Name"]
+  assert "$defs" not in bundle_schema({"type": "string"}, [])
+
+
+def test_relax_schema():
+  schema = {
+      "type": "object",
+      "additionalProperties": False,
+      "properties": {"a": {"unevaluatedProperties": False, "type": "object"}},
+      "patternProperties": {"^x": {"additionalProperties": {"type": "string"}}},
+  }
+  assert relax_schema(schema) == {
+      "type": "object",
+      "properties": {"a": {"type": "object"}},
+      "patternProperties": {"^x": {"additionalProperties": {"type": "string"}}},
+  }
+
+
+def test_find_specification_dir(tmp_path, monkeypatch):
+  monkeypatch.delenv("A2UI_SPECIFICATION_DIR", raising=False)
+  (tmp_path / "specification" / "v0_8").mkdir(parents=True)
+  nested = tmp_path / "a" / "b"
+  nested.mkdir(parents=True)
+  assert find_specification_dir(nested) == tmp_path / "specification"
+
+  monkeypatch.setenv("A2UI_SPECIFICATION_DIR", "/somewhere/else")
+  assert find_specification_dir(nested) == pathlib.Path("/somewhere/else")
+
+
+def test_v09_schema_is_self_contained(spec_registry):
+  schema = spec_registry.get_schema("0.9")
+  text = spec_registry.get_prompt_text("0.9")
+
+  assert "common_types.json" not in text
+  assert "standard_catalog.json" not in text
+  assert json.loads(text) == schema
+  assert "Text" in schema["$defs"] and "DynamicString" in schema["$defs"]
+
+  validator = jsonschema.Draft202012Validator(schema)
+  assert validator.is_valid(UPDATE_COMPONENTS)
+  assert not validator.is_valid({"createSurface": {"surfaceId": "main"}})
+
+
+def test_schemas_and_validators_cached(spec_registry):
+  assert spec_registry.get_schema("0.9") is spec_registry.get_schema("0.9")
+  assert spec_registry.get_prompt_text("0.8") is spec_registry.get_prompt_text(
+      "0.8"
+  )
+  assert spec_registry.get_validator("0.9") is spec_registry.get_validator(
+      "0.9"
+  )
+  assert spec_registry.get_schema("0.8") is not spec_registry.get_schema(
+      "0.8", strict=False
+  )
+
+
+def test_v09_validator(spec_registry):
+  validator = spec_registry.get_validator("0.9")
+  validator(UPDATE_COMPONENTS)
+
+  extra = {"id": "title", "component": "Text", "text": "Hi", "color": "red"}
+  message = {"updateComponents": {"surfaceId": "main", "components": [extra]}}
+  with pytest.raises(A2uiValidationError, match="'title' \\(Text\\)"):
+    validator(message)
+  spec_registry.get_validator("0.9", strict=False)(message)
+
+
+def test_v08_lenient_schema_allows_extra_properties(spec_registry):
+  message = {
+      "surfaceUpdate": {
+          "surfaceId": "main",
+          "components": [{
+              "id": "logo",
+              "component": {"Image": {"url": {"path": "/logo"}, "width": 40}},
+          }],
+      }
+  }
+  with pytest.raises(A2uiValidationError):
+    spec_registry.get_validator("0.8")(message)
+  spec_registry.get_validator("0.8", strict=False)(message)
+
+
+def test_unsupported_version(spec_registry):
+  with pytest.raises(ValueError, match="Unsupported A2UI version"):
+    spec_registry.get_schema("1.0")
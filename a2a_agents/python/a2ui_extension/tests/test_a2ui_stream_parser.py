@@ -0,0 +1,177 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2ui.a2ui_stream_parser import A2uiStreamError, A2uiStreamParser
+
+MESSAGES = [
+    {"beginRendering": {"surfaceId": "main", "root": "root-column"}},
+    {
+        "surfaceUpdate": {
+            "surfaceId": "main",
+            "components": [{
+                "id": "title",
+                "component": {"Text": {"text": {"literalString": "[a] {b} \"c\" \\"}}},
+            }],
+        }
+    },
+    {
+        "dataModelUpdate": {
+            "surfaceId": "main",
+            "contents": [{"key": "items", "valueString": "}]"}],
+        }
+    },
+]
+
+
+def _feed_all(parser, chunks):
+  messages = []
+  for chunk in chunks:
+    messages.extend(parser.feed(chunk))
+  return messages
+
+
+def test_whole_array():
+  parser = A2uiStreamParser()
+  assert parser.feed(json.dumps(MESSAGES)) == MESSAGES
+  assert parser.done
+  parser.close()
+
+
+def test_single_character_chunks():
+  parser = A2uiStreamParser()
+  text = json.dumps(MESSAGES, indent=2)
+  assert _feed_all(parser, text) == MESSAGES
+  assert parser.message_count == 3
+
+
+def test_messages_emitted_as_they_complete():
+  parser = A2uiStreamParser()
+  text = json.dumps(MESSAGES)
+  first_end = len(json.dumps(MESSAGES[0])) + 1
+
+  assert parser.feed(text[: first_end - 1]) == []
+  assert parser.feed(text[first_end - 1 : first_end + 5]) == [MESSAGES[0]]
+  assert not parser.done
+
+
+def test_skips_code_fence_and_trailing_text():
+  parser = A2uiStreamParser()
+  text = "\n```json\n" + json.dumps(MESSAGES) + "\n```\n"
+  assert _feed_all(parser, [text[:6], text[6:]]) == MESSAGES
+  assert parser.done
+
+
+def test_skips_upper_case_code_fence():
+  parser = A2uiStreamParser()
+  text = "```JSON\n" + json.dumps(MESSAGES)
+  assert _feed_all(parser, [text[:4], text[4:]]) == MESSAGES
+
+
+def test_empty_array():
+  parser = A2uiStreamParser()
+  assert parser.feed("[ ]") == []
+  parser.close()
+
+
+def test_validator_rejects_message():
+  def validator(message):
+    if "beginRendering" in message:
+      raise ValueError("no rendering yet")
+
+  parser = A2uiStreamParser(validator=validator)
+  with pytest.raises(A2uiStreamError, match="no rendering yet"):
+    parser.feed(json.dumps(MESSAGES))
+  # The parser stays failed
+  with pytest.raises(A2uiStreamError):
+    parser.feed("]")
+
+
+def test_invalid_json_message():
+  parser = A2uiStreamParser()
+  with pytest.raises(A2uiStreamError, match="not valid JSON"):
+    parser.feed('[{"a": 1,}]')
+
+
+def test_missing_comma_between_messages():
+  parser = A2uiStreamParser()
+  with pytest.raises(A2uiStreamError, match="Unexpected"):
+    parser.feed('[{"a": 1} {"b": 2}]')
+
+
+def test_non_object_element():
+  parser = A2uiStreamParser()
+  with pytest.raises(A2uiStreamError):
+    parser.feed('["text"]')
+
+
+def test_message_size_limit():
+  parser = A2uiStreamParser(max_message_size=20)
+  parser.feed('[{"a": "')
+  with pytest.raises(A2uiStreamError, match="larger than"):
+    parser.feed("x" * 30)
+
+
+def test_close_reports_unfinished_array():
+  parser = A2uiStreamParser()
+  parser.feed(json.dumps(MESSAGES)[:-1])
+  with pytest.raises(A2uiStreamError, match="after 3 messages"):
+    parser.close()
+
+  with pytest.raises(A2uiStreamError, match="No JSON array"):
+    A2uiStreamParser().close()
+
+
+def test_text_before_array_fails_fast():
+  parser = A2uiStreamParser()
+  parser.feed("\n```js")
+  with pytest.raises(A2uiStreamError, match="Expected a JSON array"):
+    parser.feed("on\nHere is the UI: [")
+
+  with pytest.raises(A2uiStreamError, match="Expected a JSON array"):
+    A2uiStreamParser().feed('{"beginRendering": {}}')
+
+
+def test_repair_near_valid_messages():
+  text = """```json
+  [
+    // Start rendering
+    {"beginRendering": {surfaceId: "main", "root": "root-column",}},
+    {"surfaceUpdate": {"surfaceId": “main”, "components": []}}, /* done */
+  ]
+  ```"""
+  parser = A2uiStreamParser(repair=True)
+  messages = _feed_all(parser, text)
+  assert messages == [
+      {"beginRendering": {"surfaceId": "main", "root": "root-column"}},
+      {"surfaceUpdate": {"surfaceId": "main", "components": []}},
+  ]
+  assert parser.repaired_count == 2
+  assert parser.close() == []
+
+
+def test_comments_rejected_without_repair():
+  parser = A2uiStreamParser()
+  with pytest.raises(A2uiStreamError, match="Unexpected '/'"):
+    parser.feed("[// comment\n]")
+
+
+def test_close_repairs_truncated_message():
+  parser = A2uiStreamParser(repair=True)
+  text = json.dumps(MESSAGES)
+  parser.feed(text[: text.rindex('"}]')])
+  assert parser.close() == [MESSAGES[2]]
+  assert parser.repaired_count == 1
@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import jsonschema
+import pytest
+from a2ui import a2ui_validator_registry
+from a2ui.a2ui_validator_registry import (
+    A2uiValidationError,
+    A2uiValidatorRegistry,
+    schema_hash,
+)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"type": {"const": "Text"}, "text": {"type": "string"}},
+    "required": ["type", "text"],
+}
+
+
+@pytest.fixture(params=[False, True], ids=["jsonschema", "fast"])
+def registry(request):
+  if request.param:
+    pytest.importorskip("fastjsonschema")
+  return A2uiValidatorRegistry(use_fast_validator=request.param)
+
+
+def test_schema_hash_ignores_key_order():
+  reordered = {"required": ["type", "text"], **SCHEMA}
+  assert schema_hash(reordered) == schema_hash(SCHEMA)
+  assert schema_hash(json.dumps(SCHEMA)) != schema_hash({"type": "array"})
+
+
+def test_validator_cached_by_schema_content(registry):
+  validator = registry.get_validator(SCHEMA)
+  assert registry.get_validator(dict(SCHEMA)) is validator
+  assert registry.get_validator({"type": "array"}) is not validator
+
+
+def test_validate(registry):
+  registry.validate({"type": "Text", "text": "Hello"}, SCHEMA)
+  with pytest.raises(A2uiValidationError) as excinfo:
+    registry.validate({"type": "Text"}, SCHEMA)
+  assert "text" in excinfo.value.message
+
+
+def test_schema_text_parsed_once(registry):
+  schema_json = json.dumps(SCHEMA)
+  assert registry.load_schema(schema_json) is registry.load_schema(schema_json)
+  registry.validate({"type": "Text", "text": "Hello"}, schema_json)
+  with pytest.raises(A2uiValidationError):
+    registry.validate([], schema_json)
+
+
+def test_invalid_schema_rejected(registry):
+  with pytest.raises(jsonschema.exceptions.SchemaError):
+    registry.get_validator({"type": "not-a-type"})
+
+
+def test_clear(registry):
+  validator = registry.get_validator(SCHEMA)
+  registry.clear()
+  assert registry.get_validator(SCHEMA) is not validator
+
+
+def test_same_schema_object_skips_hashing(registry, monkeypatch):
+  schema = dict(SCHEMA)
+  validator = registry.get_validator(schema)
+
+  def fail(schema):
+    raise AssertionError("schema hashed again")
+
+  monkeypatch.setattr(a2ui_validator_registry, "schema_hash", fail)
+  assert registry.get_validator(schema) is validator
+  registry.validate({"type": "Text", "text": "Hello"}, schema)
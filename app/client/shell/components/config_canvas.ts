@@ -372,7 +372,9 @@ export class AgentConfigCanvas extends LitElement {
       "get_restaurants",
       "get_cafes",
       "get_restaurant_data",
-      "get_cafe_data"
+      "get_cafe_data",
+      "get_restaurant_data_batch",
+      "get_cafe_data_batch"
     ];
 
     const availableDBTypes = [
@@ -79,6 +79,12 @@ export class DynamicModule extends LitElement {
   @state()
   accessor #currentElapsedTime: number | null = null;
 
+  // Model response streamed as working updates, restarts when the server retries the generation
+  #responseMessageId: string | null = null;
+
+  // Model response the rendered A2UI messages were streamed from, null once a final response replaced them
+  #surfaceMessageId: string | null = null;
+
   #processor = v0_8.Data.createSignalA2uiMessageProcessor();
   #loadingInterval: number | undefined;
   #stopwatchInterval: number | undefined;
@@ -313,6 +319,28 @@ export class DynamicModule extends LitElement {
     if (event.kind === 'status-update') {
       const status = event.status;
       const isFinal = event.final;
+
+      // Response text pieces are shown as they arrive, not added to the status timeline
+      const deltaParts = (status?.message?.parts ?? []).filter((part: any) => part.metadata?.response_delta);
+      if (deltaParts.length > 0) {
+        for (const part of deltaParts) {
+          if (part.metadata.message_id !== this.#responseMessageId) {
+            this.#responseMessageId = part.metadata.message_id;
+            this.response = "";
+          }
+          this.response += part.text;
+        }
+        return;
+      }
+      // Streamed A2UI messages are rendered by processMessages, not added to the status timeline
+      const parts = status?.message?.parts ?? [];
+      if (parts.length > 0 && parts.every((part: any) => part.kind === 'data' && part.metadata?.message_id)) {
+        return;
+      }
+      if (isFinal) {
+        this.#responseMessageId = null;
+        this.response = "";
+      }
       const state = status?.state;
       const hasMessage = status?.message?.parts?.length > 0;
 
@@ -357,16 +385,37 @@ export class DynamicModule extends LitElement {
     if (event.kind === "status-update" && event.status?.message?.parts) {
       const newMessages: v0_8.Types.ServerToClientMessage[] = [];
       for (const part of event.status.message.parts) {
-        if (part.kind === 'data') {
-          const a2uiMessage = part.data as v0_8.Types.ServerToClientMessage;
+        if (part.kind !== 'data') continue;
+        const a2uiMessage = part.data as v0_8.Types.ServerToClientMessage;
+        const messageId = part.metadata?.message_id;
+        if (messageId) {
+          // Streamed while the response is generated, render each message as it arrives
+          if (messageId !== this.#surfaceMessageId) {
+            this.#surfaceMessageId = messageId;
+            this.#lastMessages = [];
+            this.#processor.clearSurfaces();
+          }
+          this.#lastMessages = [...this.#lastMessages, a2uiMessage];
+          this.#processor.processMessages([a2uiMessage]);
+        } else {
           newMessages.push(a2uiMessage);
         }
       }
       // Replace with latest messages, not accumulate
       if (newMessages.length > 0) {
+        this.#surfaceMessageId = null;
         this.#lastMessages = newMessages;
         this.#processor.clearSurfaces();
         this.#processor.processMessages(this.#lastMessages);
+      } else if (
+        event.status.state !== 'working'
+        && this.#surfaceMessageId
+        && event.status.message.metadata?.a2ui_streamed !== this.#surfaceMessageId
+      ) {
+        // The streamed response failed validation and nothing replaced it
+        this.#surfaceMessageId = null;
+        this.#lastMessages = [];
+        this.#processor.clearSurfaces();
       }
     }
   }
@@ -457,6 +506,7 @@ export class DynamicModule extends LitElement {
         <div class="pending">
           <div class="spinner"></div>
           <div class="loading-text">${text}</div>
+          ${this.response ? html`<div class="response">${this.response}</div>` : nothing}
         </div>
       `;
     }
@@ -36,6 +36,9 @@ export class ChatModule extends LitElement {
   // Default server URL for this module
   private defaultServerUrl = "http://localhost:10002/llm";
 
+  // Model response streamed as working updates
+  #responseMessageId: string | null = null;
+
   connectedCallback() {
     super.connectedCallback();
 
@@ -76,6 +79,19 @@ export class ChatModule extends LitElement {
       console.log("server message", serverState);
       console.log("End of message update")
 
+      // Response text pieces are appended as they arrive
+      const deltaParts = hasMessage ? status.message.parts.filter((part: any) => part.metadata?.response_delta) : [];
+      if (deltaParts.length > 0) {
+        for (const part of deltaParts) {
+          if (part.metadata.message_id !== this.#responseMessageId) {
+            this.#responseMessageId = part.metadata.message_id;
+            this.response = "";
+          }
+          this.response += part.text;
+        }
+        return;
+      }
+
       // Extract text parts
       if (hasMessage) {
         for (const part of status.message.parts) {
@@ -12,8 +12,9 @@ const agents = {
     model: "openai.gpt-4.1",
     temperature: 0.7,
     name: "data_finder_agent",
-    systemPrompt: "You are an agent expert in finding restaurant data.You will receive the information about a list of restaurants or caffeterias to find information about. Your job is to gather that information and pass the full data to a new agent that will respond to the user. Important, consider including links, image references and other UI data to be rendered during next steps. Consider that caffeteria or restaurant data should be complete, use tools as required according to context. Make sure to use the exact restaurant names from information.",
-    toolsEnabled: ["get_restaurant_data", "get_cafe_data"]
+    // Empty runs the server's data finder instructions, kept in one place
+    systemPrompt: "",
+    toolsEnabled: ["get_restaurant_data_batch", "get_cafe_data_batch"]
   },
   "presenter_agent": {
     model: "xai.grok-4-fast-non-reasoning",
@@ -28,7 +29,9 @@ const toolAssignments: ToolAssignments = {
   "get_restaurants": "place_finder_agent",
   "get_cafes": "place_finder_agent",
   "get_restaurant_data": "data_finder_agent",
-  "get_cafe_data": "data_finder_agent"
+  "get_cafe_data": "data_finder_agent",
+  "get_restaurant_data_batch": "data_finder_agent",
+  "get_cafe_data_batch": "data_finder_agent"
 };
 
 export const agentConfig: EnhancedAgentAppConfig = {
@@ -94,7 +94,9 @@ export class A2UIClient extends EventTarget {
       },
     });
 
-    const messages: v0_8.Types.ServerToClientMessage[] = [];
+    let messages: v0_8.Types.ServerToClientMessage[] = [];
+    // Model response the collected messages were streamed from
+    let streamedMessageId: string | null = null;
 
     // Process streaming events
     for await (const event of streamingResponse) {
@@ -108,6 +110,12 @@ export class A2UIClient extends EventTarget {
         for (const part of event.status.message.parts) {
           if (part.kind === 'data') {
             const a2uiMessage = part.data as v0_8.Types.ServerToClientMessage;
+            const messageId = (part.metadata?.message_id as string | undefined) ?? null;
+            // A retried response or the final list replaces messages streamed from an earlier response
+            if (messageId !== streamedMessageId) {
+              streamedMessageId = messageId;
+              messages = [];
+            }
             messages.push(a2uiMessage);
           }
         }
@@ -14,6 +14,7 @@
 
 import logging
 import httpx
+from contextlib import asynccontextmanager
 
 import click
 from a2a.server.apps import A2AStarletteApplication
@@ -33,6 +34,8 @@ from chat.llm_executor import RestaurantLLMExecutor
 from chat.oci_llm import OCIRestaurantLLM
 from agent.graph_executor import RestaurantGraphExecutor
 from agent.graph.restaurant_graph import RestaurantGraph
+from agent.graph.tool_registry import tool_registry
+from agent.metrics import metrics
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -125,7 +128,13 @@ def main(host, port):
         llm_app = llm_server.build()
 
         #region main app setup
-        main_app = Starlette()
+        @asynccontextmanager
+        async def lifespan(app):
+            yield
+            # Close the pooled MCP sessions opened by the graph agents
+            await tool_registry.aclose()
+
+        main_app = Starlette(lifespan=lifespan)
 
         main_app.add_middleware(
             CORSMiddleware,
@@ -154,11 +163,15 @@ def main(host, port):
         async def delete_config(request: Request):
             agent_executor.reset_config()
             return JSONResponse({"status": "success", "message": "Configuration reset to default"})
+
+        async def get_metrics(request: Request):
+            return JSONResponse(metrics.snapshot())
         
         #region app mount
         main_app.add_route("/agent/config", get_config, methods=["GET"])
         main_app.add_route("/agent/config", post_config, methods=["POST"])
         main_app.add_route("/agent/config", delete_config, methods=["DELETE"])
+        main_app.add_route("/agent/metrics", get_metrics, methods=["GET"])
 
         main_app.mount("/static", StaticFiles(directory="images"), name="static")
         main_app.mount("/agent", agent_app)
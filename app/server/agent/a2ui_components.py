@@ -1,3 +1,5 @@
+import re
+
 RESTAURANT_UI_EXAMPLES = """
 ---BEGIN SINGLE_COLUMN_LIST_EXAMPLE---
 [
@@ -10,8 +12,8 @@ RESTAURANT_UI_EXAMPLES = """
       {{ "id": "item-list", "component": {{ "List": {{ "direction": "vertical", "children": {{ "template": {{ "componentId": "item-card-template", "dataBinding": "/items" }} }} }} }} }},
       {{ "id": "item-card-template", "component": {{ "Card": {{ "child": "card-layout" }} }} }},
       {{ "id": "card-layout", "component": {{ "Row": {{ "children": {{ "explicitList": ["template-image", "card-details"] }} }} }} }},
-      {{ "id": "template-image", weight: 1, "component": {{ "Image": {{ "url": {{ "path": "imageUrl" }} }} }} }},
-      {{ "id": "card-details", weight: 2, "component": {{ "Column": {{ "children": {{ "explicitList": ["template-name", "template-rating", "template-detail", "template-link", "template-book-button"] }} }} }} }},
+      {{ "id": "template-image", "weight": 1, "component": {{ "Image": {{ "url": {{ "path": "imageUrl" }} }} }} }},
+      {{ "id": "card-details", "weight": 2, "component": {{ "Column": {{ "children": {{ "explicitList": ["template-name", "template-rating", "template-detail", "template-link", "template-book-button"] }} }} }} }},
       {{ "id": "template-name", "component": {{ "Text": {{ "usageHint": "h3", "text": {{ "path": "name" }} }} }} }},
       {{ "id": "template-rating", "component": {{ "Text": {{ "text": {{ "path": "rating" }} }} }} }},
       {{ "id": "template-detail", "component": {{ "Text": {{ "text": {{ "path": "detail" }} }} }} }},
@@ -41,7 +43,7 @@ RESTAURANT_UI_EXAMPLES = """
           {{ "key": "imageUrl", "valueString": "https://example.com/quick.jpg" }},
           {{ "key": "address", "valueString": "456 Oak Ave" }}
         ] }}
-      ] }} // Populate this with restaurant data
+      ] }}
     ]
   }} }}
 ]
@@ -100,7 +102,7 @@ RESTAURANT_UI_EXAMPLES = """
           {{ "key": "imageUrl", "valueString": "https://example.com/quick.jpg" }},
           {{ "key": "address", "valueString": "456 Oak Ave" }}
         ] }}
-      ] }} // Populate this with restaurant data
+      ] }}
     ]
   }} }}
 ]
@@ -169,4 +171,11 @@ RESTAURANT_UI_EXAMPLES = """
   }} }}
 ]
 ---END CONFIRMATION_EXAMPLE---
-"""
\ No newline at end of file
+"""
+
+def bound_item_fields(examples: str) -> list[str]:
+    """ Record fields the list templates bind per item, e.g. "/items/0/rating" -> "rating" """
+    return list(dict.fromkeys(re.findall(r'"path": "/items/\d+/(\w+)"', examples)))
+
+# Catalog record fields the restaurant UI actually renders
+RESTAURANT_RECORD_FIELDS = bound_item_fields(RESTAURANT_UI_EXAMPLES)
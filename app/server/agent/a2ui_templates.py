@@ -0,0 +1,288 @@
+""" The restaurant UI templates of a2ui_components as Python renderers. The presenter fills them
+from structured records and UI actions instead of asking the model to copy the data into the
+examples, and expands the compact UI its model outputs with them. Components are built once per
+layout and every template is validated against the A2UI schema when the module is imported. """
+import json
+import logging
+from functools import lru_cache
+
+from a2ui.a2ui_json_repair import loads_with_repair, strip_code_fence
+from a2ui.a2ui_spec_registry import spec_registry
+from agent.a2ui_components import RESTAURANT_RECORD_FIELDS
+from agent.prompt_builder import A2UI_STRICT_SCHEMA, A2UI_VERSION
+from agent.response_streaming import A2UI_DELIMITER
+
+logger = logging.getLogger(__name__)
+
+# Same rule as the presenter prompt, more restaurants than this use the two column list
+SINGLE_COLUMN_MAX_ITEMS = 5
+
+SINGLE_COLUMN_LIST = "SINGLE_COLUMN_LIST"
+TWO_COLUMN_LIST = "TWO_COLUMN_LIST"
+BOOKING_FORM = "BOOKING_FORM"
+CONFIRMATION = "CONFIRMATION"
+
+STYLES = {"primaryColor": "#FF0000", "font": "Roboto"}
+LIST_SURFACE = "default"
+BOOKING_SURFACE = "booking-form"
+CONFIRMATION_SURFACE = "confirmation"
+
+def _text(component_id: str, text: dict, usage_hint: str | None = None) -> dict:
+    properties = {"text": text}
+    if usage_hint:
+        properties = {"usageHint": usage_hint, **properties}
+    return {"id": component_id, "component": {"Text": properties}}
+
+def _column(component_id: str, children: list[str]) -> dict:
+    return {"id": component_id, "component": {"Column": {"children": {"explicitList": children}}}}
+
+def _book_button(component_id: str, text_id: str, item_path: str, primary: bool) -> dict:
+    button = {"child": text_id}
+    if primary:
+        button["primary"] = True
+    button["action"] = {
+        "name": "book_restaurant",
+        "context": [
+            {"key": key, "value": {"path": f"{item_path}{field}"}}
+            for key, field in (("restaurantName", "name"), ("imageUrl", "imageUrl"), ("address", "address"))
+        ],
+    }
+    return {"id": component_id, "component": {"Button": button}}
+
+def _item_details(suffix: str, item_path: str, primary: bool) -> list[dict]:
+    """ Name, rating, detail, link and book button of one restaurant card """
+    return [
+        _column(f"card-details{suffix}", [
+            f"template-name{suffix}", f"template-rating{suffix}", f"template-detail{suffix}",
+            f"template-link{suffix}", f"template-book-button{suffix}",
+        ]),
+        _text(f"template-name{suffix}", {"path": f"{item_path}name"}, "h3"),
+        _text(f"template-rating{suffix}", {"path": f"{item_path}rating"}),
+        _text(f"template-detail{suffix}", {"path": f"{item_path}detail"}),
+        _text(f"template-link{suffix}", {"path": f"{item_path}infoLink"}),
+        _book_button(f"template-book-button{suffix}", f"book-now-text{suffix}", item_path, primary),
+        _text(f"book-now-text{suffix}", {"literalString": "Book Now"}),
+    ]
+
+# One card template bound to every item of "/items", paths are relative to the item
+SINGLE_COLUMN_COMPONENTS = [
+    _column("root-column", ["title-heading", "item-list"]),
+    _text("title-heading", {"path": "title"}, "h1"),
+    {"id": "item-list", "component": {"List": {
+        "direction": "vertical",
+        "children": {"template": {"componentId": "item-card-template", "dataBinding": "/items"}},
+    }}},
+    {"id": "item-card-template", "component": {"Card": {"child": "card-layout"}}},
+    {"id": "card-layout", "component": {"Row": {"children": {"explicitList": ["template-image", "card-details"]}}}},
+    {"id": "template-image", "weight": 1, "component": {"Image": {"url": {"path": "imageUrl"}}}},
+    *[
+        {**component, "weight": 2} if component["id"] == "card-details" else component
+        for component in _item_details("", "", primary=True)
+    ],
+]
+
+BOOKING_FORM_COMPONENTS = [
+    _column("booking-form-column", [
+        "booking-title", "restaurant-image", "restaurant-address", "party-size-field",
+        "datetime-field", "dietary-field", "submit-button",
+    ]),
+    _text("booking-title", {"path": "title"}, "h2"),
+    {"id": "restaurant-image", "component": {"Image": {"url": {"path": "imageUrl"}}}},
+    _text("restaurant-address", {"path": "address"}),
+    {"id": "party-size-field", "component": {"TextField": {
+        "label": {"literalString": "Party Size"}, "text": {"path": "partySize"}, "type": "number",
+    }}},
+    {"id": "datetime-field", "component": {"DateTimeInput": {
+        "label": {"literalString": "Date & Time"}, "value": {"path": "reservationTime"},
+        "enableDate": True, "enableTime": True,
+    }}},
+    {"id": "dietary-field", "component": {"TextField": {
+        "label": {"literalString": "Dietary Requirements"}, "text": {"path": "dietary"},
+    }}},
+    {"id": "submit-button", "component": {"Button": {
+        "child": "submit-reservation-text",
+        "action": {
+            "name": "submit_booking",
+            "context": [
+                {"key": key, "value": {"path": key}}
+                for key in ("restaurantName", "partySize", "reservationTime", "dietary", "imageUrl")
+            ],
+        },
+    }}},
+    _text("submit-reservation-text", {"literalString": "Submit Reservation"}),
+]
+
+CONFIRMATION_COMPONENTS = [
+    {"id": "confirmation-card", "component": {"Card": {"child": "confirmation-column"}}},
+    _column("confirmation-column", [
+        "confirm-title", "confirm-image", "divider1", "confirm-details", "divider2",
+        "confirm-dietary", "divider3", "confirm-text",
+    ]),
+    _text("confirm-title", {"path": "title"}, "h2"),
+    {"id": "confirm-image", "component": {"Image": {"url": {"path": "imageUrl"}}}},
+    _text("confirm-details", {"path": "bookingDetails"}),
+    _text("confirm-dietary", {"path": "dietaryRequirements"}),
+    _text("confirm-text", {"literalString": "We look forward to seeing you!"}, "h5"),
+    *[{"id": f"divider{n}", "component": {"Divider": {}}} for n in (1, 2, 3)],
+]
+
+@lru_cache(maxsize=None)
+def _two_column_card(index: int) -> tuple[dict, ...]:
+    """ Card of the item at index, bound through absolute "/items/<index>/" paths """
+    suffix = f"-{index + 1}"
+    return (
+        {"id": f"item-card{suffix}", "weight": 1, "component": {"Card": {"child": f"card-layout{suffix}"}}},
+        _column(f"card-layout{suffix}", [f"template-image{suffix}", f"card-details{suffix}"]),
+        {"id": f"template-image{suffix}", "component": {"Image": {
+            "url": {"path": f"/items/{index}/imageUrl"}, "width": "100%",
+        }}},
+        *_item_details(suffix, f"/items/{index}/", primary=False),
+    )
+
+@lru_cache(maxsize=None)
+def _two_column_components(count: int) -> tuple[dict, ...]:
+    """ Root column, one row per two cards and the cards of count items """
+    rows = [
+        {"id": f"restaurant-row-{row + 1}", "component": {"Row": {"children": {"explicitList": [
+            f"item-card-{index + 1}" for index in range(row * 2, min(row * 2 + 2, count))
+        ]}}}}
+        for row in range((count + 1) // 2)
+    ]
+    components = [
+        _column("root-column", ["title-heading", *(row["id"] for row in rows)]),
+        _text("title-heading", {"path": "title"}, "h1"),
+        *rows,
+    ]
+    for index in range(count):
+        components.extend(_two_column_card(index))
+    return tuple(components)
+
+def data_entry(key: str, value) -> dict:
+    """ A2UI v0.8 data model entry of a Python value, e.g. ("rating", 4.5) -> valueNumber """
+    if isinstance(value, bool):
+        return {"key": key, "valueBoolean": value}
+    if isinstance(value, (int, float)):
+        return {"key": key, "valueNumber": value}
+    if isinstance(value, dict):
+        return {"key": key, "valueMap": [data_entry(str(k), v) for k, v in value.items()]}
+    if isinstance(value, list):
+        return {"key": key, "valueMap": [data_entry(str(i), v) for i, v in enumerate(value)]}
+    return {"key": key, "valueString": "" if value is None else str(value)}
+
+def _surface(surface_id: str, root: str, components, contents: list[dict]) -> list[dict]:
+    return [
+        {"beginRendering": {"surfaceId": surface_id, "root": root, "styles": STYLES}},
+        {"surfaceUpdate": {"surfaceId": surface_id, "components": list(components)}},
+        {"dataModelUpdate": {"surfaceId": surface_id, "path": "/", "contents": contents}},
+    ]
+
+def list_template(count: int) -> str:
+    """ SINGLE_COLUMN_LIST for up to 5 restaurants, TWO_COLUMN_LIST for more """
+    return SINGLE_COLUMN_LIST if count <= SINGLE_COLUMN_MAX_ITEMS else TWO_COLUMN_LIST
+
+def render_restaurant_list(records: list[dict], title: str) -> list[dict]:
+    """ Restaurant list messages of the catalog records, single or two columns by record count.
+    Items are keyed by their index, which the two column paths bind, and carry the fields the
+    templates render. """
+    items = {
+        str(index): {field: record.get(field, "") for field in RESTAURANT_RECORD_FIELDS}
+        for index, record in enumerate(records)
+    }
+    contents = [data_entry("title", title), data_entry("items", items)]
+    if list_template(len(records)) == SINGLE_COLUMN_LIST:
+        components = SINGLE_COLUMN_COMPONENTS
+    else:
+        components = _two_column_components(len(records))
+    return _surface(LIST_SURFACE, "root-column", components, contents)
+
+def render_booking_form(restaurant_name: str, address: str, image_url: str) -> list[dict]:
+    """ Booking form of a restaurant, the submit button sends the submit_booking action """
+    contents = [
+        data_entry("title", f"Book a Table at {restaurant_name}"),
+        data_entry("address", address),
+        data_entry("restaurantName", restaurant_name),
+        data_entry("partySize", "2"),
+        data_entry("reservationTime", ""),
+        data_entry("dietary", ""),
+        data_entry("imageUrl", image_url),
+    ]
+    return _surface(BOOKING_SURFACE, "booking-form-column", BOOKING_FORM_COMPONENTS, contents)
+
+def render_confirmation(
+    restaurant_name: str, party_size: str, reservation_time: str, dietary: str, image_url: str
+) -> list[dict]:
+    """ Confirmation card of a submitted booking """
+    contents = [
+        data_entry("title", f"Booking at {restaurant_name}"),
+        data_entry("bookingDetails", f"{party_size} people at {reservation_time}"),
+        data_entry("dietaryRequirements", f"Dietary Requirements: {dietary}"),
+        data_entry("imageUrl", image_url),
+    ]
+    return _surface(CONFIRMATION_SURFACE, "confirmation-card", CONFIRMATION_COMPONENTS, contents)
+
+class CompactUiError(ValueError):
+    """ A compact UI response that does not parse or does not name a known template """
+
+def expand_compact_ui(spec: dict) -> list[dict]:
+    """ Full A2UI messages of a compact UI, e.g. {"template": "SINGLE_COLUMN_LIST", "title": "Top picks",
+    "items": [{"name": ...}]}. Either list template renders the column count of its item count, the
+    booking form and confirmation take their values from the first item. """
+    if not isinstance(spec, dict):
+        raise CompactUiError(f"The compact UI must be a JSON object, got {type(spec).__name__}")
+    template = spec.get("template")
+    items = spec.get("items") or []
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise CompactUiError("The compact UI items must be a list of objects")
+
+    if template in (SINGLE_COLUMN_LIST, TWO_COLUMN_LIST):
+        return render_restaurant_list(items, str(spec.get("title") or ""))
+    if template not in (BOOKING_FORM, CONFIRMATION):
+        raise CompactUiError(
+            f"Unknown template '{template}', expected one of "
+            f"{[SINGLE_COLUMN_LIST, TWO_COLUMN_LIST, BOOKING_FORM, CONFIRMATION]}"
+        )
+    if not items:
+        raise CompactUiError(f"The {template} template needs one item")
+
+    item = {key: "" if value is None else str(value) for key, value in items[0].items()}
+    restaurant_name = item.get("restaurantName") or "Unknown Restaurant"
+    if template == BOOKING_FORM:
+        return render_booking_form(restaurant_name, item.get("address", ""), item.get("imageUrl", ""))
+    return render_confirmation(
+        restaurant_name, item.get("partySize", ""), item.get("reservationTime", ""),
+        item.get("dietary") or "None", item.get("imageUrl", ""),
+    )
+
+def parse_compact_response(text: str, delimiter: str = A2UI_DELIMITER) -> tuple[str, list[dict], bool]:
+    """ Conversational text and expanded A2UI messages of a "text ---a2ui_JSON--- compact UI" model
+    response, plus whether the JSON needed a local repair """
+    if delimiter not in text:
+        raise CompactUiError(f"The response has no '{delimiter}' delimiter")
+    response_text, compact_json = text.split(delimiter, 1)
+    try:
+        spec, repaired = loads_with_repair(strip_code_fence(compact_json.strip()))
+    except json.JSONDecodeError as e:
+        raise CompactUiError(f"The compact UI is not valid JSON: {e}") from e
+    return response_text.strip(), expand_compact_ui(spec), repaired
+
+def _validate_templates() -> None:
+    """ Renders every layout once with sample data and validates it, a template that breaks the
+    schema fails the import instead of every request """
+    try:
+        validator = spec_registry.get_validator(A2UI_VERSION, strict=A2UI_STRICT_SCHEMA)
+    except (OSError, json.JSONDecodeError) as e:
+        # The presenter reports the missing schema on its own
+        logger.warning(f"A2UI templates not validated, the v{A2UI_VERSION} schema failed to load: {e}")
+        return
+    record = {"name": "Sample", "rating": "★★★★☆", "detail": "Sample", "infoLink": "", "imageUrl": "", "address": ""}
+    samples = [
+        render_restaurant_list([record] * SINGLE_COLUMN_MAX_ITEMS, "Sample"),
+        render_restaurant_list([record] * (SINGLE_COLUMN_MAX_ITEMS + 2), "Sample"),
+        render_booking_form("Sample", "Sample", ""),
+        render_confirmation("Sample", "2", "7pm", "None", ""),
+    ]
+    for messages in samples:
+        for message in messages:
+            validator(message)
+
+_validate_templates()
@@ -33,6 +33,7 @@ from a2a.utils import (
 )
 from a2a.utils.errors import ServerError
 from a2ui.a2ui_extension import create_a2ui_part, try_activate_a2ui_extension
+from a2ui.a2ui_json_repair import strip_code_fence
 from agent.oci_agent import OCIRestaurantAgent
 
 logger = logging.getLogger(__name__)
@@ -153,9 +154,7 @@ class RestaurantAgentExecutor(AgentExecutor):
 
                 if json_string.strip():
                     try:
-                        json_string_cleaned = (
-                            json_string.strip().lstrip("```json").rstrip("```").strip()
-                        )
+                        json_string_cleaned = strip_code_fence(json_string)
                         # The new protocol sends a stream of JSON objects.
                         # For this example, we'll assume they are sent as a list in the final response.
                         json_data = json.loads(json_string_cleaned)
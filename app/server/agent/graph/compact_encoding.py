@@ -0,0 +1,106 @@
+import json
+import logging
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from agent.graph.handoff import tool_result_value
+from agent.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_SCALARS = (str, int, float, bool, type(None))
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    # Keeps one record per line and the separator unambiguous
+    return str(value).replace("\n", " ").replace("|", "\\|")
+
+def _flatten(item: dict) -> dict | None:
+    """ Lifts nested record fields into the row, {"query": .., "record": {"name": ..}} -> {"query": .., "name": ..} """
+    row = {}
+    for key, value in item.items():
+        if value is None:
+            # Missing nested record or field, left as an empty cell
+            continue
+        if isinstance(value, dict):
+            for child_key, child_value in value.items():
+                if child_key in item or not isinstance(child_value, _SCALARS):
+                    return None
+                row[child_key] = child_value
+        elif isinstance(value, _SCALARS):
+            row[key] = value
+        else:
+            return None
+    return row
+
+def encode_rows(records: list[dict]) -> str | None:
+    """ Header plus one "|" separated row per record, None when the records are not tabular """
+    rows = [_flatten(record) for record in records]
+    if not rows or any(row is None for row in rows):
+        return None
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    lines = [f"[{len(rows)} rows] " + "|".join(columns)]
+    lines.extend("|".join(_cell(row.get(column)) for column in columns) for row in rows)
+    return "\n".join(lines)
+
+def encode_compact(value) -> str | None:
+    """ Compact text for record lists and their wrappers, None when there is nothing to gain """
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value):
+            return encode_rows(value)
+        if all(isinstance(item, _SCALARS) for item in value):
+            return "\n".join(_cell(item) for item in value)
+        return None
+    if isinstance(value, dict):
+        sections = []
+        encoded_any = False
+        for key, item in value.items():
+            encoded = encode_compact(item) if isinstance(item, list) else None
+            if encoded is None:
+                sections.append(f"{key}: {json.dumps(item, ensure_ascii=False)}")
+            else:
+                encoded_any = True
+                sections.append(f"{key}:\n{encoded}" if encoded else f"{key}: none")
+        return "\n".join(sections) if encoded_any else None
+    return None
+
+def compact_tool_message(message: ToolMessage) -> tuple[ToolMessage, int, int]:
+    """ Re-encodes a tool result, returns the message with approximate token counts before and after """
+    tokens_before = count_tokens_approximately([message])
+    value = tool_result_value(message)
+    encoded = encode_compact(value) if value is not None else None
+    if not encoded:
+        return message, tokens_before, tokens_before
+    compacted = message.model_copy(update={"content": encoded})
+    tokens_after = count_tokens_approximately([compacted])
+    if tokens_after >= tokens_before:
+        return message, tokens_before, tokens_before
+    return compacted, tokens_before, tokens_after
+
+class CompactToolResultsMiddleware(AgentMiddleware):
+    """ Replaces JSON tool results with the compact header and rows form before they reach the model """
+
+    def __init__(self, node_name: str):
+        super().__init__()
+        self.node_name = node_name
+
+    def _compact(self, result):
+        if not isinstance(result, ToolMessage):
+            return result
+        compacted, tokens_before, tokens_after = compact_tool_message(result)
+        metrics.increment(f"compact_tool_results.{self.node_name}.tokens_before", tokens_before)
+        metrics.increment(f"compact_tool_results.{self.node_name}.tokens_after", tokens_after)
+        logger.info(
+            f"--- {self.node_name}: {result.name} result ~{tokens_before} tokens -> ~{tokens_after} tokens compact ---"
+        )
+        return compacted
+
+    def wrap_tool_call(self, request, handler):
+        return self._compact(handler(request))
+
+    async def awrap_tool_call(self, request, handler):
+        return self._compact(await handler(request))
@@ -3,11 +3,13 @@ from langchain.agents import create_agent
 from langchain_oci import ChatOCIGenAI
 from langchain_openai import ChatOpenAI
 from langchain.messages import HumanMessage, AIMessage
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from dotenv import load_dotenv
 load_dotenv()
 
-from agent.graph.struct import AgentConfig
+from agent.graph.compact_encoding import CompactToolResultsMiddleware
+from agent.graph.handoff import extract_records, new_messages
+from agent.graph.struct import AgentConfig, RestaurantGraphState
+from agent.graph.tool_registry import tool_registry
 
 class DataAgent:
     """ Agent in charge of finding the data about the restaurants specified to the user """
@@ -17,7 +19,10 @@ class DataAgent:
     Your job is to gather that information and pass the full data to a new agent that will respond to the user.
     Important, consider including links, image references and other UI data to be rendered during next steps.
     Consider that caffeteria or restaurant data should be complete, use tools as required according to context.
-    Make sure to use the exact restaurant names from information."""
+    Make sure to use the exact restaurant names from information.
+    Every record has a matchScore, 1.0 is an exact match and lower values are the closest catalog entry.
+    Request every restaurant in a single get_restaurant_data_batch call and every cafe in a single get_cafe_data_batch call.
+    Names the batch tools list in notFound are not in the catalog, do not request them again."""
 
     def __init__(self, config: AgentConfig = None):
         if config:
@@ -26,29 +31,31 @@ class DataAgent:
             self.model_temperature = config.temperature
             self.system_prompt = config.system_prompt if config.system_prompt else self.AGENT_INSTRUCTIONS
             self.tools_enabled = config.tools_enabled
+            self.compact_tool_results = config.compact_tool_results
         else:
             self.oci_model = "xai.grok-4-fast-non-reasoning"
             self.model_temperature = 0.7
             self.agent_name = "place_data_agent"
             self.system_prompt = self.AGENT_INSTRUCTIONS
-            self.tools_enabled = ["get_cafe_data","get_restaurant_data"]
+            self.tools_enabled = ["get_cafe_data_batch","get_restaurant_data_batch"]
+            self.compact_tool_results = False
         self._client = self._init_oci_client()
         self.agent = None
 
     async def initialize(self):
         self.agent = await self._build_agent()
 
-    async def __call__(self, state):
-        # Message cleanup
-        user_query = str(state['messages'][0].content)
-        last_model_response = str(state['messages'][-1])
-        messages = {
-            'messages':[
-                HumanMessage(user_query),
-                last_model_response
-            ]
+    async def __call__(self, state: RestaurantGraphState):
+        # Only the request and the place names, not the previous node's conversation
+        user_query = state.get("user_query") or str(state['messages'][0].content)
+        place_names = "\n".join(state.get("restaurant_names", []))
+        agent_input = [HumanMessage(f"{user_query}\n\nPlaces to find data for:\n{place_names}")]
+        response = await self.agent.ainvoke({'messages': agent_input})
+        messages = new_messages(response['messages'], agent_input)
+        return {
+            'messages': messages,
+            'restaurant_records': extract_records(messages)
         }
-        return await self.agent.ainvoke(messages)
     
     def _init_oci_client(self):
         client = ChatOCIGenAI(
@@ -69,35 +76,19 @@ class DataAgent:
         return client
     
     async def _build_agent(self):
-        tools = await self._get_mcp_tools()
+        # shared registry, filtered to the tools selected by user
+        agent_tools = await tool_registry.get_tools(self.tools_enabled)
 
-        # filters the tools selected by user
-        agent_tools = [tool for tool in tools if tool.name in self.tools_enabled]
+        middleware = [CompactToolResultsMiddleware(self.agent_name)] if self.compact_tool_results else []
 
         return create_agent(
             model=self._client,
             tools=agent_tools,
             system_prompt=self.system_prompt,
+            middleware=middleware,
             name=self.agent_name
         )
 
-    async def _get_mcp_tools(self):
-        # MCP client connection using langchain mcp
-        client = MultiServerMCPClient(
-                {
-                    "data_server": {
-                        "transport": "streamable_http",  # HTTP-based remote server
-                        "url": "http://localhost:8001/mcp",
-                    },
-                    "food_place_server": {
-                        "transport": "streamable_http",  # HTTP-based remote server
-                        "url": "http://localhost:8000/mcp",
-                    }
-                }
-            )
-
-        return await client.get_tools()
-
 # region testing
 async def main():
     agent = DataAgent()
@@ -1,12 +1,15 @@
 import os
 from langchain.agents import create_agent
+from langchain.messages import HumanMessage
 from langchain_oci import ChatOCIGenAI
 from langchain_openai import ChatOpenAI
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from dotenv import load_dotenv
 load_dotenv()
 
-from agent.graph.struct import AgentConfig
+from agent.graph.compact_encoding import CompactToolResultsMiddleware
+from agent.graph.handoff import extract_place_names, new_messages
+from agent.graph.struct import AgentConfig, RestaurantGraphState
+from agent.graph.tool_registry import tool_registry
 
 class RestaurantFinderAgent:
     """ Agent that has tools to find different restaurants depending on type of cuisine """
@@ -22,20 +25,30 @@ class RestaurantFinderAgent:
             self.model_temperature = config.temperature
             self.system_prompt = config.system_prompt if config.system_prompt else self.AGENT_INSTRUCTIONS
             self.tools_enabled = config.tools_enabled
+            self.compact_tool_results = config.compact_tool_results
         else:
             self.oci_model = "xai.grok-4-fast-non-reasoning"
             self.model_temperature = 0.7
             self.agent_name = "food_place_agent"
             self.system_prompt = self.AGENT_INSTRUCTIONS
             self.tools_enabled = ["get_restaurants","get_cafes"]
+            self.compact_tool_results = False
         self._client = self._init_oci_client()
         self.agent = None
 
     async def initialize(self):
         self.agent = await self._build_agent()
 
-    async def __call__(self, state):
-        return await self.agent.ainvoke(state)
+    async def __call__(self, state: RestaurantGraphState):
+        user_query = state.get("user_query") or str(state['messages'][0].content)
+        agent_input = [HumanMessage(user_query)]
+        response = await self.agent.ainvoke({'messages': agent_input})
+        # The request is already in the graph state, only hand over what the agent added
+        messages = new_messages(response['messages'], agent_input)
+        return {
+            'messages': messages,
+            'restaurant_names': extract_place_names(messages)
+        }
 
     def _init_oci_client(self):
         client = ChatOCIGenAI(
@@ -56,31 +69,15 @@ class RestaurantFinderAgent:
         return client
     
     async def _build_agent(self):
-        tools = await self._get_mcp_tools()
+        # shared registry, filtered to the tools selected by user
+        agent_tools = await tool_registry.get_tools(self.tools_enabled)
 
-        # filters the tools selected by user
-        agent_tools = [tool for tool in tools if tool.name in self.tools_enabled]
+        middleware = [CompactToolResultsMiddleware(self.agent_name)] if self.compact_tool_results else []
 
         return create_agent(
             model=self._client,
             tools=agent_tools,
             system_prompt=self.system_prompt,
+            middleware=middleware,
             name=self.agent_name
         )
-
-    async def _get_mcp_tools(self):
-        # MCP client connection using langchain mcp
-        client = MultiServerMCPClient(
-                {
-                    "data_server": {
-                        "transport": "streamable_http",  # HTTP-based remote server
-                        "url": "http://localhost:8001/mcp",
-                    },
-                    "food_place_server": {
-                        "transport": "streamable_http",  # HTTP-based remote server
-                        "url": "http://localhost:8000/mcp",
-                    }
-                }
-            )
-
-        return await client.get_tools()
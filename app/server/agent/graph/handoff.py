@@ -0,0 +1,78 @@
+import json
+import re
+from langchain.messages import AnyMessage, ToolMessage
+
+from agent.mcp.catalog import normalize_name, split_names
+
+# Finder tools answer a miss with a message instead of names, e.g. "No restaurants found in Boston"
+_NOT_FOUND = re.compile(r"^\s*no\b.*\bfound\b", re.IGNORECASE)
+
+def new_messages(response_messages: list[AnyMessage], agent_input: list[AnyMessage]) -> list[AnyMessage]:
+    """ Messages an agent added after its input, the input request is already in the graph state """
+    return response_messages[len(agent_input):]
+
+def tool_result_value(message: ToolMessage):
+    """ Structured MCP content when the tool has it, otherwise the JSON in the text blocks """
+    if isinstance(message.artifact, dict) and message.artifact.get("structured_content") is not None:
+        content = message.artifact["structured_content"]
+        # FastMCP wraps values that are not objects, e.g. a list or a JSON string, under "result"
+        if isinstance(content, dict) and list(content) == ["result"]:
+            content = content["result"]
+    else:
+        content = message.content
+        if isinstance(content, list):
+            texts = [block.get("text", "") for block in content if isinstance(block, dict) and block.get("type") == "text"]
+            if len(texts) != len(content):
+                return None
+            if len(texts) > 1:
+                return texts
+            content = texts[0] if texts else ""
+    if not isinstance(content, str):
+        return content
+    try:
+        return json.loads(content)
+    except ValueError:
+        return None
+
+def _tool_results(messages: list[AnyMessage]):
+    for message in messages:
+        if isinstance(message, ToolMessage) and message.status != "error":
+            value = tool_result_value(message)
+            if value is not None:
+                yield value
+
+def extract_place_names(messages: list[AnyMessage]) -> list[str]:
+    """ Place names returned by the finder tools, narrowed to the ones the final answer kept """
+    names = []
+    found_by_tools = False
+    for value in _tool_results(messages):
+        if isinstance(value, list):
+            found_by_tools = True
+            names.extend(item for item in value if isinstance(item, str) and not _NOT_FOUND.match(item))
+    answer = str(messages[-1].content) if messages else ""
+    if not found_by_tools:
+        # No tool results to take names from, the answer lists them
+        return list(dict.fromkeys(split_names(answer)))
+    if not names:
+        return []
+    names = list(dict.fromkeys(names))
+    normalized_answer = f" {normalize_name(answer)} "
+    # e.g. "top 3" answers pick a few of the places the tools returned
+    selected = [name for name in names if f" {normalize_name(name)} " in normalized_answer]
+    return selected or names
+
+def extract_records(messages: list[AnyMessage]) -> list[dict]:
+    """ Catalog records returned by the data tools, single name and batch results alike """
+    records = {}
+    for value in _tool_results(messages):
+        if isinstance(value, dict) and isinstance(value.get("results"), list):
+            items = [item["record"] for item in value["results"] if isinstance(item, dict) and item.get("found")]
+        elif isinstance(value, list):
+            items = value
+        else:
+            continue
+        for record in items:
+            if isinstance(record, dict) and "name" in record:
+                # The agent may look the same place up twice, keep one record per name
+                records[record["name"]] = record
+    return list(records.values())
@@ -0,0 +1,181 @@
+import asyncio
+import importlib
+import logging
+import time
+from contextlib import asynccontextmanager
+from langchain_mcp_adapters.sessions import create_session
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from agent.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Connection transport binding a FastMCP server module in the same process
+IN_PROCESS_TRANSPORT = "in_process"
+
+@asynccontextmanager
+async def open_mcp_session(connection: dict):
+    """ Opens an initialized MCP session, over HTTP or against an in-process server """
+    if connection["transport"] == IN_PROCESS_TRANSPORT:
+        # Same MCP protocol over memory streams, no sockets and no JSON encoding
+        server = importlib.import_module(connection["module"]).mcp
+        async with create_connected_server_and_client_session(
+            server, **connection.get("session_kwargs", {})
+        ) as session:
+            yield session
+    else:
+        async with create_session(connection) as session:
+            await session.initialize()
+            yield session
+
+class _PooledSession:
+    """ MCP session kept open by its own task, so it can be closed from any request """
+
+    def __init__(self):
+        self.session: ClientSession | None = None
+        self.last_used = time.monotonic()
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error: BaseException | None = None
+        self._task: asyncio.Task | None = None
+
+    async def open(self, connection: dict) -> None:
+        self._task = asyncio.create_task(self._run(connection))
+        await self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self, connection: dict) -> None:
+        try:
+            async with open_mcp_session(connection) as session:
+                self.session = session
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            self._error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task is not None:
+            await self._task
+
+class McpSessionPool:
+    """ Pool of warm MCP client sessions for a single server, lent out per tool call """
+
+    DEFAULT_POOL_SIZE = 4
+    HEALTH_CHECK_INTERVAL_SECONDS = 30
+    MAX_CONNECT_ATTEMPTS = 4
+    INITIAL_BACKOFF_SECONDS = 0.5
+
+    def __init__(self, server_name: str, connection: dict, size: int = DEFAULT_POOL_SIZE, message_handler=None):
+        self.server_name = server_name
+        self.size = size
+        self._connection = dict(connection)
+        if message_handler is not None:
+            session_kwargs = {**self._connection.get("session_kwargs", {}), "message_handler": message_handler}
+            self._connection["session_kwargs"] = session_kwargs
+        self._idle: list[_PooledSession] = []
+        self._open: set[_PooledSession] = set()
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connect(self) -> _PooledSession:
+        """ Opens a new session, retrying with exponential backoff """
+        backoff = self.INITIAL_BACKOFF_SECONDS
+        for attempt in range(1, self.MAX_CONNECT_ATTEMPTS + 1):
+            pooled = _PooledSession()
+            start = time.perf_counter()
+            try:
+                await pooled.open(self._connection)
+            except Exception as e:
+                metrics.increment(f"mcp_pool.{self.server_name}.connect_failures")
+                if attempt == self.MAX_CONNECT_ATTEMPTS:
+                    raise
+                logger.warning(
+                    f"MCP session to {self.server_name} failed (attempt {attempt}): {e}, retrying in {backoff:.1f}s"
+                )
+                await asyncio.sleep(backoff)
+                backoff *= 2
+                continue
+            metrics.observe(f"mcp_pool.{self.server_name}.connect", time.perf_counter() - start)
+            self._open.add(pooled)
+            return pooled
+
+    async def _discard(self, pooled: _PooledSession) -> None:
+        self._open.discard(pooled)
+        try:
+            await pooled.close()
+        except Exception as e:
+            logger.debug(f"Error closing MCP session to {self.server_name}: {e}")
+
+    async def _is_healthy(self, pooled: _PooledSession) -> bool:
+        if pooled.session is None:
+            return False
+        if time.monotonic() - pooled.last_used < self.HEALTH_CHECK_INTERVAL_SECONDS:
+            return True
+        try:
+            await pooled.session.send_ping()
+            return True
+        except Exception as e:
+            metrics.increment(f"mcp_pool.{self.server_name}.health_check_failures")
+            logger.warning(f"Idle MCP session to {self.server_name} failed health check: {e}")
+            return False
+
+    @asynccontextmanager
+    async def acquire(self):
+        """ Lends a healthy session, reconnecting when an idle one went stale """
+        async with self._slots:
+            pooled = None
+            while self._idle and pooled is None:
+                candidate = self._idle.pop()
+                if await self._is_healthy(candidate):
+                    pooled = candidate
+                else:
+                    await self._discard(candidate)
+            if pooled is None:
+                pooled = await self._connect()
+            else:
+                metrics.increment(f"mcp_pool.{self.server_name}.reused")
+
+            broken = False
+            try:
+                yield pooled.session
+            except McpError:
+                # Protocol level error, the session itself is still usable
+                raise
+            except Exception:
+                broken = True
+                raise
+            finally:
+                pooled.last_used = time.monotonic()
+                if broken or pooled.session is None:
+                    await self._discard(pooled)
+                else:
+                    self._idle.append(pooled)
+
+    # ClientSession-compatible methods, so langchain MCP tools can be bound to the pool
+    async def call_tool(self, *args, **kwargs):
+        try:
+            async with self.acquire() as session:
+                return await session.call_tool(*args, **kwargs)
+        except McpError:
+            raise
+        except Exception as e:
+            # The session broke mid call, retry once on a fresh one
+            metrics.increment(f"mcp_pool.{self.server_name}.call_retries")
+            logger.warning(f"MCP call to {self.server_name} failed on pooled session, retrying: {e}")
+            async with self.acquire() as session:
+                return await session.call_tool(*args, **kwargs)
+
+    async def list_tools(self, *args, **kwargs):
+        async with self.acquire() as session:
+            return await session.list_tools(*args, **kwargs)
+
+    async def aclose(self) -> None:
+        self._idle.clear()
+        for pooled in list(self._open):
+            await self._discard(pooled)
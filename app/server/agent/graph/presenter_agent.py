@@ -1,20 +1,40 @@
 import json
 import logging
 import os
+import uuid
+from contextlib import aclosing
 from langchain.agents import create_agent
+from langchain_core.messages.utils import count_tokens_approximately
 from langchain_oci import ChatOCIGenAI
-from langchain.messages import HumanMessage, AIMessage
+from langchain.messages import HumanMessage, AIMessage, AIMessageChunk, AnyMessage
+from langgraph.config import get_stream_writer
 from langgraph.graph.state import CompiledStateGraph
 from dotenv import load_dotenv
 load_dotenv()
 
-import jsonschema
+from a2ui.a2ui_stream_parser import A2uiStreamError
+from a2ui.a2ui_spec_registry import spec_registry
+from agent.a2ui_templates import (
+    BOOKING_FORM,
+    CONFIRMATION,
+    CompactUiError,
+    list_template,
+    parse_compact_response,
+    render_booking_form,
+    render_confirmation,
+    render_restaurant_list,
+)
 from agent.prompt_builder import (
-    A2UI_SCHEMA,
+    A2UI_STRICT_SCHEMA,
+    A2UI_VERSION,
     RESTAURANT_UI_EXAMPLES,
+    get_compact_ui_prompt,
     get_ui_prompt,
 )
-from agent.graph.struct import AgentConfig
+from agent.graph.handoff import new_messages
+from agent.graph.struct import AgentConfig, RestaurantGraphState
+from agent.metrics import metrics
+from agent.response_streaming import StreamingA2uiValidator
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +50,20 @@ AGENT_INSTRUCTION = """
     Output in the format: conversational text ---a2ui_JSON--- JSON list of A2UI messages
 """
 
+COMPACT_AGENT_INSTRUCTION = """
+    You are a UI generation assistant. You receive restaurant data and must pick the template to display it with.
+
+    Use the provided restaurant data to fill the template items. Follow these rules:
+    - Determine the number of restaurants from the data.
+    - If 5 or fewer restaurants, use the SINGLE_COLUMN_LIST template.
+    - If more than 5 restaurants, use the TWO_COLUMN_LIST template.
+
+    Output in the format: conversational text ---a2ui_JSON--- compact UI JSON object
+"""
+
+# Longer requests are not used as the list heading
+MAX_TITLE_LENGTH = 60
+
 class PresenterAgent:
     """ Agent that generates A2UI schemas from restaurant data """
 
@@ -38,34 +72,46 @@ class PresenterAgent:
             self.oci_model = config.model
             self.model_temperature = config.temperature
             self.agent_name = config.name
+            self.compact_ui_output = config.compact_ui_output
         else:
             self.oci_model = "xai.grok-4"
             self.model_temperature = 0.7
             self.agent_name = "presenter_agent"
+            self.compact_ui_output = False
         self.base_url = base_url
         self.use_ui = use_ui
         self._agent = self._build_agent()
 
-        # Load the A2UI_SCHEMA string into a Python object for validation
+        # Read from the specification and compiled once per process by the spec registry
         try:
             # First, load the schema for a *single message*
-            single_message_schema = json.loads(A2UI_SCHEMA)
+            single_message_schema = spec_registry.get_schema(A2UI_VERSION, strict=A2UI_STRICT_SCHEMA)
 
             # The prompt instructs the LLM to return a *list* of messages.
             # Therefore, our validation schema must be an *array* of the single message schema.
             self.a2ui_schema_object = {"type": "array", "items": single_message_schema}
+            # Each message is checked on its own as soon as it streams, and each
+            # component only against the catalog schema of its own type
+            self._a2ui_message_validator = spec_registry.get_validator(
+                A2UI_VERSION, strict=A2UI_STRICT_SCHEMA
+            )
             logger.info(
-                "A2UI_SCHEMA successfully loaded and wrapped in an array validator."
+                f"A2UI v{A2UI_VERSION} schema successfully loaded and wrapped in an array validator."
             )
-        except json.JSONDecodeError as e:
-            logger.error(f"CRITICAL: Failed to parse A2UI_SCHEMA: {e}")
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"CRITICAL: Failed to load the A2UI v{A2UI_VERSION} schema: {e}")
             self.a2ui_schema_object = None
+            self._a2ui_message_validator = None
 
     def _build_agent(self) -> CompiledStateGraph:
         """Builds the agent for the presenter."""
-        instruction = AGENT_INSTRUCTION + get_ui_prompt(
-            self.base_url, RESTAURANT_UI_EXAMPLES
-        )
+        if self.compact_ui_output:
+            # Neither the examples nor the schema, the server expands the template
+            instruction = COMPACT_AGENT_INSTRUCTION + get_compact_ui_prompt()
+        else:
+            instruction = AGENT_INSTRUCTION + get_ui_prompt(
+                self.base_url, RESTAURANT_UI_EXAMPLES
+            )
 
         oci_llm = ChatOCIGenAI(
             model_id=self.oci_model,
@@ -82,9 +128,128 @@ class PresenterAgent:
             name=self.agent_name
         )
     
-    async def __call__(self, state):
+    @staticmethod
+    def _build_query(state: RestaurantGraphState) -> str:
+        """ Request plus the catalog records handed over by the data finder """
+        records = state.get("restaurant_records")
+        if not records:
+            # The data finder answered without catalog data, present its answer instead
+            return str(state['messages'][-1].content)
+        user_query = state.get("user_query") or str(state['messages'][0].content)
+        return f"{user_query}\n\nRestaurant data:\n{json.dumps(records, ensure_ascii=False)}"
+
+    @staticmethod
+    def _list_title(state: RestaurantGraphState) -> str:
+        """ The user request as the list heading, e.g. "top 5 chinese restaurants in NY?" ->
+        "Top 5 chinese restaurants in NY" """
+        title = (state.get("user_query") or "").strip().rstrip("?!. ")
+        if not title or len(title) > MAX_TITLE_LENGTH:
+            return "Restaurants for you"
+        return title[0].upper() + title[1:]
+
+    def _render_template(self, state: RestaurantGraphState) -> tuple[str, list[dict], str] | None:
+        """ Conversational text, A2UI messages and template of the fixed layout the state calls for,
+        None for free-form requests that need the model """
+        action = state.get("ui_action") or {}
+        context = action.get("context") or {}
+        restaurant_name = context.get("restaurantName", "Unknown Restaurant")
+        image_url = context.get("imageUrl", "")
+
+        if action.get("name") == "book_restaurant":
+            text = f"Please fill in the details below to book a table at {restaurant_name}."
+            address = context.get("address", "Address not provided")
+            return text, render_booking_form(restaurant_name, address, image_url), BOOKING_FORM
+
+        if action.get("name") == "submit_booking":
+            party_size = context.get("partySize", "Unknown Size")
+            reservation_time = context.get("reservationTime", "Unknown Time")
+            dietary = context.get("dietary") or "None"
+            text = f"Your table at {restaurant_name} for {party_size} people at {reservation_time} is booked."
+            messages = render_confirmation(restaurant_name, party_size, reservation_time, dietary, image_url)
+            return text, messages, CONFIRMATION
+
+        records = state.get("restaurant_records")
+        if records:
+            text = f"Here are {len(records)} places I found for you."
+            messages = render_restaurant_list(records, self._list_title(state))
+            return text, messages, list_template(len(records))
+        return None
+
+    def _present_template(self, state: RestaurantGraphState, rendered: tuple[str, list[dict], str]) -> dict:
+        """ Publishes templated messages like validated model output and answers without a model call """
+        text, a2ui_messages, template = rendered
+        message = AIMessage(content=text, name=self.agent_name, id=f"template-{uuid.uuid4()}")
+        write = get_stream_writer()
+        for a2ui_message in a2ui_messages:
+            write({"a2ui_message": a2ui_message, "message_id": message.id})
+        metrics.increment(f"presenter.{self.agent_name}.templated.{template}")
+        logger.info(f"--- PresenterAgent: Rendered the {template} template without a model call. ---")
+        return {
+            'messages': [message],
+            'response_text': text,
+            'a2ui_messages': a2ui_messages
+        }
+
+    async def _generate(self, query_text: str) -> tuple[list[AnyMessage], StreamingA2uiValidator | None]:
+        """ Runs the agent and validates the UI while the model streams it. Raises A2uiStreamError as
+        soon as a message is invalid, which closes the stream and stops the generation there.
+        Validated messages are published on the graph's custom stream as they complete. """
+        validator = StreamingA2uiValidator(self._a2ui_message_validator) if self.use_ui else None
+        write = get_stream_writer()
+        response_messages = []
+        agent_input = [HumanMessage(content=query_text)]
+
+        stream = self._agent.astream(
+            {'messages': agent_input},
+            stream_mode=["messages", "values"]
+        )
+        async with aclosing(stream):
+            async for mode, data in stream:
+                if mode == "values":
+                    response_messages = data['messages']
+                    continue
+                chunk, metadata = data
+                if validator is None or metadata.get("langgraph_node") != "model" or not isinstance(chunk, AIMessageChunk):
+                    continue
+                for a2ui_message in validator.feed(chunk.text):
+                    write({"a2ui_message": a2ui_message, "message_id": chunk.id})
+
+        if validator is not None:
+            message = response_messages[-1]
+            completed = [] if validator.started else validator.feed(str(message.content))
+            completed.extend(validator.close())
+            for a2ui_message in completed:
+                write({"a2ui_message": a2ui_message, "message_id": message.id})
+        return new_messages(response_messages, agent_input), validator
+
+    async def _generate_compact(self, query_text: str) -> tuple[list[AnyMessage], str, list[dict]]:
+        """ Runs the agent for a compact UI with ainvoke and expands the complete response into A2UI
+        messages, nothing is streamed from here. Raises CompactUiError when the compact UI does not
+        parse or names no known template. """
+        agent_input = [HumanMessage(content=query_text)]
+        response = await self._agent.ainvoke({'messages': agent_input})
+        response_messages = new_messages(response['messages'], agent_input)
+        message = response_messages[-1]
+        self._record_output_tokens(message)
+
+        response_text, a2ui_messages, repaired = parse_compact_response(str(message.content))
+        if repaired:
+            metrics.increment(f"a2ui_validation.{self.agent_name}.repaired")
+        write = get_stream_writer()
+        for a2ui_message in a2ui_messages:
+            write({"a2ui_message": a2ui_message, "message_id": message.id})
+        return response_messages, response_text, a2ui_messages
+
+    def _record_output_tokens(self, message: AnyMessage) -> None:
+        """ Adds the output tokens of a model response to the metrics, approximated when the
+        provider does not report usage """
+        usage = getattr(message, "usage_metadata", None) or {}
+        output_tokens = usage.get("output_tokens") or count_tokens_approximately([message])
+        metrics.increment(f"presenter.{self.agent_name}.output_tokens", output_tokens)
+
+    async def __call__(self, state: RestaurantGraphState):
         """Call the presenter agent to generate and validate UI from restaurant data."""
-        data = state['messages'][-1].content
+        data = self._build_query(state)
 
         # UI Validation and Retry Logic (adapted from oci_agent.py)
         max_retries = 1  # Total 2 attempts
@@ -94,102 +259,97 @@ class PresenterAgent:
         # Ensure schema was loaded
         if self.use_ui and self.a2ui_schema_object is None:
             logger.error(
-                "--- PresenterAgent: A2UI_SCHEMA is not loaded. Cannot perform UI validation. ---"
+                "--- PresenterAgent: A2UI schema is not loaded. Cannot perform UI validation. ---"
             )
+            error_text = "I'm sorry, I'm facing an internal configuration error with my UI components."
             return {
-                'messages': state['messages'] + [
-                    AIMessage(content="I'm sorry, I'm facing an internal configuration error with my UI components.")
-                ]
+                'messages': [AIMessage(content=error_text)],
+                'response_text': error_text,
+                'a2ui_messages': []
             }
 
+        # Structured data fits one of the fixed templates, only free-form requests need the model
+        rendered = self._render_template(state) if self.use_ui else None
+        if rendered is not None:
+            return self._present_template(state, rendered)
+        metrics.increment(f"presenter.{self.agent_name}.generated")
+
         while attempt <= max_retries:
             attempt += 1
             logger.info(
                 f"--- PresenterAgent: Validation attempt {attempt}/{max_retries + 1} ---"
             )
 
-            messages = {'messages': [HumanMessage(content=current_query_text)]}
-            response = await self._agent.ainvoke(messages)
-            final_response_content = response['messages'][-1].content
-
-            # Validate the response
             is_valid = False
             error_message = ""
+            response_messages = []
+            response_text = ""
+            a2ui_messages = []
 
-            if self.use_ui:
-                logger.info(
-                    f"--- PresenterAgent: Validating UI response (Attempt {attempt})... ---"
-                )
-                try:
-                    if "---a2ui_JSON---" not in final_response_content:
-                        raise ValueError("Delimiter '---a2ui_JSON---' not found.")
-
-                    text_part, json_string = final_response_content.split(
-                        "---a2ui_JSON---", 1
-                    )
-
-                    if not json_string.strip():
-                        raise ValueError("JSON part is empty.")
-
-                    json_string_cleaned = (
-                        json_string.strip().lstrip("```json").rstrip("```").strip()
-                    )
-
-                    if not json_string_cleaned:
-                        raise ValueError("Cleaned JSON string is empty.")
-
-                    # Parse JSON
-                    parsed_json_data = json.loads(json_string_cleaned)
-
-                    # Validate against A2UI_SCHEMA
-                    logger.info(
-                        "--- PresenterAgent: Validating against A2UI_SCHEMA... ---"
+            try:
+                if self.use_ui and self.compact_ui_output:
+                    response_messages, response_text, a2ui_messages = await self._generate_compact(
+                        current_query_text
                     )
-                    jsonschema.validate(
-                        instance=parsed_json_data, schema=self.a2ui_schema_object
-                    )
-
                     logger.info(
-                        f"--- PresenterAgent: UI JSON successfully parsed AND validated against schema. "
-                        f"Validation OK (Attempt {attempt}). ---"
-                    )
-                    is_valid = True
-                    final_response_content = f"{text_part}\n---a2ui_JSON---\n{json_string}"
-                except (
-                    ValueError,
-                    json.JSONDecodeError,
-                    jsonschema.exceptions.ValidationError,
-                ) as e:
-                    logger.warning(
-                        f"--- PresenterAgent: A2UI validation failed: {e} (Attempt {attempt}) ---"
-                    )
-                    logger.warning(
-                        f"--- Failed response content: {final_response_content[:500]}... ---"
+                        f"--- PresenterAgent: Compact UI expanded into {len(a2ui_messages)} A2UI messages "
+                        f"(Attempt {attempt}). ---"
                     )
-                    error_message = f"Validation failed: {e}."
-
-            else:  # Not using UI, so text is always "valid"
+                else:
+                    response_messages, validator = await self._generate(current_query_text)
+                    self._record_output_tokens(response_messages[-1])
+                    if validator is None:
+                        # Not using UI, so text is always "valid"
+                        response_text = response_messages[-1].content
+                    else:
+                        response_text = validator.text
+                        a2ui_messages = validator.messages
+                        if validator.repaired:
+                            metrics.increment(f"a2ui_validation.{self.agent_name}.repaired")
+                        logger.info(
+                            f"--- PresenterAgent: UI JSON successfully parsed AND validated against schema. "
+                            f"Validation OK (Attempt {attempt}). ---"
+                        )
                 is_valid = True
+            except A2uiStreamError as e:
+                # Raised mid-stream, the rest of the invalid generation was never produced
+                metrics.increment(f"a2ui_validation.{self.agent_name}.aborted")
+                logger.warning(
+                    f"--- PresenterAgent: A2UI validation failed: {e} (Attempt {attempt}) ---"
+                )
+                error_message = f"Validation failed: {e}."
+            except CompactUiError as e:
+                logger.warning(
+                    f"--- PresenterAgent: Compact UI expansion failed: {e} (Attempt {attempt}) ---"
+                )
+                error_message = f"Validation failed: {e}."
 
             if is_valid:
                 logger.info(
                     f"--- PresenterAgent: Response is valid. Returning final response (Attempt {attempt}). ---"
                 )
-                # Update the response with validated content
-                validated_response = response.copy()
-                validated_response['messages'][-1] = AIMessage(content=final_response_content)
-                return validated_response
+                return {
+                    'messages': response_messages,
+                    'response_text': response_text,
+                    'a2ui_messages': a2ui_messages
+                }
 
             # If here, validation failed
             if attempt <= max_retries:
+                metrics.increment(f"a2ui_validation.{self.agent_name}.retried")
                 logger.warning(
                     f"--- PresenterAgent: Retrying... ({attempt}/{max_retries + 1}) ---"
                 )
                 # Prepare retry query
+                expected_json = (
+                    "The response MUST be a compact UI JSON object with a known template. "
+                    if self.compact_ui_output
+                    else "You MUST generate a valid response that strictly follows the A2UI JSON SCHEMA. "
+                    "The response MUST be a JSON list of A2UI messages. "
+                )
                 current_query_text = (
                     f"Your previous response was invalid. {error_message} "
-                    "You MUST generate a valid response that strictly follows the A2UI JSON SCHEMA. "
-                    "The response MUST be a JSON list of A2UI messages. "
+                    f"{expected_json}"
                     "Ensure the response is split by '---a2ui_JSON---' and the JSON part is well-formed. "
                     f"Please retry the original request: '{data}'"
                 )
@@ -199,11 +359,12 @@ class PresenterAgent:
         logger.error(
             "--- PresenterAgent: Max retries exhausted. Returning error. ---"
         )
+        error_text = (
+            "I'm sorry, I'm having trouble generating the interface for that request right now. "
+            "Please try again in a moment."
+        )
         return {
-            'messages': state['messages'] + [
-                AIMessage(content=(
-                    "I'm sorry, I'm having trouble generating the interface for that request right now. "
-                    "Please try again in a moment."
-                ))
-            ]
+            'messages': [AIMessage(content=error_text)],
+            'response_text': error_text,
+            'a2ui_messages': []
         }
@@ -1,23 +1,39 @@
+import os
+import uuid
 from collections.abc import AsyncIterable
 from typing import Any
-from langgraph.graph import StateGraph, START, END, MessagesState
+from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import InMemorySaver
-from langchain.messages import HumanMessage, AIMessage, AnyMessage, ToolMessage
+from langchain.messages import HumanMessage, AIMessage, AIMessageChunk, AnyMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
 
 from agent.graph.food_place_agent import RestaurantFinderAgent
 from agent.graph.data_agent import DataAgent
 from agent.graph.presenter_agent import PresenterAgent
-from agent.graph.struct import AgentConfig, RestaurantGraphException
+from agent.graph.struct import AgentConfig, RestaurantGraphException, RestaurantGraphState
+from agent.response_streaming import ResponseTextStreamer
 
 from dotenv import load_dotenv
 load_dotenv()
 
+# "values" walks full state snapshots, "delta" only consumes the messages added on each step
+STREAM_MODES = ("values", "delta")
+
+def _check_stream_mode(stream_mode: str) -> str:
+    if stream_mode not in STREAM_MODES:
+        raise ValueError(f"Unknown graph stream mode '{stream_mode}', expected one of {STREAM_MODES}")
+    return stream_mode
+
+# Checked on import, a typo fails the server start instead of every request
+GRAPH_STREAM_MODE = _check_stream_mode(os.getenv("GRAPH_STREAM_MODE", "values"))
+
 class RestaurantGraph:
     """ Graph to call the agent chain """
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain", "text/event-stream"]
     CONTENT_TRUNCATION_LENGTH = 50
+    # Node whose model tokens are streamed to the client as response text
+    RESPONSE_NODE = "presenter_agent"
 
     def __init__(self, base_url:str, use_ui:bool = False, graph_configuration: dict[str, AgentConfig] = None):
         if not graph_configuration:
@@ -26,14 +42,20 @@ class RestaurantGraph:
         self._place_finder = RestaurantFinderAgent(graph_configuration["place_finder_agent"])
         self._data_finder = DataAgent(graph_configuration["data_finder_agent"])
         self._presenter_agent = PresenterAgent(base_url, use_ui, graph_configuration["presenter_agent"])
+        self._checkpointer = None
+        self._restaurant_graph = None
 
     async def build_graph(self):
+        # Compiled graphs are shared by concurrent streams, never rebuild one in place
+        if self._restaurant_graph is not None:
+            return
+
         await self._place_finder.initialize()
         await self._data_finder.initialize()
 
         checkpointer = InMemorySaver()
 
-        graph_builder = StateGraph(MessagesState)
+        graph_builder = StateGraph(RestaurantGraphState)
 
         graph_builder.add_node("place_finder_agent",self._place_finder)
         graph_builder.add_node("place_data_agent",self._data_finder)
@@ -44,6 +66,7 @@ class RestaurantGraph:
         graph_builder.add_edge("place_data_agent", "presenter_agent")
         graph_builder.add_edge("presenter_agent", END)
 
+        self._checkpointer = checkpointer
         self._restaurant_graph = graph_builder.compile(checkpointer=checkpointer)
 
     def _format_tool_call_message(self, message: AnyMessage) -> tuple[str, str]:
@@ -89,59 +112,179 @@ class RestaurantGraph:
         detailed_message = f"Calling node {node_name} with status: {status_content[:self.CONTENT_TRUNCATION_LENGTH]}"
         return timeline_message, detailed_message
 
-    async def call_restaurant_graph(self, query, session_id) -> AsyncIterable[dict[str, Any]]:
-        current_message = {"messages":[HumanMessage(query)]}
-        config:RunnableConfig = {"run_id":str(session_id), "configurable":{"thread_id":str(session_id)}}
-        final_response_content = None
-        final_model_state = None
-        model_token_count = 0
-        node_name = "START"
+    def _format_node_start(self, node_name: str) -> tuple[str, str]:
+        timeline_message = f"Current query: {node_name}"
+        detailed_message = f"Query in process at {node_name}"
+        return timeline_message, detailed_message
 
-        # Stream graph execution
-        async for chunk in self._restaurant_graph.astream(
-            input=current_message,
+    def _format_message(self, message: AnyMessage, node_name: str, model_token_count: int) -> tuple[str, str, int]:
+        """ Timeline and detailed update for a message, with the running token count """
+        if hasattr(message, 'tool_calls') and message.tool_calls:
+            timeline_message, detailed_message = self._format_tool_call_message(message)
+        elif isinstance(message, ToolMessage):
+            timeline_message, detailed_message = self._format_tool_message(message)
+        elif isinstance(message, AIMessage):
+            timeline_message, model_token_count, detailed_message = self._format_ai_message(message, model_token_count)
+        elif isinstance(message, HumanMessage):
+            timeline_message, detailed_message = self._format_human_message(message, node_name)
+        else:
+            timeline_message, detailed_message = self._format_other_message(message, node_name)
+        return timeline_message, detailed_message, model_token_count
+
+    @staticmethod
+    def _node_from_namespace(namespace: tuple[str, ...]) -> str:
+        """ ("place_data_agent:<task id>", ...) -> "place_data_agent" """
+        return namespace[0].split(":", 1)[0]
+
+    def _response_token(self, namespace: tuple[str, ...], data) -> AIMessageChunk | None:
+        """ Model token chunk of the response node, None for any other streamed message """
+        chunk, metadata = data
+        if (
+            namespace
+            and self._node_from_namespace(namespace) == self.RESPONSE_NODE
+            and metadata.get("langgraph_node") == "model"
+            and isinstance(chunk, AIMessageChunk)
+        ):
+            return chunk
+        return None
+
+    async def _stream_values(self, graph_input: dict, config: RunnableConfig, final_state: dict):
+        """ (node, "message", latest message) per state snapshot, (node, "token", chunk) per response
+        token and (node, "a2ui", {a2ui_message, message_id}) per validated A2UI message, node names come
+        from the stream namespaces and updates so there are no state snapshots while streaming """
+        node_name = "START"
+        async for namespace, mode, data in self._restaurant_graph.astream(
+            input=graph_input,
             config=config,
-            stream_mode='values',
+            stream_mode=['updates', 'values', 'messages', 'custom'],
             subgraphs=True
         ):
-            latest_message: AnyMessage = chunk[1]['messages'][-1]
-            final_response_content = latest_message.content
-
-            # Format the message based on its type
-            if hasattr(latest_message, 'tool_calls') and latest_message.tool_calls:
-                timeline_message, detailed_message = self._format_tool_call_message(latest_message)
-            elif isinstance(latest_message, ToolMessage):
-                timeline_message, detailed_message = self._format_tool_message(latest_message)
-            elif isinstance(latest_message, AIMessage):
-                timeline_message, model_token_count, detailed_message = self._format_ai_message(latest_message, model_token_count)
-            elif isinstance(latest_message, HumanMessage):
-                # For human messages, update node_name from state before formatting
-                state = self._restaurant_graph.get_state(config=config, subgraphs=True)
-                node_name = str(state.next[0]) if state.next else "GRAPH"
-                timeline_message, detailed_message = self._format_human_message(latest_message, node_name)
+            if mode == 'messages':
+                chunk = self._response_token(namespace, data)
+                if chunk is not None:
+                    yield self.RESPONSE_NODE, "token", chunk
+                continue
+
+            if mode == 'custom':
+                # A2UI messages the presenter validated while its response streams
+                if "a2ui_message" in data:
+                    yield self.RESPONSE_NODE, "a2ui", data
+                continue
+
+            if mode == 'updates':
+                if not namespace:
+                    # A top level node finished, label the graph level states after it
+                    node_name = next(iter(data), node_name)
+                continue
+
+            if namespace:
+                node_name = self._node_from_namespace(namespace)
             else:
-                timeline_message, detailed_message = self._format_other_message(latest_message, node_name)
-
-            # Update node_name from graph state for non-human messages
-            if not isinstance(latest_message, HumanMessage):
-                state = self._restaurant_graph.get_state(config=config, subgraphs=True)
-                node_name = str(state.next[0]) if state.next else "GRAPH"
-
-            # Yield intermediate updates
-            yield {
-                "is_task_complete": False,
-                "updates": timeline_message,
-                "detailed_updates": detailed_message
-            }
-        
-        # Update the final response to contain the model_status.
-        text_part, json_string = final_response_content.split("---a2ui_JSON---", 1)
-        text_part = final_model_state
-        final_response_content = f"{text_part}\n---a2ui_JSON---\n{json_string}"
+                # Top level graph state, the last one holds the presenter output
+                final_state.clear()
+                final_state.update(data)
+            yield node_name, "message", data['messages'][-1]
+
+    async def _stream_delta(self, graph_input: dict, config: RunnableConfig, final_state: dict):
+        """ (node, "message", new message) per message added inside the agents or by a top level node
+        itself, (node, "start", None) when a node starts, (node, "token", chunk) per response token and
+        (node, "a2ui", event) per validated A2UI message """
+        # Node outputs repeat the messages their agents already streamed
+        streamed_ids = set()
+        async for namespace, mode, data in self._restaurant_graph.astream(
+            input=graph_input,
+            config=config,
+            stream_mode=['updates', 'tasks', 'messages', 'custom'],
+            subgraphs=True
+        ):
+            if mode == 'messages':
+                chunk = self._response_token(namespace, data)
+                if chunk is not None:
+                    yield self.RESPONSE_NODE, "token", chunk
+                continue
+
+            if mode == 'custom':
+                # A2UI messages the presenter validated while its response streams
+                if "a2ui_message" in data:
+                    yield self.RESPONSE_NODE, "a2ui", data
+                continue
+
+            if mode == 'tasks':
+                if not namespace and "result" not in data:
+                    yield data["name"], "start", None
+                continue
+
+            if not namespace:
+                for node_name, update in data.items():
+                    if isinstance(update, dict):
+                        final_state.update({key: value for key, value in update.items() if key != "messages"})
+                        # e.g. the templated presenter answer, added without an agent
+                        for message in update.get("messages", []):
+                            if message.id is None or message.id not in streamed_ids:
+                                yield node_name, "message", message
+                continue
+
+            node_name = self._node_from_namespace(namespace)
+            for update in data.values():
+                if isinstance(update, dict):
+                    for message in update.get("messages", []):
+                        streamed_ids.add(message.id)
+                        yield node_name, "message", message
+
+    async def call_restaurant_graph(
+        self, query, session_id, stream_mode: str | None = None, ui_action: dict | None = None
+    ) -> AsyncIterable[dict[str, Any]]:
+        stream_mode = GRAPH_STREAM_MODE if stream_mode is None else _check_stream_mode(stream_mode)
+
+        current_message = {"messages":[HumanMessage(query)], "user_query": query, "ui_action": ui_action or {}}
+        # Requests of the same A2A context run concurrently, each one gets its own checkpoint thread
+        thread_id = f"{session_id}:{uuid.uuid4().hex}"
+        config:RunnableConfig = {"run_id":str(session_id), "configurable":{"thread_id":thread_id}}
+        final_state = {}
+        model_token_count = 0
+        detailed_message = ""
+        stream = self._stream_values if stream_mode == "values" else self._stream_delta
+        # One per model call, a validation retry starts a new response
+        response_streamers: dict[str, ResponseTextStreamer] = {}
+
+        try:
+            async for node_name, kind, message in stream(current_message, config, final_state):
+                if kind == "token":
+                    streamer = response_streamers.setdefault(message.id, ResponseTextStreamer())
+                    response_delta, _ = streamer.feed(message.text)
+                    if response_delta:
+                        yield {
+                            "is_task_complete": False,
+                            "response_delta": response_delta,
+                            "message_id": message.id
+                        }
+                    continue
+
+                if kind == "a2ui":
+                    yield {"is_task_complete": False, **message}
+                    continue
+
+                if kind == "start":
+                    timeline_message, detailed_message = self._format_node_start(node_name)
+                else:
+                    timeline_message, detailed_message, model_token_count = self._format_message(
+                        message, node_name, model_token_count
+                    )
+
+                # Yield intermediate updates
+                yield {
+                    "is_task_complete": False,
+                    "updates": timeline_message,
+                    "detailed_updates": detailed_message
+                }
+        finally:
+            # The thread belongs to this request only, drop its checkpoints from the shared saver
+            await self._checkpointer.adelete_thread(thread_id)
 
         yield {
             "is_task_complete": True,
-            "content": final_response_content,
+            "content": final_state.get("response_text", ""),
+            "a2ui_messages": final_state.get("a2ui_messages", []),
             "detailed_updates": detailed_message,
             "token_count": str(model_token_count)
         }
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import List, Optional
+from langgraph.graph import MessagesState
 
 # Data class for better json handling
 @dataclass
@@ -10,6 +11,10 @@ class AgentConfig:
     name: str
     system_prompt: Optional[str]
     tools_enabled: List[str]
+    # Tool results reach the model as header plus rows instead of JSON
+    compact_tool_results: bool = False
+    # The presenter model outputs a template id and plain items, expanded into A2UI on the server
+    compact_ui_output: bool = False
 
 # JSON Schema for validating AgentConfig
 AGENT_CONFIG_SCHEMA = {
@@ -19,7 +24,9 @@ AGENT_CONFIG_SCHEMA = {
         "temperature": {"type": "number", "minimum": 0, "maximum": 2},
         "name": {"type": "string"},
         "system_prompt": {"type": ["string", "null"]},
-        "tools_enabled": {"type": "array", "items": {"type": "string"}}
+        "tools_enabled": {"type": "array", "items": {"type": "string"}},
+        "compact_tool_results": {"type": "boolean"},
+        "compact_ui_output": {"type": "boolean"}
     },
     "required": ["model", "temperature", "name", "tools_enabled"]
 }
@@ -49,13 +56,9 @@ DEFAULT_CONFIG = {
             model="xai.grok-4-fast-non-reasoning",
             temperature=0.7,
             name="data_finder_agent",
-            system_prompt="""You are an agent expert in finding restaurant data.
-            You will receive the information about a list of restaurants or caffeterias to find information about.
-            Your job is to gather that information and pass the full data to a new agent that will respond to the user.
-            Important, consider including links, image references and other UI data to be rendered during next steps.
-            Consider that caffeteria or restaurant data should be complete, use tools as required according to context.
-            Make sure to use the exact restaurant names from information.""",
-            tools_enabled=["get_restaurant_data", "get_cafe_data"]
+            # No prompt runs DataAgent.AGENT_INSTRUCTIONS, the one definition the client default also uses
+            system_prompt=None,
+            tools_enabled=["get_restaurant_data_batch", "get_cafe_data_batch"]
         ),
         "presenter_agent": AgentConfig(
             model="xai.grok-4",
@@ -66,6 +69,20 @@ DEFAULT_CONFIG = {
         )
     }
 
+# Graph state, nodes hand off their results through typed fields instead of message text
+class RestaurantGraphState(MessagesState):
+    # Original user request, set when the graph is called
+    user_query: str
+    # A2UI userAction the request came from, e.g. {"name": "book_restaurant", "context": {...}}
+    ui_action: dict
+    # Set by the place finder from its tool results
+    restaurant_names: list[str]
+    # Set by the data finder, one catalog record per place
+    restaurant_records: list[dict]
+    # Set by the presenter, conversational text and the validated A2UI message list
+    response_text: str
+    a2ui_messages: list[dict]
+
 # Exception for the config graph
 class RestaurantGraphException(Exception):
     """ Exception for missing graph configs """
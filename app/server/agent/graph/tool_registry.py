@@ -0,0 +1,159 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import types
+
+from agent.graph.mcp_session_pool import IN_PROCESS_TRANSPORT, McpSessionPool
+from agent.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# MCP servers used by the graph agents, pool_size is the number of warm sessions kept per server
+MCP_SERVERS = {
+    "data_server": {
+        "transport": "streamable_http",  # HTTP-based remote server
+        "url": "http://localhost:8001/mcp",
+        "pool_size": 4,
+    },
+    "food_place_server": {
+        "transport": "streamable_http",  # HTTP-based remote server
+        "url": "http://localhost:8000/mcp",
+        "pool_size": 4,
+    }
+}
+
+# Same servers and tools bound in-process through an in-memory transport, for single host deployments
+MCP_IN_PROCESS_SERVERS = {
+    "data_server": {
+        "transport": IN_PROCESS_TRANSPORT,
+        "module": "agent.mcp.data_server",
+        "pool_size": 4,
+    },
+    "food_place_server": {
+        "transport": IN_PROCESS_TRANSPORT,
+        "module": "agent.mcp.food_place_server",
+        "pool_size": 4,
+    }
+}
+
+# "http" talks to the remote servers, "in_process" runs the tool servers inside this process
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "http")
+
+class McpToolRegistry:
+    """ Process-wide cache of the tools exposed by the MCP servers, shared by every agent """
+
+    DEFAULT_TTL_SECONDS = 300
+
+    def __init__(self, connections: dict = MCP_SERVERS, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self._connections = connections
+        self.ttl_seconds = ttl_seconds
+        self._pools: dict[str, McpSessionPool] = {}
+        self._tools: list[BaseTool] = []
+        self._discovered_at: float | None = None
+        self._list_changed = False
+        # Bumped whenever a discovery returns different tools, agents built on an older one are stale
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        if self._discovered_at is None or self._list_changed:
+            return False
+        return time.monotonic() - self._discovered_at < self.ttl_seconds
+
+    async def _ensure_fresh(self) -> None:
+        if self._is_fresh():
+            metrics.increment("mcp_tools.cache_hits")
+            return
+        async with self._lock:
+            # Another agent may have refreshed the tools while waiting for the lock
+            if self._is_fresh():
+                metrics.increment("mcp_tools.cache_hits")
+            else:
+                await self._discover()
+
+    async def get_generation(self) -> int:
+        """ Generation of the current tool list, refreshed first when the TTL expired or a server
+        reported a change. Agents bind their tools when built, so a new generation needs new agents """
+        await self._ensure_fresh()
+        return self._generation
+
+    async def get_tools(self, tools_enabled: list[str] | None = None) -> list[BaseTool]:
+        """ Returns the discovered tools, filtered by name when tools_enabled is given """
+        await self._ensure_fresh()
+
+        if tools_enabled is None:
+            return list(self._tools)
+        return [tool for tool in self._tools if tool.name in tools_enabled]
+
+    def invalidate(self) -> None:
+        """ Forces a new discovery on the next get_tools call """
+        self._list_changed = True
+
+    async def _discover(self) -> None:
+        if self._discovered_at is None:
+            reason = "initial"
+        elif self._list_changed:
+            reason = "list_changed"
+        else:
+            reason = "ttl_expired"
+
+        start = time.perf_counter()
+        try:
+            tools_per_server = await asyncio.gather(*(
+                load_mcp_tools(self._get_pool(name), server_name=name) for name in self._connections
+            ))
+            tools = [tool for server_tools in tools_per_server for tool in server_tools]
+        except Exception as e:
+            if not self._tools:
+                raise
+            # Keep serving the last known tools rather than failing the graph build
+            metrics.increment("mcp_tools.stale_served")
+            logger.warning(f"MCP tool discovery failed, serving stale tools: {e}")
+            return
+        finally:
+            metrics.observe("mcp_tools.discovery", time.perf_counter() - start)
+
+        metrics.increment(f"mcp_tools.refresh.{reason}")
+        logger.info(f"Discovered {len(tools)} MCP tools ({reason}): {[tool.name for tool in tools]}")
+
+        if self._signature(tools) != self._signature(self._tools):
+            self._generation += 1
+        self._tools = tools
+        self._discovered_at = time.monotonic()
+        self._list_changed = False
+
+    @staticmethod
+    def _signature(tools: list[BaseTool]) -> list[tuple[str, str, str]]:
+        """ What the agents see of each tool, rediscovered tools are new objects even when unchanged """
+        return [(tool.name, tool.description, json.dumps(tool.args, sort_keys=True, default=str)) for tool in tools]
+
+    def _get_pool(self, server_name: str) -> McpSessionPool:
+        """ Tools are bound to the server pool, so every call reuses a warm session """
+        pool = self._pools.get(server_name)
+        if pool is None:
+            connection = dict(self._connections[server_name])
+            size = connection.pop("pool_size", McpSessionPool.DEFAULT_POOL_SIZE)
+            # Persistent sessions also receive the server notifications
+            pool = McpSessionPool(server_name, connection, size=size, message_handler=self._handle_message)
+            self._pools[server_name] = pool
+        return pool
+
+    async def aclose(self) -> None:
+        """ Closes every pooled MCP session """
+        for pool in self._pools.values():
+            await pool.aclose()
+        self._pools.clear()
+
+    async def _handle_message(self, message) -> None:
+        if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ToolListChangedNotification):
+            metrics.increment("mcp_tools.list_changed")
+            logger.info("MCP server reported a tool list change, tools will be refreshed")
+            self.invalidate()
+
+tool_registry = McpToolRegistry(
+    MCP_IN_PROCESS_SERVERS if MCP_TRANSPORT == IN_PROCESS_TRANSPORT else MCP_SERVERS
+)
@@ -1,6 +1,10 @@
+import asyncio
+import copy
+import hashlib
 import json
 import logging
-import copy
+import time
+from collections import OrderedDict
 from dataclasses import asdict
 import jsonschema
 
@@ -24,30 +28,78 @@ from a2a.utils.errors import ServerError
 from a2ui.a2ui_extension import create_a2ui_part, try_activate_a2ui_extension
 from agent.graph.restaurant_graph import RestaurantGraph
 from agent.graph.struct import AgentConfig, CONFIG_SCHEMA, DEFAULT_CONFIG
+from agent.graph.tool_registry import tool_registry
+from agent.metrics import metrics
+from agent.response_streaming import create_response_delta_part, create_streamed_a2ui_part
 
 logger = logging.getLogger(__name__)
 
 class RestaurantGraphExecutor(AgentExecutor):
     """Executor of a full graph"""
 
+    # Compiled graphs kept alive, enough for both UI modes of a couple of configs
+    GRAPH_CACHE_SIZE = 4
+
     def __init__(self, base_url: str):
         self.default_config = copy.deepcopy(DEFAULT_CONFIG)
         self.current_config = copy.deepcopy(self.default_config)
         self.base_url = base_url
-        self._recreate_graphs()
-
-    def _recreate_graphs(self):
-        """Recreate graph instances with current config"""
-        self._ui_restaurant_graph = RestaurantGraph(
-            base_url=self.base_url, 
-            use_ui=True, 
-            graph_configuration=self.current_config
-        )
-        self._restaurant_graph = RestaurantGraph(
-            base_url=self.base_url, 
-            use_ui=False, 
-            graph_configuration=self.current_config
-        )
+        self._graph_cache: OrderedDict[tuple[bool, str, int], RestaurantGraph] = OrderedDict()
+        self._graph_build_lock = asyncio.Lock()
+        self._config_fingerprint = self._compute_fingerprint(self.current_config)
+
+    @staticmethod
+    def _compute_fingerprint(config: dict[str, AgentConfig]) -> str:
+        """Stable hash of a graph configuration, used as the graph cache key"""
+        serialized = json.dumps({k: asdict(v) for k, v in config.items()}, sort_keys=True)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def _refresh_fingerprint(self) -> None:
+        """Recompute the config fingerprint, graphs for a new one are built on next request"""
+        fingerprint = self._compute_fingerprint(self.current_config)
+        if fingerprint != self._config_fingerprint:
+            logger.info(f"Graph configuration fingerprint changed to {fingerprint[:12]}")
+            self._config_fingerprint = fingerprint
+
+    async def _get_graph(self, use_ui: bool) -> RestaurantGraph:
+        """Return a compiled graph for the current config and tools, building it only on a cache miss"""
+        # Snapshot config and key together so a concurrent config update cannot mix them
+        config = self.current_config
+        fingerprint = self._config_fingerprint
+        # Agents bind the MCP tools when built, a changed tool list needs a new graph
+        tools_generation = await tool_registry.get_generation()
+        key = (use_ui, fingerprint, tools_generation)
+
+        graph = self._graph_cache.get(key)
+        if graph is not None:
+            self._graph_cache.move_to_end(key)
+            metrics.increment("graph_cache.hits")
+            return graph
+
+        async with self._graph_build_lock:
+            # Another request may have built it while waiting for the lock
+            graph = self._graph_cache.get(key)
+            if graph is not None:
+                self._graph_cache.move_to_end(key)
+                metrics.increment("graph_cache.hits")
+                return graph
+
+            metrics.increment("graph_cache.misses")
+            start = time.perf_counter()
+            graph = RestaurantGraph(
+                base_url=self.base_url,
+                use_ui=use_ui,
+                graph_configuration=config
+            )
+            await graph.build_graph()
+            build_seconds = time.perf_counter() - start
+            metrics.observe("graph_cache.build", build_seconds)
+            logger.info(f"--- AGENT_EXECUTOR: Built graph (use_ui={use_ui}) in {build_seconds:.2f}s ---")
+
+            self._graph_cache[key] = graph
+            while len(self._graph_cache) > self.GRAPH_CACHE_SIZE:
+                self._graph_cache.popitem(last=False)
+            return graph
 
     async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
         query = ""
@@ -58,13 +110,11 @@ class RestaurantGraphExecutor(AgentExecutor):
         use_ui = try_activate_a2ui_extension(context)
 
         # Determine which agent to use based on whether the a2ui extension is active.
+        # Streams keep their own reference, config updates never swap it underneath them
+        agent = await self._get_graph(use_ui)
         if use_ui:
-            agent = self._ui_restaurant_graph
-            await agent.build_graph()
             logger.info("--- AGENT_EXECUTOR: A2UI extension is active. Using UI agent. ---")
         else:
-            agent = self._restaurant_graph
-            await agent.build_graph()
             logger.info("--- AGENT_EXECUTOR: A2UI extension is not active. Using text agent. ---")
 
         if context.message and context.message.parts:
@@ -118,9 +168,35 @@ class RestaurantGraphExecutor(AgentExecutor):
             await event_queue.enqueue_event(task)
         updater = TaskUpdater(event_queue, task.id, task.context_id)
 
+        # A2UI messages already sent during the response, keyed by the model response they came from
+        streamed_a2ui: dict[str, list[dict]] = {}
+        last_streamed_id = None
+
         # MAIN execution method
-        async for item in agent.call_restaurant_graph(query, task.context_id):
+        async for item in agent.call_restaurant_graph(query, task.context_id, ui_action=ui_event_part):
             is_task_complete = item["is_task_complete"]
+            if not is_task_complete and "a2ui_message" in item:
+                last_streamed_id = item["message_id"]
+                streamed_a2ui.setdefault(last_streamed_id, []).append(item["a2ui_message"])
+                await updater.update_status(
+                    TaskState.working,
+                    new_agent_parts_message(
+                        [create_streamed_a2ui_part(item["a2ui_message"], last_streamed_id)],
+                        task.context_id, task.id
+                    ),
+                )
+                continue
+
+            if not is_task_complete and "response_delta" in item:
+                await updater.update_status(
+                    TaskState.working,
+                    new_agent_parts_message(
+                        [create_response_delta_part(item["response_delta"], item["message_id"])],
+                        task.context_id, task.id
+                    ),
+                )
+                continue
+
             if not is_task_complete:
                 update_parts = []
                 update_parts.append(Part(root=TextPart(text=item['updates'])))
@@ -139,33 +215,22 @@ class RestaurantGraphExecutor(AgentExecutor):
 
             content = item["content"]
             final_parts = []
-            if "---a2ui_JSON---" in content:
-                logger.info("Splitting final response into text and UI parts.")
-                text_content, json_string = content.split("---a2ui_JSON---", 1)
-
-                if text_content.strip():
-                    final_parts.append(Part(root=TextPart(text=text_content.strip())))
-
-                if json_string.strip():
-                    try:
-                        json_string_cleaned = (json_string.strip().lstrip("```json").rstrip("```").strip())
-                        json_data = json.loads(json_string_cleaned)
-
-                        if isinstance(json_data, list):
-                            logger.info(f"Found {len(json_data)} messages. Creating individual DataParts.")
-                            for message in json_data:
-                                final_parts.append(create_a2ui_part(message))
-                        else:
-                            # Handle the case where a single JSON object is returned
-                            logger.info("Received a single JSON object. Creating a DataPart.")
-                            final_parts.append(create_a2ui_part(json_data))
-
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse UI JSON: {e}")
-                        final_parts.append(Part(root=TextPart(text=json_string)))
-            else:
+            if content.strip():
                 final_parts.append(Part(root=TextPart(text=content.strip())))
 
+            # Already parsed and validated by the presenter
+            a2ui_messages = item["a2ui_messages"]
+            final_message_metadata = None
+            if a2ui_messages and a2ui_messages == streamed_a2ui.get(last_streamed_id):
+                logger.info(f"All {len(a2ui_messages)} messages were streamed, not repeating them.")
+                # Tells the client to keep the surfaces built from that response
+                final_message_metadata = {"a2ui_streamed": last_streamed_id}
+            else:
+                # Untagged parts replace whatever was streamed from a response that failed validation
+                logger.info(f"Found {len(a2ui_messages)} messages. Creating individual DataParts.")
+                for message in a2ui_messages:
+                    final_parts.append(create_a2ui_part(message))
+
             final_parts.append(Part(root=TextPart(text=item['detailed_updates'])))
             final_parts.append(Part(root=TextPart(text=item['token_count'])))
 
@@ -180,9 +245,11 @@ class RestaurantGraphExecutor(AgentExecutor):
             # TODO: remove in case multiturn is enabled
             final_state = TaskState.completed
 
+            final_message = new_agent_parts_message(final_parts, task.context_id, task.id)
+            final_message.metadata = final_message_metadata
             await updater.update_status(
                 final_state,
-                new_agent_parts_message(final_parts, task.context_id, task.id),
+                final_message,
                 final=(final_state == TaskState.completed),
             )
             break
@@ -214,8 +281,8 @@ class RestaurantGraphExecutor(AgentExecutor):
             # Update current config
             self.current_config = config_objects
 
-            # Recreate graphs with new config
-            self._recreate_graphs()
+            # Graphs for the new config are built lazily on the next request
+            self._refresh_fingerprint()
 
             logger.info("Configuration updated successfully")
             return True, ""
@@ -232,5 +299,5 @@ class RestaurantGraphExecutor(AgentExecutor):
     def reset_config(self) -> None:
         """Reset configuration to default"""
         self.current_config = copy.deepcopy(self.default_config)
-        self._recreate_graphs()
+        self._refresh_fingerprint()
         logger.info("Configuration reset to default")
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+
+from agent.mcp.name_matcher import NameMatcher
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+# Separators the LLM uses when it passes several names in one string
+_NAME_SEPARATORS = re.compile(r"[\n,;|]")
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+def normalize_name(name: str) -> str:
+    """ Case, accent and punctuation insensitive key, "Xi’an Famous-Foods" -> "xi an famous foods",
+    "Café Olé" -> "cafe ole" """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    without_marks = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", without_marks).strip()
+
+def split_names(text: str) -> list[str]:
+    """ Splits a free text list of names into individual candidates """
+    candidates = []
+    for segment in _NAME_SEPARATORS.split(text):
+        segment = _LIST_MARKER.sub("", segment).strip()
+        if segment:
+            candidates.append(segment)
+    return candidates
+
+@dataclass(frozen=True)
+class _CatalogSnapshot:
+    """ Immutable records and indexes, replaced as a whole on reload """
+    records: list[dict] = field(default_factory=list)
+    by_name: dict[str, dict] = field(default_factory=dict)
+    matcher: NameMatcher = field(default_factory=lambda: NameMatcher([]))
+    mtimes: dict[str, float] = field(default_factory=dict)
+
+class Catalog:
+    """ Load-once view over JSON catalog files with a name index, reloaded when a file changes """
+
+    # Minimum time between file modification checks
+    CHECK_INTERVAL_SECONDS = 1.0
+
+    def __init__(self, sources: dict[str, str]):
+        # category (cuisine) -> JSON file with a list of records
+        self._sources = sources
+        self._snapshot = _CatalogSnapshot()
+        self._checked_at = 0.0
+        self._reload_lock = threading.Lock()
+
+    @property
+    def records(self) -> list[dict]:
+        return self._snapshot.records
+
+    async def refresh(self) -> None:
+        """ Reloads changed files off the event loop, at most once per check interval """
+        if time.monotonic() - self._checked_at < self.CHECK_INTERVAL_SECONDS:
+            return
+        await asyncio.to_thread(self.reload_if_changed)
+
+    def reload_if_changed(self) -> bool:
+        with self._reload_lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtimes = {path: os.stat(path).st_mtime for path in self._sources.values()}
+                if mtimes == self._snapshot.mtimes:
+                    return False
+                snapshot = self._build_snapshot(mtimes)
+            except (OSError, json.JSONDecodeError) as e:
+                if not self._snapshot.mtimes:
+                    raise
+                # A file being rewritten, keep serving the last good catalog
+                logger.warning(f"Catalog reload failed, keeping previous data: {e}")
+                return False
+            # Single reference swap, readers see either the old or the new catalog
+            self._snapshot = snapshot
+            logger.info(f"Catalog loaded {len(snapshot.records)} records from {len(self._sources)} files")
+            return True
+
+    def _build_snapshot(self, mtimes: dict[str, float]) -> _CatalogSnapshot:
+        records = []
+        by_name = {}
+        for path in self._sources.values():
+            with open(path, "r", encoding="utf-8") as f:
+                file_records = json.load(f)
+            for record in file_records:
+                records.append(record)
+                by_name.setdefault(normalize_name(record["name"]), record)
+        return _CatalogSnapshot(
+            records=records,
+            by_name=by_name,
+            # Compiled once per load, shared by every lookup until the next reload
+            matcher=NameMatcher(by_name.keys()),
+            mtimes=mtimes,
+        )
+
+    def find(self, names_text: str) -> list[tuple[dict, float]]:
+        """ (record, match score) for the names in a free text list """
+        matches: dict[str, tuple[dict, float]] = {}
+        for candidate in split_names(names_text):
+            for record, score in self._match_candidate(candidate):
+                key = normalize_name(record["name"])
+                if score > matches.get(key, (None, 0.0))[1]:
+                    matches[key] = (record, score)
+        return list(matches.values())
+
+    def match(self, name: str) -> tuple[dict, float] | None:
+        """ Best (record, match score) for a single requested name """
+        return next(iter(self._match_candidate(name)), None)
+
+    def _match_candidate(self, candidate: str) -> list[tuple[dict, float]]:
+        """ Hash lookup first, then a single automaton pass for names mentioned inside longer
+        text, with a near miss search over the text no name covered for misspelled names """
+        snapshot = self._snapshot
+        normalized = normalize_name(candidate)
+        record = snapshot.by_name.get(normalized)
+        if record is not None:
+            return [(record, 1.0)]
+        return [(snapshot.by_name[match.key], match.score) for match in snapshot.matcher.match_text(normalized)]
+
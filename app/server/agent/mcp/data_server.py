@@ -1,50 +1,108 @@
 import json
 import os
+from typing import TypedDict
 from mcp.server.fastmcp import FastMCP
 
-from typing import List
+from agent.a2ui_components import RESTAURANT_RECORD_FIELDS
+from agent.mcp.catalog import Catalog
+
+# Stateful sessions let pooled clients reuse one initialized session for many calls,
+# set MCP_STATELESS_HTTP=true to go back to a new session per request
+STATELESS_HTTP = os.getenv("MCP_STATELESS_HTTP", "false").lower() == "true"
+
+mcp = FastMCP("data_server", host="localhost",port=8001,stateless_http=STATELESS_HTTP,mount_path="/mcp")
+
+# Catalogs are loaded once and indexed, files are reloaded when they change on disk
+SCRIPT_DIR = os.path.dirname(__file__)
+RESTAURANT_CATALOG = Catalog({
+    "chinese": os.path.join(SCRIPT_DIR, "chinese_data.json"),
+    "italian": os.path.join(SCRIPT_DIR, "italian_data.json"),
+})
+CAFE_CATALOG = Catalog({
+    "cafe": os.path.join(SCRIPT_DIR, "caffeteria_data.json"),
+})
+
+def project(record: dict, fields: list[str] | None = None) -> dict:
+    """ Keeps only the requested fields, by default the ones the UI templates bind """
+    fields = fields or RESTAURANT_RECORD_FIELDS
+    return {key: value for key, value in record.items() if key in fields}
+
+class CatalogItemResult(TypedDict):
+    """ Outcome for one requested name, record is None when it is not in the catalog """
+    query: str
+    found: bool
+    matchScore: float
+    record: dict | None
+
+class CatalogBatchResult(TypedDict):
+    results: list[CatalogItemResult]
+    notFound: list[str]
+
+def batch_lookup(catalog: Catalog, names: list[str], fields: list[str] | None = None) -> CatalogBatchResult:
+    """ Resolves every requested name in one call, with an explicit marker for missing ones """
+    results = []
+    not_found = []
+    for name in names:
+        match = catalog.match(name)
+        if match is None:
+            not_found.append(name)
+            results.append({"query": name, "found": False, "matchScore": 0.0, "record": None})
+            continue
+        record, score = match
+        results.append({"query": name, "found": True, "matchScore": score, "record": project(record, fields)})
+    return {"results": results, "notFound": not_found}
+
+def format_matches(matches: list[tuple[dict, float]], names: str, fields: list[str] | None = None) -> str:
+    """ Matched records with their score, or an explicit final answer when nothing matched """
+    if not matches:
+        return (
+            f"No catalog data found for: {names}. These places are not in the catalog, "
+            "do not call this tool again for them."
+        )
+    # Raw unicode, escaped stars and accents cost several tokens each
+    return json.dumps(
+        [{**project(record, fields), "matchScore": score} for record, score in matches], ensure_ascii=False
+    )
 
-mcp = FastMCP("data_server", host="localhost",port=8001,stateless_http=True,mount_path="/mcp")
-
-def load_restaurant_json():
-    # Load data from JSON files
-    script_dir = os.path.dirname(__file__)
-    with open(os.path.join(script_dir, 'chinese_data.json'), 'r') as f:
-        chinese_data = json.load(f)
+# this server is in charge of finding information about the restaurants selected
 
-    with open(os.path.join(script_dir, 'italian_data.json'), 'r') as f:
-        italian_data = json.load(f)
+@mcp.tool()
+async def get_restaurant_data(restaurant_names: str, fields: list[str] | None = None) -> str:
+    """ Uses the restaurant names to return data for the specified restaurants.
+    Optionally pass 'fields' to only return those record fields. """
 
-    all_restaurants = chinese_data + italian_data
+    await RESTAURANT_CATALOG.refresh()
 
-    return all_restaurants
+    matching_items = RESTAURANT_CATALOG.find(restaurant_names)
+    return format_matches(matching_items, restaurant_names, fields)
 
-def load_caffeteria_json():
-    script_dir = os.path.dirname(__file__)
-    with open(os.path.join(script_dir, 'caffeteria_data.json'), 'r') as f:
-        cafeteria_data = json.load(f)
+@mcp.tool()
+async def get_cafe_data(cafe_names: str, fields: list[str] | None = None) -> str:
+    """ Returns information about the specified cafes based on names.
+    Optionally pass 'fields' to only return those record fields. """
 
-    return cafeteria_data
+    await CAFE_CATALOG.refresh()
 
-# this server is in charge of finding information about the restaurants selected
+    matching_items = CAFE_CATALOG.find(cafe_names)
+    return format_matches(matching_items, cafe_names, fields)
 
 @mcp.tool()
-async def get_restaurant_data(restaurant_names: str) -> str:
-    """ Uses the restaurant names to return data for the specified restaurants. """
+async def get_restaurant_data_batch(restaurant_names: list[str], fields: list[str] | None = None) -> CatalogBatchResult:
+    """ Returns data for every restaurant in the list in a single call, use one entry per restaurant name.
+    Optionally pass 'fields' to only return those record fields. Names not in the catalog are listed in 'notFound'. """
 
-    all_restaurants = load_restaurant_json()
+    await RESTAURANT_CATALOG.refresh()
 
-    matching_items = [item for item in all_restaurants if item['name'] in restaurant_names]
-    return json.dumps(matching_items)
+    return batch_lookup(RESTAURANT_CATALOG, restaurant_names, fields)
 
 @mcp.tool()
-async def get_cafe_data(cafe_names: str) -> str:
-    """ Returns information about the specified cafes based on names """
+async def get_cafe_data_batch(cafe_names: list[str], fields: list[str] | None = None) -> CatalogBatchResult:
+    """ Returns data for every cafe in the list in a single call, use one entry per cafe name.
+    Optionally pass 'fields' to only return those record fields. Names not in the catalog are listed in 'notFound'. """
 
-    cafeteria_data = load_caffeteria_json()
+    await CAFE_CATALOG.refresh()
 
-    matching_items = [item for item in cafeteria_data if item['name'] in cafe_names]
-    return json.dumps(matching_items)
+    return batch_lookup(CAFE_CATALOG, cafe_names, fields)
 
 if __name__ == "__main__":
     try:
@@ -1,6 +1,11 @@
+import os
 from mcp.server.fastmcp import FastMCP
 
-mcp = FastMCP("food_place_server", host="localhost",port=8000,stateless_http=True,mount_path="/mcp")
+# Stateful sessions let pooled clients reuse one initialized session for many calls,
+# set MCP_STATELESS_HTTP=true to go back to a new session per request
+STATELESS_HTTP = os.getenv("MCP_STATELESS_HTTP", "false").lower() == "true"
+
+mcp = FastMCP("food_place_server", host="localhost",port=8000,stateless_http=STATELESS_HTTP,mount_path="/mcp")
 
 # This server is in charge of finding name places
 
@@ -0,0 +1,159 @@
+import re
+from collections import Counter, deque
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+@dataclass(frozen=True)
+class NameMatch:
+    """ Catalog key found for a query, score is 1.0 for exact mentions """
+    key: str
+    score: float
+
+class NameMatcher:
+    """ Aho-Corasick automaton over normalized catalog names, with a trigram index for near misses.
+
+    Input text must be normalized the same way as the names (lowercase words separated by single spaces).
+    """
+
+    # Near misses below this similarity are not reported
+    MIN_FUZZY_SCORE = 0.8
+    # Names sharing the most trigrams with the query that get a full similarity check
+    MAX_FUZZY_CANDIDATES = 20
+    # Trigrams in more names than this, e.g. " th" or "caf", say little about which name is meant
+    # and are not scanned, so a lookup does not grow with the catalog
+    MAX_TRIGRAM_POSTINGS = 500
+    # Rarest trigrams are scanned first until this many names share one with the query
+    MAX_CANDIDATE_POOL = 200
+
+    def __init__(self, names):
+        self._names = list(dict.fromkeys(names))
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[int]] = [[]]
+        self._trigrams: dict[str, list[int]] = {}
+        # Longest word span a near miss is searched in, one more word than the longest name
+        # so "red farm" still reaches "redfarm"
+        self._max_window_words = max((len(name.split()) for name in self._names), default=0) + 1
+
+        for index, name in enumerate(self._names):
+            self._add_pattern(index, name)
+            for trigram in set(self._trigrams_of(name)):
+                self._trigrams.setdefault(trigram, []).append(index)
+        self._build_failure_links()
+
+    def _add_pattern(self, index: int, name: str) -> None:
+        node = 0
+        for char in name:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(index)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                # Root children fail back to the root, not to themselves
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    @staticmethod
+    def _trigrams_of(text: str) -> list[str]:
+        padded = f"  {text} "
+        return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+    def find_mentions(self, text: str) -> list[NameMatch]:
+        """ Every whole-word name mention in one pass, longest match wins where names overlap """
+        return [NameMatch(self._names[index], 1.0) for _, _, index in self._mention_spans(text)]
+
+    def match_text(self, text: str) -> list[NameMatch]:
+        """ Exact mentions, plus the near misses in the text between them, in text order. A misspelled
+        name next to a correct one is found too, e.g. "xian famous foods and han dynasty". """
+        found = []
+        gap_start = 0
+        for start, end, index in self._mention_spans(text) + [(len(text), len(text), None)]:
+            found.extend(self._near_misses(text, gap_start, start))
+            if index is not None:
+                found.append((start, NameMatch(self._names[index], 1.0)))
+            gap_start = end
+        return [match for _, match in sorted(found, key=lambda item: item[0])]
+
+    def _mention_spans(self, text: str) -> list[tuple[int, int, int]]:
+        """ (start, end, name index) of the exact mentions, without overlaps """
+        hits = []
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for index in self._output[node]:
+                end = position + 1
+                start = end - len(self._names[index])
+                # Whole words only, so "he" never matches inside "the"
+                if (start == 0 or text[start - 1] == " ") and (end == len(text) or text[end] == " "):
+                    hits.append((start, end, index))
+
+        spans = []
+        covered_until = 0
+        for start, end, index in sorted(hits, key=lambda hit: (hit[0], hit[0] - hit[1])):
+            if start >= covered_until:
+                spans.append((start, end, index))
+                covered_until = end
+        return spans
+
+    def _near_misses(self, text: str, start: int, end: int) -> list[tuple[int, NameMatch]]:
+        """ (position, near miss) for the word spans of text[start:end], the best scoring spans
+        are kept first and spans overlapping them are dropped """
+        words = [(word.start() + start, word.end() + start) for word in re.finditer(r"\S+", text[start:end])]
+        windows = []
+        for first in range(len(words)):
+            for last in range(first, min(len(words), first + self._max_window_words)):
+                match = self.closest(text[words[first][0]:words[last][1]])
+                if match:
+                    windows.append((match, first, last))
+
+        used = set()
+        near_misses = []
+        # Highest score first, the shorter span on ties
+        for match, first, last in sorted(windows, key=lambda window: (-window[0].score, window[2] - window[1])):
+            span = set(range(first, last + 1))
+            if not span & used:
+                used |= span
+                near_misses.append((words[first][0], match))
+        return near_misses
+
+    def _candidates(self, text: str) -> Counter:
+        """ Name index -> trigrams shared with text. Postings are scanned rarest first, the common ones
+        skipped, until MAX_CANDIDATE_POOL names are collected, so at most MAX_TRIGRAM_POSTINGS names
+        per trigram of text are visited whatever the catalog size """
+        postings = sorted(
+            (self._trigrams[trigram] for trigram in set(self._trigrams_of(text)) if trigram in self._trigrams),
+            key=len,
+        )
+        shared = Counter()
+        for names in postings:
+            if len(names) > self.MAX_TRIGRAM_POSTINGS or len(shared) >= self.MAX_CANDIDATE_POOL:
+                break
+            shared.update(names)
+        return shared
+
+    def closest(self, text: str) -> NameMatch | None:
+        """ Best near miss for a single name, only checking names that share rare trigrams with it """
+        best = None
+        for index, _ in self._candidates(text).most_common(self.MAX_FUZZY_CANDIDATES):
+            name = self._names[index]
+            score = SequenceMatcher(None, text, name).ratio()
+            if score >= self.MIN_FUZZY_SCORE and (best is None or score > best.score):
+                best = NameMatch(name, round(score, 3))
+        return best
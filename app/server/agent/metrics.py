@@ -0,0 +1,39 @@
+import threading
+from collections import defaultdict
+
+class Metrics:
+    """ Process-wide counters and timings exposed on the /agent/metrics endpoint """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = defaultdict(int)
+        self._timings: dict[str, dict[str, float]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """ Records a duration, keeping count, total, last and max values """
+        with self._lock:
+            timing = self._timings.setdefault(
+                name, {"count": 0, "total_seconds": 0.0, "last_seconds": 0.0, "max_seconds": 0.0}
+            )
+            timing["count"] += 1
+            timing["total_seconds"] += seconds
+            timing["last_seconds"] = seconds
+            timing["max_seconds"] = max(timing["max_seconds"], seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "timings": {name: dict(values) for name, values in self._timings.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+metrics = Metrics()
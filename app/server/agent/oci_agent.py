@@ -2,23 +2,28 @@ import json
 import logging
 import os
 from collections.abc import AsyncIterable
+from contextlib import aclosing
 from typing import Any
 from langchain.agents import create_agent
 from langchain_oci import ChatOCIGenAI
-from langchain.messages import HumanMessage, AIMessage, AnyMessage, ToolMessage
+from langchain.messages import HumanMessage, AIMessage, AIMessageChunk, AnyMessage, ToolMessage
 from langgraph.graph.state import CompiledStateGraph
 from langchain_core.runnables import RunnableConfig
 from dotenv import load_dotenv
 load_dotenv()
 
-import jsonschema
+from a2ui.a2ui_stream_parser import A2uiStreamError
+from a2ui.a2ui_spec_registry import spec_registry
 from agent.prompt_builder import (
-    A2UI_SCHEMA,
+    A2UI_STRICT_SCHEMA,
+    A2UI_VERSION,
     RESTAURANT_UI_EXAMPLES,
     get_text_prompt,
     get_ui_prompt,
 )
 from agent.langchain_tools import get_restaurants
+from agent.metrics import metrics
+from agent.response_streaming import StreamingA2uiValidator
 
 logger = logging.getLogger(__name__)
 
@@ -50,20 +55,26 @@ class OCIRestaurantAgent:
         self._user_id = "remote_agent"
 
         # --- MODIFICATION: Wrap the schema ---
-        # Load the A2UI_SCHEMA string into a Python object for validation
+        # Read from the specification and compiled once per process by the spec registry
         try:
             # First, load the schema for a *single message*
-            single_message_schema = json.loads(A2UI_SCHEMA)
+            single_message_schema = spec_registry.get_schema(A2UI_VERSION, strict=A2UI_STRICT_SCHEMA)
 
             # The prompt instructs the LLM to return a *list* of messages.
             # Therefore, our validation schema must be an *array* of the single message schema.
             self.a2ui_schema_object = {"type": "array", "items": single_message_schema}
+            # Each message is checked on its own as soon as it streams, and each
+            # component only against the catalog schema of its own type
+            self._a2ui_message_validator = spec_registry.get_validator(
+                A2UI_VERSION, strict=A2UI_STRICT_SCHEMA
+            )
             logger.info(
-                "A2UI_SCHEMA successfully loaded and wrapped in an array validator."
+                f"A2UI v{A2UI_VERSION} schema successfully loaded and wrapped in an array validator."
             )
-        except json.JSONDecodeError as e:
-            logger.error(f"CRITICAL: Failed to parse A2UI_SCHEMA: {e}")
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"CRITICAL: Failed to load the A2UI v{A2UI_VERSION} schema: {e}")
             self.a2ui_schema_object = None
+            self._a2ui_message_validator = None
         # --- END MODIFICATION ---
 
     def _build_agent(self, use_ui: bool) -> CompiledStateGraph:
@@ -104,7 +115,7 @@ class OCIRestaurantAgent:
         # Ensure schema was loaded
         if self.use_ui and self.a2ui_schema_object is None:
             logger.error(
-                "--- RestaurantAgent.stream: A2UI_SCHEMA is not loaded. "
+                "--- RestaurantAgent.stream: A2UI schema is not loaded. "
                 "Cannot perform UI validation. ---"
             )
             yield {
@@ -123,52 +134,76 @@ class OCIRestaurantAgent:
                 f"for session {session_id} ---"
             )
 
-            current_message = {"messages":[HumanMessage(query)]}
+            current_message = {"messages":[HumanMessage(current_query_text)]}
             config:RunnableConfig = {"run_id":str(session_id)}
             final_response_content = None
             final_model_state = None
             model_token_count = 0
+            # UI is validated while the model streams it, an invalid message stops the generation
+            validator = StreamingA2uiValidator(self._a2ui_message_validator) if self.use_ui else None
+            validated_message_id = None
+            error_message = ""
 
-            async for event in self._agent.astream(
+            stream = self._agent.astream(
                 input=current_message,
-                stream_mode="values",
+                stream_mode=["values", "messages"],
                 config=config
-            ):
-                latest_update:AnyMessage = event['messages'][-1]
-                final_response_content = latest_update.content
-
-                if hasattr(latest_update, 'tool_calls') and latest_update.tool_calls:
-                    tool_name = str(latest_update.tool_calls[0].get('name'))
-                    tool_args = str(latest_update.tool_calls[0].get('args'))
-                    latest_update = f"Model calling tool: {tool_name} with args {tool_args}"
-                elif isinstance(latest_update,ToolMessage):
-                    tool_name = str(latest_update.name)
-                    status_content = str(latest_update.content)
-                    latest_update = f"Tool {tool_name} responded with:\n{status_content[:100]}...\n\nInformation passed to agent to build response"
-                elif isinstance(latest_update, AIMessage):
-                    status_content = str(latest_update.content)
-                    model_id = str(latest_update.response_metadata.get("model_id"))
-                    total_tokens_on_call = int(latest_update.response_metadata.get("total_tokens"))
-                    model_token_count = model_token_count + total_tokens_on_call
-                    agent_name = str(latest_update.name)
-                    model_data = f"""
-                        model_id: {model_id},
-                        agent_name: {agent_name},
-                        total_tokens_on_call: {str(model_token_count)}
-                    """
-                    latest_update = f"Agent current response:\n{status_content[:100]}...\n\nAgent metadata:\n{model_data}"
-                    final_model_state = latest_update
-                else:
-                    status_content = str(latest_update.content)
-                    latest_update = f"Processing task, current state:\n{status_content[:100]}..."
-
-                # Yield intermediate updates on every attempt
-                yield {
-                    "is_task_complete": False,
-                    "updates": latest_update
-                }
+            )
+            try:
+                async with aclosing(stream):
+                    async for mode, event in stream:
+                        if mode == "messages":
+                            chunk, metadata = event
+                            if validator is not None and metadata.get("langgraph_node") == "model" and isinstance(chunk, AIMessageChunk):
+                                if chunk.id != validated_message_id:
+                                    # Each model call is a new response, only the last one holds the UI
+                                    validated_message_id = chunk.id
+                                    validator = StreamingA2uiValidator(self._a2ui_message_validator)
+                                validator.feed(chunk.text)
+                            continue
+
+                        latest_update:AnyMessage = event['messages'][-1]
+                        final_response_content = latest_update.content
+
+                        if hasattr(latest_update, 'tool_calls') and latest_update.tool_calls:
+                            tool_name = str(latest_update.tool_calls[0].get('name'))
+                            tool_args = str(latest_update.tool_calls[0].get('args'))
+                            latest_update = f"Model calling tool: {tool_name} with args {tool_args}"
+                        elif isinstance(latest_update,ToolMessage):
+                            tool_name = str(latest_update.name)
+                            status_content = str(latest_update.content)
+                            latest_update = f"Tool {tool_name} responded with:\n{status_content[:100]}...\n\nInformation passed to agent to build response"
+                        elif isinstance(latest_update, AIMessage):
+                            status_content = str(latest_update.content)
+                            model_id = str(latest_update.response_metadata.get("model_id"))
+                            total_tokens_on_call = int(latest_update.response_metadata.get("total_tokens"))
+                            model_token_count = model_token_count + total_tokens_on_call
+                            agent_name = str(latest_update.name)
+                            model_data = f"""
+                                model_id: {model_id},
+                                agent_name: {agent_name},
+                                total_tokens_on_call: {str(model_token_count)}
+                            """
+                            latest_update = f"Agent current response:\n{status_content[:100]}...\n\nAgent metadata:\n{model_data}"
+                            final_model_state = latest_update
+                        else:
+                            status_content = str(latest_update.content)
+                            latest_update = f"Processing task, current state:\n{status_content[:100]}..."
+
+                        # Yield intermediate updates on every attempt
+                        yield {
+                            "is_task_complete": False,
+                            "updates": latest_update
+                        }
+            except A2uiStreamError as e:
+                # Raised mid-stream, the rest of the invalid generation was never produced
+                metrics.increment("a2ui_validation.restaurant_agent.aborted")
+                logger.warning(
+                    f"--- RestaurantAgent.stream: A2UI validation failed while streaming: {e} (Attempt {attempt}) ---"
+                )
+                error_message = f"Validation failed: {e}."
 
-            if final_response_content is None:
+            if final_response_content is None and not error_message:
                 logger.warning(
                     f"--- RestaurantAgent.stream: Received no final response content from runner "
                     f"(Attempt {attempt}). ---"
@@ -183,59 +218,31 @@ class OCIRestaurantAgent:
                     # Retries exhausted on no-response
                     final_response_content = "I'm sorry, I encountered an error and couldn't process your request."
                     # Fall through to send this as a text-only error
-            
+
             is_valid = False
-            error_message = ""
 
-            if self.use_ui:
+            if self.use_ui and not error_message:
                 logger.info(
                     f"--- RestaurantAgent.stream: Validating UI response (Attempt {attempt})... ---"
                 )
                 try:
-                    if "---a2ui_JSON---" not in final_response_content:
-                        raise ValueError("Delimiter '---a2ui_JSON---' not found.")
-
-                    text_part, json_string = final_response_content.split(
-                        "---a2ui_JSON---", 1
-                    )
+                    if not validator.started:
+                        # The model did not stream tokens, validate the complete answer instead
+                        validator.feed(final_response_content)
+                    # Every message was validated as it streamed, only the list has to be complete
+                    validator.close()
+                    if validator.repaired:
+                        metrics.increment("a2ui_validation.restaurant_agent.repaired")
 
                     text_part = final_model_state
 
-                    if not json_string.strip():
-                        raise ValueError("JSON part is empty.")
-
-                    json_string_cleaned = (
-                        json_string.strip().lstrip("```json").rstrip("```").strip()
-                    )
-
-                    if not json_string_cleaned:
-                        raise ValueError("Cleaned JSON string is empty.")
-
-                    # --- New Validation Steps ---
-                    # 1. Check if it's parsable JSON
-                    parsed_json_data = json.loads(json_string_cleaned)
-
-                    # 2. Check if it validates against the A2UI_SCHEMA
-                    # This will raise jsonschema.exceptions.ValidationError if it fails
-                    logger.info(
-                        "--- RestaurantAgent.stream: Validating against A2UI_SCHEMA... ---"
-                    )
-                    jsonschema.validate(
-                        instance=parsed_json_data, schema=self.a2ui_schema_object
-                    )
-                    # --- End New Validation Steps ---
-
                     logger.info(
                         f"--- RestaurantAgent.stream: UI JSON successfully parsed AND validated against schema. "
                         f"Validation OK (Attempt {attempt}). ---"
                     )
                     is_valid = True
-                    final_response_content = f"{text_part}\n---a2ui_JSON---\n{json_string}"
-                except (
-                    ValueError,
-                    json.JSONDecodeError,
-                    jsonschema.exceptions.ValidationError,
-                ) as e:
+                    final_response_content = f"{text_part}\n---a2ui_JSON---\n{json.dumps(validator.messages)}"
+                except A2uiStreamError as e:
                     logger.warning(
                         f"--- RestaurantAgent.stream: A2UI validation failed: {e} (Attempt {attempt}) ---"
                     )
@@ -244,7 +251,7 @@ class OCIRestaurantAgent:
                     )
                     error_message = f"Validation failed: {e}."
 
-            else:  # Not using UI, so text is always "valid"
+            elif not self.use_ui:  # Not using UI, so text is always "valid"
                 is_valid = True
 
             if is_valid:
@@ -261,6 +268,7 @@ class OCIRestaurantAgent:
             # --- If we're here, it means validation failed ---
 
             if attempt <= max_retries:
+                metrics.increment("a2ui_validation.restaurant_agent.retried")
                 logger.warning(
                     f"--- RestaurantAgent.stream: Retrying... ({attempt}/{max_retries + 1}) ---"
                 )
@@ -274,18 +282,18 @@ class OCIRestaurantAgent:
                 )
                 # Loop continues...
 
-            # --- If we're here, it means we've exhausted retries ---
-            logger.error(
-                "--- RestaurantAgent.stream: Max retries exhausted. Sending text-only error. ---"
-            )
-            yield {
-                "is_task_complete": True,
-                "content": (
-                    "I'm sorry, I'm having trouble generating the interface for that request right now. "
-                    "Please try again in a moment."
-                ),
-            }
-            # --- End: UI Validation and Retry Logic ---
+        # --- If we're here, it means we've exhausted retries ---
+        logger.error(
+            "--- RestaurantAgent.stream: Max retries exhausted. Sending text-only error. ---"
+        )
+        yield {
+            "is_task_complete": True,
+            "content": (
+                "I'm sorry, I'm having trouble generating the interface for that request right now. "
+                "Please try again in a moment."
+            ),
+        }
+        # --- End: UI Validation and Retry Logic ---
 
 async def main():
     """ Test section for agent class """
@@ -12,780 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-# The A2UI schema remains constant for all A2UI responses.
-A2UI_SCHEMA = r'''
-{
-  "title": "A2UI Message Schema",
-  "description": "Describes a JSON payload for an A2UI (Agent to UI) message, which is used to dynamically construct and update user interfaces. A message MUST contain exactly ONE of the action properties: 'beginRendering', 'surfaceUpdate', 'dataModelUpdate', or 'deleteSurface'.",
-  "type": "object",
-  "properties": {
-    "beginRendering": {
-      "type": "object",
-      "description": "Signals the client to begin rendering a surface with a root component and specific styles.",
-      "properties": {
-        "surfaceId": {
-          "type": "string",
-          "description": "The unique identifier for the UI surface to be rendered."
-        },
-        "root": {
-          "type": "string",
-          "description": "The ID of the root component to render."
-        },
-        "styles": {
-          "type": "object",
-          "description": "Styling information for the UI.",
-          "properties": {
-            "font": {
-              "type": "string",
-              "description": "The primary font for the UI."
-            },
-            "primaryColor": {
-              "type": "string",
-              "description": "The primary UI color as a hexadecimal code (e.g., '#00BFFF').",
-              "pattern": "^#[0-9a-fA-F]{6}$"
-            }
-          }
-        }
-      },
-      "required": ["root", "surfaceId"]
-    },
-    "surfaceUpdate": {
-      "type": "object",
-      "description": "Updates a surface with a new set of components.",
-      "properties": {
-        "surfaceId": {
-          "type": "string",
-          "description": "The unique identifier for the UI surface to be updated. If you are adding a new surface this *must* be a new, unique identified that has never been used for any existing surfaces shown."
-        },
-        "components": {
-          "type": "array",
-          "description": "A list containing all UI components for the surface.",
-          "minItems": 1,
-          "items": {
-            "type": "object",
-            "description": "Represents a *single* component in a UI widget tree. This component could be one of many supported types.",
-            "properties": {
-              "id": {
-                "type": "string",
-                "description": "The unique identifier for this component."
-              },
-              "weight": {
-                "type": "number",
-                "description": "The relative weight of this component within a Row or Column. This corresponds to the CSS 'flex-grow' property. Note: this may ONLY be set when the component is a direct descendant of a Row or Column."
-              },
-              "component": {
-                "type": "object",
-                "description": "A wrapper object that MUST contain exactly one key, which is the name of the component type (e.g., 'Heading'). The value is an object containing the properties for that specific component.",
-                "properties": {
-                  "Text": {
-                    "type": "object",
-                    "properties": {
-                      "text": {
-                        "type": "object",
-                        "description": "The text content to display. This can be a literal string or a reference to a value in the data model ('path', e.g., '/doc/title'). While simple Markdown formatting is supported (i.e. without HTML, images, or links), utilizing dedicated UI components is generally preferred for a richer and more structured presentation.",
-                        "properties": {
-                          "literalString": {
-                            "type": "string"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      },
-                      "usageHint": {
-                        "type": "string",
-                        "description": "A hint for the base text style. One of:\n- `h1`: Largest heading.\n- `h2`: Second largest heading.\n- `h3`: Third largest heading.\n- `h4`: Fourth largest heading.\n- `h5`: Fifth largest heading.\n- `caption`: Small text for captions.\n- `body`: Standard body text.",
-                        "enum": [
-                          "h1",
-                          "h2",
-                          "h3",
-                          "h4",
-                          "h5",
-                          "caption",
-                          "body"
-                        ]
-                      }
-                    },
-                    "required": ["text"]
-                  },
-                  "Image": {
-                    "type": "object",
-                    "properties": {
-                      "url": {
-                        "type": "object",
-                        "description": "The URL of the image to display. This can be a literal string ('literal') or a reference to a value in the data model ('path', e.g. '/thumbnail/url').",
-                        "properties": {
-                          "literalString": {
-                            "type": "string"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      },
-                      "fit": {
-                        "type": "string",
-                        "description": "Specifies how the image should be resized to fit its container. This corresponds to the CSS 'object-fit' property.",
-                        "enum": [
-                          "contain",
-                          "cover",
-                          "fill",
-                          "none",
-                          "scale-down"
-                        ]
-                      },
-                      "usageHint": {
-                        "type": "string",
-                        "description": "A hint for the image size and style. One of:\n- `icon`: Small square icon.\n- `avatar`: Circular avatar image.\n- `smallFeature`: Small feature image.\n- `mediumFeature`: Medium feature image.\n- `largeFeature`: Large feature image.\n- `header`: Full-width, full bleed, header image.",
-                        "enum": [
-                          "icon",
-                          "avatar",
-                          "smallFeature",
-                          "mediumFeature",
-                          "largeFeature",
-                          "header"
-                        ]
-                      }
-                    },
-                    "required": ["url"]
-                  },
-                  "Icon": {
-                    "type": "object",
-                    "properties": {
-                      "name": {
-                        "type": "object",
-                        "description": "The name of the icon to display. This can be a literal string or a reference to a value in the data model ('path', e.g. '/form/submit').",
-                        "properties": {
-                          "literalString": {
-                            "type": "string",
-                            "enum": [
-                              "accountCircle",
-                              "add",
-                              "arrowBack",
-                              "arrowForward",
-                              "attachFile",
-                              "calendarToday",
-                              "call",
-                              "camera",
-                              "check",
-                              "close",
-                              "delete",
-                              "download",
-                              "edit",
-                              "event",
-                              "error",
-                              "favorite",
-                              "favoriteOff",
-                              "folder",
-                              "help",
-                              "home",
-                              "info",
-                              "locationOn",
-                              "lock",
-                              "lockOpen",
-                              "mail",
-                              "menu",
-                              "moreVert",
-                              "moreHoriz",
-                              "notificationsOff",
-                              "notifications",
-                              "payment",
-                              "person",
-                              "phone",
-                              "photo",
-                              "print",
-                              "refresh",
-                              "search",
-                              "send",
-                              "settings",
-                              "share",
-                              "shoppingCart",
-                              "star",
-                              "starHalf",
-                              "starOff",
-                              "upload",
-                              "visibility",
-                              "visibilityOff",
-                              "warning"
-                            ]
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      }
-                    },
-                    "required": ["name"]
-                  },
-                  "Video": {
-                    "type": "object",
-                    "properties": {
-                      "url": {
-                        "type": "object",
-                        "description": "The URL of the video to display. This can be a literal string or a reference to a value in the data model ('path', e.g. '/video/url').",
-                        "properties": {
-                          "literalString": {
-                            "type": "string"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      }
-                    },
-                    "required": ["url"]
-                  },
-                  "AudioPlayer": {
-                    "type": "object",
-                    "properties": {
-                      "url": {
-                        "type": "object",
-                        "description": "The URL of the audio to be played. This can be a literal string ('literal') or a reference to a value in the data model ('path', e.g. '/song/url').",
-                        "properties": {
-                          "literalString": {
-                            "type": "string"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      },
-                      "description": {
-                        "type": "object",
-                        "description": "A description of the audio, such as a title or summary. This can be a literal string or a reference to a value in the data model ('path', e.g. '/song/title').",
-                        "properties": {
-                          "literalString": {
-                            "type": "string"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      }
-                    },
-                    "required": ["url"]
-                  },
-                  "Row": {
-                    "type": "object",
-                    "properties": {
-                      "children": {
-                        "type": "object",
-                        "description": "Defines the children. Use 'explicitList' for a fixed set of children, or 'template' to generate children from a data list.",
-                        "properties": {
-                          "explicitList": {
-                            "type": "array",
-                            "items": {
-                              "type": "string"
-                            }
-                          },
-                          "template": {
-                            "type": "object",
-                            "description": "A template for generating a dynamic list of children from a data model list. `componentId` is the component to use as a template, and `dataBinding` is the path to the map of components in the data model. Values in the map will define the list of children.",
-                            "properties": {
-                              "componentId": {
-                                "type": "string"
-                              },
-                              "dataBinding": {
-                                "type": "string"
-                              }
-                            },
-                            "required": ["componentId", "dataBinding"]
-                          }
-                        }
-                      },
-                      "distribution": {
-                        "type": "string",
-                        "description": "Defines the arrangement of children along the main axis (horizontally). This corresponds to the CSS 'justify-content' property.",
-                        "enum": [
-                          "center",
-                          "end",
-                          "spaceAround",
-                          "spaceBetween",
-                          "spaceEvenly",
-                          "start"
-                        ]
-                      },
-                      "alignment": {
-                        "type": "string",
-                        "description": "Defines the alignment of children along the cross axis (vertically). This corresponds to the CSS 'align-items' property.",
-                        "enum": ["start", "center", "end", "stretch"]
-                      }
-                    },
-                    "required": ["children"]
-                  },
-                  "Column": {
-                    "type": "object",
-                    "properties": {
-                      "children": {
-                        "type": "object",
-                        "description": "Defines the children. Use 'explicitList' for a fixed set of children, or 'template' to generate children from a data list.",
-                        "properties": {
-                          "explicitList": {
-                            "type": "array",
-                            "items": {
-                              "type": "string"
-                            }
-                          },
-                          "template": {
-                            "type": "object",
-                            "description": "A template for generating a dynamic list of children from a data model list. `componentId` is the component to use as a template, and `dataBinding` is the path to the map of components in the data model. Values in the map will define the list of children.",
-                            "properties": {
-                              "componentId": {
-                                "type": "string"
-                              },
-                              "dataBinding": {
-                                "type": "string"
-                              }
-                            },
-                            "required": ["componentId", "dataBinding"]
-                          }
-                        }
-                      },
-                      "distribution": {
-                        "type": "string",
-                        "description": "Defines the arrangement of children along the main axis (vertically). This corresponds to the CSS 'justify-content' property.",
-                        "enum": [
-                          "start",
-                          "center",
-                          "end",
-                          "spaceBetween",
-                          "spaceAround",
-                          "spaceEvenly"
-                        ]
-                      },
-                      "alignment": {
-                        "type": "string",
-                        "description": "Defines the alignment of children along the cross axis (horizontally). This corresponds to the CSS 'align-items' property.",
-                        "enum": ["center", "end", "start", "stretch"]
-                      }
-                    },
-                    "required": ["children"]
-                  },
-                  "List": {
-                    "type": "object",
-                    "properties": {
-                      "children": {
-                        "type": "object",
-                        "description": "Defines the children. Use 'explicitList' for a fixed set of children, or 'template' to generate children from a data list.",
-                        "properties": {
-                          "explicitList": {
-                            "type": "array",
-                            "items": {
-                              "type": "string"
-                            }
-                          },
-                          "template": {
-                            "type": "object",
-                            "description": "A template for generating a dynamic list of children from a data model list. `componentId` is the component to use as a template, and `dataBinding` is the path to the map of components in the data model. Values in the map will define the list of children.",
-                            "properties": {
-                              "componentId": {
-                                "type": "string"
-                              },
-                              "dataBinding": {
-                                "type": "string"
-                              }
-                            },
-                            "required": ["componentId", "dataBinding"]
-                          }
-                        }
-                      },
-                      "direction": {
-                        "type": "string",
-                        "description": "The direction in which the list items are laid out.",
-                        "enum": ["vertical", "horizontal"]
-                      },
-                      "alignment": {
-                        "type": "string",
-                        "description": "Defines the alignment of children along the cross axis.",
-                        "enum": ["start", "center", "end", "stretch"]
-                      }
-                    },
-                    "required": ["children"]
-                  },
-                  "Card": {
-                    "type": "object",
-                    "properties": {
-                      "child": {
-                        "type": "string",
-                        "description": "The ID of the component to be rendered inside the card."
-                      }
-                    },
-                    "required": ["child"]
-                  },
-                  "Tabs": {
-                    "type": "object",
-                    "properties": {
-                      "tabItems": {
-                        "type": "array",
-                        "description": "An array of objects, where each object defines a tab with a title and a child component.",
-                        "items": {
-                          "type": "object",
-                          "properties": {
-                            "title": {
-                              "type": "object",
-                              "description": "The tab title. Defines the value as either a literal value or a path to data model value (e.g. '/options/title').",
-                              "properties": {
-                                "literalString": {
-                                  "type": "string"
-                                },
-                                "path": {
-                                  "type": "string"
-                                }
-                              }
-                            },
-                            "child": {
-                              "type": "string"
-                            }
-                          },
-                          "required": ["title", "child"]
-                        }
-                      }
-                    },
-                    "required": ["tabItems"]
-                  },
-                  "Divider": {
-                    "type": "object",
-                    "properties": {
-                      "axis": {
-                        "type": "string",
-                        "description": "The orientation of the divider.",
-                        "enum": ["horizontal", "vertical"]
-                      }
-                    }
-                  },
-                  "Modal": {
-                    "type": "object",
-                    "properties": {
-                      "entryPointChild": {
-                        "type": "string",
-                        "description": "The ID of the component that opens the modal when interacted with (e.g., a button)."
-                      },
-                      "contentChild": {
-                        "type": "string",
-                        "description": "The ID of the component to be displayed inside the modal."
-                      }
-                    },
-                    "required": ["entryPointChild", "contentChild"]
-                  },
-                  "Button": {
-                    "type": "object",
-                    "properties": {
-                      "child": {
-                        "type": "string",
-                        "description": "The ID of the component to display in the button, typically a Text component."
-                      },
-                      "primary": {
-                        "type": "boolean",
-                        "description": "Indicates if this button should be styled as the primary action."
-                      },
-                      "action": {
-                        "type": "object",
-                        "description": "The client-side action to be dispatched when the button is clicked. It includes the action's name and an optional context payload.",
-                        "properties": {
-                          "name": {
-                            "type": "string"
-                          },
-                          "context": {
-                            "type": "array",
-                            "items": {
-                              "type": "object",
-                              "properties": {
-                                "key": {
-                                  "type": "string"
-                                },
-                                "value": {
-                                  "type": "object",
-                                  "description": "Defines the value to be included in the context as either a literal value or a path to a data model value (e.g. '/user/name').",
-                                  "properties": {
-                                    "path": {
-                                      "type": "string"
-                                    },
-                                    "literalString": {
-                                      "type": "string"
-                                    },
-                                    "literalNumber": {
-                                      "type": "number"
-                                    },
-                                    "literalBoolean": {
-                                      "type": "boolean"
-                                    }
-                                  }
-                                }
-                              },
-                              "required": ["key", "value"]
-                            }
-                          }
-                        },
-                        "required": ["name"]
-                      }
-                    },
-                    "required": ["child", "action"]
-                  },
-                  "CheckBox": {
-                    "type": "object",
-                    "properties": {
-                      "label": {
-                        "type": "object",
-                        "description": "The text to display next to the checkbox. Defines the value as either a literal value or a path to data model ('path', e.g. '/option/label').",
-                        "properties": {
-                          "literalString": {
-                            "type": "string"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      },
-                      "value": {
-                        "type": "object",
-                        "description": "The current state of the checkbox (true for checked, false for unchecked). This can be a literal boolean ('literalBoolean') or a reference to a value in the data model ('path', e.g. '/filter/open').",
-                        "properties": {
-                          "literalBoolean": {
-                            "type": "boolean"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      }
-                    },
-                    "required": ["label", "value"]
-                  },
-                  "TextField": {
-                    "type": "object",
-                    "properties": {
-                      "label": {
-                        "type": "object",
-                        "description": "The text label for the input field. This can be a literal string or a reference to a value in the data model ('path, e.g. '/user/name').",
-                        "properties": {
-                          "literalString": {
-                            "type": "string"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      },
-                      "text": {
-                        "type": "object",
-                        "description": "The value of the text field. This can be a literal string or a reference to a value in the data model ('path', e.g. '/user/name').",
-                        "properties": {
-                          "literalString": {
-                            "type": "string"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      },
-                      "textFieldType": {
-                        "type": "string",
-                        "description": "The type of input field to display.",
-                        "enum": [
-                          "date",
-                          "longText",
-                          "number",
-                          "shortText",
-                          "obscured"
-                        ]
-                      },
-                      "validationRegexp": {
-                        "type": "string",
-                        "description": "A regular expression used for client-side validation of the input."
-                      }
-                    },
-                    "required": ["label"]
-                  },
-                  "DateTimeInput": {
-                    "type": "object",
-                    "properties": {
-                      "value": {
-                        "type": "object",
-                        "description": "The selected date and/or time value in ISO 8601 format. This can be a literal string ('literalString') or a reference to a value in the data model ('path', e.g. '/user/dob').",
-                        "properties": {
-                          "literalString": {
-                            "type": "string"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      },
-                      "enableDate": {
-                        "type": "boolean",
-                        "description": "If true, allows the user to select a date."
-                      },
-                      "enableTime": {
-                        "type": "boolean",
-                        "description": "If true, allows the user to select a time."
-                      }
-                    },
-                    "required": ["value"]
-                  },
-                  "MultipleChoice": {
-                    "type": "object",
-                    "properties": {
-                      "selections": {
-                        "type": "object",
-                        "description": "The currently selected values for the component. This can be a literal array of strings or a path to an array in the data model('path', e.g. '/hotel/options').",
-                        "properties": {
-                          "literalArray": {
-                            "type": "array",
-                            "items": {
-                              "type": "string"
-                            }
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      },
-                      "options": {
-                        "type": "array",
-                        "description": "An array of available options for the user to choose from.",
-                        "items": {
-                          "type": "object",
-                          "properties": {
-                            "label": {
-                              "type": "object",
-                              "description": "The text to display for this option. This can be a literal string or a reference to a value in the data model (e.g. '/option/label').",
-                              "properties": {
-                                "literalString": {
-                                  "type": "string"
-                                },
-                                "path": {
-                                  "type": "string"
-                                }
-                              }
-                            },
-                            "value": {
-                              "type": "string",
-                              "description": "The value to be associated with this option when selected."
-                            }
-                          },
-                          "required": ["label", "value"]
-                        }
-                      },
-                      "maxAllowedSelections": {
-                        "type": "integer",
-                        "description": "The maximum number of options that the user is allowed to select."
-                      }
-                    },
-                    "required": ["selections", "options"]
-                  },
-                  "Slider": {
-                    "type": "object",
-                    "properties": {
-                      "value": {
-                        "type": "object",
-                        "description": "The current value of the slider. This can be a literal number ('literalNumber') or a reference to a value in the data model ('path', e.g. '/restaurant/cost').",
-                        "properties": {
-                          "literalNumber": {
-                            "type": "number"
-                          },
-                          "path": {
-                            "type": "string"
-                          }
-                        }
-                      },
-                      "minValue": {
-                        "type": "number",
-                        "description": "The minimum value of the slider."
-                      },
-                      "maxValue": {
-                        "type": "number",
-                        "description": "The maximum value of the slider."
-                      }
-                    },
-                    "required": ["value"]
-                  }
-                }
-              }
-            },
-            "required": ["id", "component"]
-          }
-        }
-      },
-      "required": ["surfaceId", "components"]
-    },
-    "dataModelUpdate": {
-      "type": "object",
-      "description": "Updates the data model for a surface.",
-      "properties": {
-        "surfaceId": {
-          "type": "string",
-          "description": "The unique identifier for the UI surface this data model update applies to."
-        },
-        "path": {
-          "type": "string",
-          "description": "An optional path to a location within the data model (e.g., '/user/name'). If omitted, or set to '/', the entire data model will be replaced."
-        },
-        "contents": {
-          "type": "array",
-          "description": "An array of data entries. Each entry must contain a 'key' and exactly one corresponding typed 'value*' property.",
-          "items": {
-            "type": "object",
-            "description": "A single data entry. Exactly one 'value*' property should be provided alongside the key.",
-            "properties": {
-              "key": {
-                "type": "string",
-                "description": "The key for this data entry."
-              },
-              "valueString": {
-                "type": "string"
-              },
-              "valueNumber": {
-                "type": "number"
-              },
-              "valueBoolean": {
-                "type": "boolean"
-              },
-              "valueMap": {
-                "description": "Represents a map as an adjacency list.",
-                "type": "array",
-                "items": {
-                  "type": "object",
-                  "description": "One entry in the map. Exactly one 'value*' property should be provided alongside the key.",
-                  "properties": {
-                    "key": {
-                      "type": "string"
-                    },
-                    "valueString": {
-                      "type": "string"
-                    },
-                    "valueNumber": {
-                      "type": "number"
-                    },
-                    "valueBoolean": {
-                      "type": "boolean"
-                    }
-                  },
-                  "required": ["key"]
-                }
-              }
-            },
-            "required": ["key"]
-          }
-        }
-      },
-      "required": ["contents", "surfaceId"]
-    },
-    "deleteSurface": {
-      "type": "object",
-      "description": "Signals the client to delete the surface identified by 'surfaceId'.",
-      "properties": {
-        "surfaceId": {
-          "type": "string",
-          "description": "The unique identifier for the UI surface to be deleted."
-        }
-      },
-      "required": ["surfaceId"]
-    }
-  }
-}
-'''
+from a2ui.a2ui_spec_registry import spec_registry
+from agent.a2ui_components import RESTAURANT_RECORD_FIELDS, RESTAURANT_UI_EXAMPLES
 
-from agent.a2ui_components import RESTAURANT_UI_EXAMPLES
+# The A2UI protocol version the agents generate, its schema is read from the specification
+A2UI_VERSION = "0.8"
+# The UI examples use properties the specification does not list, so objects stay open
+A2UI_STRICT_SCHEMA = False
 
 
 def get_ui_prompt(base_url: str, examples: str) -> str:
@@ -821,11 +54,37 @@ def get_ui_prompt(base_url: str, examples: str) -> str:
     {formatted_examples}
 
     ---BEGIN A2UI JSON SCHEMA---
-    {A2UI_SCHEMA}
+    {spec_registry.get_prompt_text(A2UI_VERSION, strict=A2UI_STRICT_SCHEMA)}
     ---END A2UI JSON SCHEMA---
     """
 
 
+def get_compact_ui_prompt() -> str:
+    """
+    Constructs the prompt for the compact UI output, which the server expands into A2UI messages.
+
+    Returns:
+        A formatted string to be used as the system prompt for the LLM.
+    """
+    return f"""
+    You are a helpful restaurant finding assistant. Your final output MUST be a compact UI response.
+
+    To generate the response, you MUST follow these rules:
+    1.  Your response MUST be in two parts, separated by the delimiter: `---a2ui_JSON---`.
+    2.  The first part is your conversational text response.
+    3.  The second part is a single, raw JSON object: {{"template": "<TEMPLATE>", "title": "<heading>", "items": [<item objects>]}}
+    4.  Do NOT output A2UI components or a data model, the server builds the UI from the template.
+
+    --- TEMPLATES ---
+    -   `SINGLE_COLUMN_LIST`: a list of 5 or fewer restaurants, one item per restaurant with the keys {", ".join(RESTAURANT_RECORD_FIELDS)}.
+    -   `TWO_COLUMN_LIST`: the same for more than 5 restaurants.
+    -   `BOOKING_FORM`: the query is to book a restaurant (e.g., "USER_WANTS_TO_BOOK..."), one item with the keys restaurantName, address, imageUrl.
+    -   `CONFIRMATION`: the query is a booking submission (e.g., "User submitted a booking..."), one item with the keys restaurantName, partySize, reservationTime, dietary, imageUrl.
+
+    Copy the item values from the restaurant data as they are, as plain strings.
+    """
+
+
 def get_text_prompt() -> str:
     """
     Constructs the prompt for a text-only agent.
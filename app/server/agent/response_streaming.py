@@ -0,0 +1,111 @@
+from collections.abc import Callable
+from typing import Any
+from a2a.types import Part, TextPart
+from a2ui.a2ui_extension import create_a2ui_part
+from a2ui.a2ui_stream_parser import A2uiStreamError, A2uiStreamParser
+
+A2UI_DELIMITER = "---a2ui_JSON---"
+
+# Metadata flag on working TextParts that carry a piece of the response text instead of a progress update
+RESPONSE_DELTA_METADATA_KEY = "response_delta"
+
+class ResponseTextStreamer:
+    """ Splits the token chunks of a "text ---a2ui_JSON--- JSON" model response.
+
+    Feed the chunks in order, each call returns the text that can be shown now and the part of the
+    chunk that comes after the delimiter. Text that could be the start of the delimiter is held back
+    until the next chunk settles it, and nothing after the delimiter is kept.
+    """
+
+    def __init__(self, delimiter: str = A2UI_DELIMITER):
+        self.delimiter = delimiter
+        self._text = ""
+        self._emitted = 0
+        self.done = False
+
+    def feed(self, chunk: str) -> tuple[str, str]:
+        if not chunk:
+            return "", ""
+        if self.done:
+            return "", chunk
+        self._text += chunk
+
+        payload = ""
+        end = self._text.find(self.delimiter, max(0, self._emitted - len(self.delimiter)))
+        if end >= 0:
+            self.done = True
+            payload = self._text[end + len(self.delimiter):]
+        else:
+            end = len(self._text) - self._partial_delimiter_length()
+
+        delta = self._text[self._emitted:end]
+        self._emitted = max(self._emitted, end)
+        if self.done:
+            self._text = ""
+        return delta, payload
+
+    def _partial_delimiter_length(self) -> int:
+        """ Length of the longest delimiter prefix the text currently ends with """
+        for length in range(min(len(self.delimiter) - 1, len(self._text)), 0, -1):
+            if self._text.endswith(self.delimiter[:length]):
+                return length
+        return 0
+
+class StreamingA2uiValidator:
+    """ Validates a "text ---a2ui_JSON--- JSON" model response while its tokens arrive.
+
+    feed() returns the A2UI messages completed by a chunk and raises A2uiStreamError as soon as a
+    message fails the validator or the JSON can no longer be a list of messages, so the caller can
+    stop the generation there. close() returns a message recovered from truncated output and raises
+    when the response ended without a list of messages.
+    """
+
+    def __init__(self, message_validator: Callable[[Any], None] | None, delimiter: str = A2UI_DELIMITER):
+        self._streamer = ResponseTextStreamer(delimiter)
+        # Near-valid JSON is repaired locally, only unrepairable output costs a retry
+        self._parser = A2uiStreamParser(validator=message_validator, repair=True)
+        self._text_parts: list[str] = []
+        self.messages: list[dict] = []
+        self.started = False
+
+    @property
+    def text(self) -> str:
+        """ Conversational text before the delimiter received so far """
+        return "".join(self._text_parts).strip()
+
+    def feed(self, chunk: str) -> list[dict]:
+        if not chunk:
+            return []
+        self.started = True
+        text_delta, payload = self._streamer.feed(chunk)
+        if text_delta:
+            self._text_parts.append(text_delta)
+        if not payload:
+            return []
+        completed = self._parser.feed(payload)
+        self.messages.extend(completed)
+        return completed
+
+    @property
+    def repaired(self) -> bool:
+        return self._parser.repaired_count > 0
+
+    def close(self) -> list[dict]:
+        if not self._streamer.done:
+            raise A2uiStreamError(f"Delimiter '{self._streamer.delimiter}' not found.")
+        recovered = self._parser.close()
+        self.messages.extend(recovered)
+        return recovered
+
+def create_response_delta_part(text: str, message_id: str | None) -> Part:
+    """ Working update with a piece of the response, message_id changes when the model starts over """
+    return Part(root=TextPart(
+        text=text,
+        metadata={RESPONSE_DELTA_METADATA_KEY: True, "message_id": message_id},
+    ))
+
+def create_streamed_a2ui_part(a2ui_message: dict[str, Any], message_id: str | None) -> Part:
+    """ A2UI DataPart sent while the response is generated, tagged with the model response it belongs to """
+    part = create_a2ui_part(a2ui_message)
+    part.root.metadata["message_id"] = message_id
+    return part
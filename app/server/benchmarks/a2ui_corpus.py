@@ -0,0 +1,370 @@
+""" Seeded corpus of A2UI message sequences for validation, repair and part conversion benchmarks.
+Component properties are sampled from the catalog schemas served by the spec registry, the surface
+structure from the options: components per surface, nesting depth and data model entries. A share of the
+sequences is made schema-invalid on purpose, and in the sequences format the model response text of a
+share is damaged the way the repair stage expects. The same seed and options write the same file. E.g.:
+    uv run python -m benchmarks.a2ui_corpus --sequences 1000 --components 50 --depth 4 --out corpus.jsonl
+Every line of the default messages format is one message, as a2ui-validate-jsonl expects. Every line of
+the sequences format is {"index", "valid", "mutation", "damage", "messages", "text"}.
+"""
+import argparse
+import dataclasses
+import datetime
+import json
+import random
+import sys
+from typing import Any, Callable, Iterator
+
+from a2ui.a2ui_spec_registry import spec_registry
+from a2ui.a2ui_validator_registry import A2uiValidationError
+from agent.prompt_builder import A2UI_VERSION
+from agent.response_streaming import A2UI_DELIMITER
+
+WORDS = (
+    "table", "garden", "noodle", "harbor", "lantern", "spice", "market", "river", "golden", "dragon",
+    "corner", "bistro", "pepper", "orchid", "valley", "stone", "maple", "ocean", "ember", "saffron",
+)
+# Properties that hold component ids, only child and children are generated
+ID_PROPERTIES = {"child", "children", "tabItems", "tabs", "entryPointChild", "contentChild", "trigger", "content"}
+MUTATIONS = ("missing_required", "unknown_component", "wrong_type")
+DAMAGES = ("trailing_comma", "unquoted_key", "comment", "truncated")
+MAX_ATTEMPTS = 20
+
+@dataclasses.dataclass(frozen=True)
+class Layout:
+    """ Message shapes of one protocol version. """
+    begin: Callable[[str, str], dict]
+    update: Callable[[str, list[dict]], dict]
+    data: Callable[[str, Any], dict]
+    catalog: Callable[[dict], dict[str, dict]]
+    wrap: Callable[[str, str, dict], dict]
+    children: Callable[[list[str]], Any]
+
+LAYOUTS = {
+    "0.8": Layout(
+        begin=lambda surface_id, root: {"beginRendering": {"surfaceId": surface_id, "root": root}},
+        update=lambda surface_id, components: {"surfaceUpdate": {"surfaceId": surface_id, "components": components}},
+        data=lambda surface_id, contents: {"dataModelUpdate": {"surfaceId": surface_id, "contents": contents}},
+        catalog=lambda schema: schema["properties"]["surfaceUpdate"]["properties"]["components"]["items"]
+            ["properties"]["component"]["properties"],
+        wrap=lambda component_id, name, properties: {"id": component_id, "component": {name: properties}},
+        children=lambda ids: {"explicitList": ids},
+    ),
+    "0.9": Layout(
+        begin=lambda surface_id, root: {"createSurface": {"surfaceId": surface_id, "catalogId": "a2ui.dev:standard"}},
+        update=lambda surface_id, components: {"updateComponents": {"surfaceId": surface_id, "components": components}},
+        data=lambda surface_id, value: {"updateDataModel": {"surfaceId": surface_id, "path": "/", "value": value}},
+        catalog=lambda schema: {
+            ref["$ref"].rsplit("/", 1)[-1]: schema["$defs"][ref["$ref"].rsplit("/", 1)[-1]]
+            for ref in schema["$defs"]["anyComponent"]["oneOf"]
+        },
+        wrap=lambda component_id, name, properties: {"id": component_id, "component": name, **properties},
+        children=lambda ids: ids,
+    ),
+}
+
+class SchemaSampler:
+    """ Samples instances of JSON schemas whose $refs point into one root document. """
+
+    def __init__(self, root: dict, rng: random.Random, max_depth: int = 4):
+        self.root = root
+        self.rng = rng
+        self.max_depth = max_depth
+
+    def sample(self, schema: dict, depth: int = 0) -> Any:
+        schema = self.resolve(schema)
+        if "const" in schema:
+            return schema["const"]
+        if "enum" in schema:
+            return self.rng.choice(schema["enum"])
+        if "allOf" in schema:
+            merged = {}
+            for part in schema["allOf"]:
+                value = self.sample(part, depth)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return self._object(schema, depth, merged) if "properties" in schema else merged
+        for keyword in ("oneOf", "anyOf"):
+            if keyword in schema:
+                return self.sample(self._branch(schema[keyword], depth), depth)
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            schema_type = self.rng.choice(schema_type)
+        if schema_type == "object" or (schema_type is None and "properties" in schema):
+            return self._object(schema, depth, {})
+        if schema_type == "array":
+            low = schema.get("minItems", 0)
+            count = self.rng.randint(low, min(schema.get("maxItems", low + 2), low + 2))
+            return [self.sample(schema.get("items", {}), depth + 1) for _ in range(count)]
+        if schema_type in ("number", "integer"):
+            low, high = schema.get("minimum", 0), schema.get("maximum", 100)
+            return self.rng.randint(low, high) if schema_type == "integer" else round(self.rng.uniform(low, high), 2)
+        if schema_type == "boolean":
+            return self.rng.random() < 0.5
+        return self.string(schema)
+
+    def string(self, schema: dict | None = None) -> str:
+        schema = schema or {}
+        if schema.get("pattern") == "^#[0-9a-fA-F]{6}$":
+            return f"#{self.rng.randrange(0x1000000):06x}"
+        if schema.get("format") == "date-time":
+            start = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+            return (start + datetime.timedelta(minutes=self.rng.randrange(525600))).isoformat()
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(1, 4)))
+
+    def resolve(self, schema: dict) -> dict:
+        while "$ref" in schema:
+            target = self.root
+            for token in schema["$ref"].lstrip("#").split("/")[1:]:
+                target = target[token.replace("~1", "/").replace("~0", "~")]
+            schema = {**target, **{k: v for k, v in schema.items() if k != "$ref"}}
+        return schema
+
+    def _object(self, schema: dict, depth: int, value: dict) -> dict:
+        required = set(schema.get("required", ()))
+        optional_chance = 0.5 / (1 + depth) if depth < self.max_depth else 0.0
+        for name, property_schema in schema.get("properties", {}).items():
+            if name in required or self.rng.random() < optional_chance:
+                value[name] = self.sample(property_schema, depth + 1)
+        properties = schema.get("properties", {})
+        if properties and not value:
+            # Objects like {"literalString"} | {"path"} list alternatives without requiring any
+            name = self.rng.choice(list(properties))
+            value[name] = self.sample(properties[name], depth + 1)
+        extra = schema.get("additionalProperties")
+        if isinstance(extra, dict) and not schema.get("properties") and depth < self.max_depth:
+            for _ in range(self.rng.randint(1, 2)):
+                value[self.rng.choice(WORDS)] = self.sample(extra, depth + 1)
+        return value
+
+    def _branch(self, branches: list[dict], depth: int) -> dict:
+        if depth >= self.max_depth:
+            # Prefer branches that do not recurse through references
+            flat = [branch for branch in branches if "$ref" not in json.dumps(branch)]
+            branches = flat or branches
+        return self.rng.choice(branches)
+
+class CorpusGenerator:
+    """ Generates surfaces of sampled components, valid unless a mutation is requested. """
+
+    def __init__(self, version: str, strict: bool, seed: int, components: int, depth: int, data_items: int):
+        self.layout = LAYOUTS[version]
+        self.version = version
+        self.schema = spec_registry.get_schema(version, strict)
+        self.validator = spec_registry.get_validator(version, strict)
+        self.rng = random.Random(seed)
+        self.sampler = SchemaSampler(self.schema, self.rng)
+        self.components = components
+        self.depth = depth
+        self.data_items = data_items
+        catalog = self.layout.catalog(self.schema)
+        self.catalog = {
+            name: component for name, component in catalog.items()
+            if _property_names(self.sampler, component) & ID_PROPERTIES <= {"child", "children"}
+        }
+        self.multi_child = [name for name, c in self.catalog.items() if "children" in _property_names(self.sampler, c)]
+        self.single_child = [name for name, c in self.catalog.items() if "child" in _property_names(self.sampler, c)]
+        self.leaves = [name for name in self.catalog if name not in self.multi_child + self.single_child]
+
+    def surface(self, index: int) -> list[dict]:
+        surface_id = f"surface-{index}"
+        components = self._components()
+        messages = [
+            self.layout.begin(surface_id, components[0]["id"]),
+            self.layout.update(surface_id, components),
+            self.layout.data(surface_id, self._data_model()),
+        ]
+        for message in messages:
+            self.validator(message)
+        return messages
+
+    def mutate(self, messages: list[dict]) -> str:
+        """ Breaks the messages in place, returns the mutation applied. """
+        for _ in range(MAX_ATTEMPTS):
+            mutation = self.rng.choice(MUTATIONS)
+            candidate = json.loads(json.dumps(messages))
+            components = next(iter(candidate[1].values()))["components"]
+            component = self.rng.choice(components)
+            if mutation == "wrong_type":
+                next(iter(candidate[0].values()))["surfaceId"] = self.rng.randint(0, 1000)
+            elif mutation == "unknown_component":
+                properties = _component_properties(self.version, component)
+                name = "Carousel"
+                if self.version == "0.8":
+                    component["component"] = {name: properties}
+                else:
+                    component["component"] = name
+            else:
+                name = _component_type(self.version, component)
+                properties = _component_properties(self.version, component)
+                schema = self.sampler.resolve(self.catalog[name])
+                required = sorted(_required_names(self.sampler, schema) - {"id", "component", "child", "children"})
+                if not required:
+                    continue
+                properties.pop(self.rng.choice(required), None)
+            try:
+                for message in candidate:
+                    self.validator(message)
+            except (A2uiValidationError, AttributeError, KeyError, TypeError, ValueError):
+                messages[:] = candidate
+                return mutation
+        raise RuntimeError("No mutation made the surface invalid")
+
+    def response_text(self, messages: list[dict], damage: str | None) -> str:
+        body = json.dumps(messages)
+        if damage == "trailing_comma":
+            body = body[:-1] + ",]"
+        elif damage == "unquoted_key":
+            body = body.replace('"surfaceId":', "surfaceId:", 1)
+        elif damage == "comment":
+            body = "[// Generated surface\n" + body[1:]
+        elif damage == "truncated":
+            body = body[: int(len(body) * self.rng.uniform(0.6, 0.95))]
+        return f"Here is what I found.\n{A2UI_DELIMITER}\n{body}"
+
+    def _components(self) -> list[dict]:
+        # (id, type, depth from 1 at the root), children are appended to their parent's list as they are created
+        nodes = []
+        children: dict[str, list[str]] = {}
+        root_type = self.rng.choice(self.multi_child)
+        nodes.append(("c0", root_type, 1))
+        children["c0"] = []
+        open_multi = ["c0"]
+        unfilled_single = []
+        while len(nodes) < self.components or unfilled_single:
+            if unfilled_single:
+                parent = unfilled_single.pop()
+            else:
+                parent = self.rng.choice(open_multi)
+            parent_depth = next(depth for node_id, _, depth in nodes if node_id == parent)
+            node_id = f"c{len(nodes)}"
+            remaining = self.components - len(nodes)
+            can_nest = parent_depth + 1 < self.depth and remaining > 2
+            if can_nest and self.rng.random() < 0.3:
+                node_type = self.rng.choice(self.multi_child + self.single_child)
+            else:
+                node_type = self.rng.choice(self.leaves)
+            nodes.append((node_id, node_type, parent_depth + 1))
+            children[parent].append(node_id)
+            children[node_id] = []
+            if node_type in self.multi_child:
+                open_multi.append(node_id)
+            elif node_type in self.single_child:
+                unfilled_single.append(node_id)
+        return [self._component(node_id, node_type, children[node_id]) for node_id, node_type, _ in nodes]
+
+    def _component(self, component_id: str, name: str, child_ids: list[str]) -> dict:
+        for _ in range(MAX_ATTEMPTS):
+            properties = self.sampler.sample(self.catalog[name])
+            for key in ("id", "component", "weight"):
+                properties.pop(key, None)
+            if name in self.multi_child:
+                properties["children"] = self.layout.children(child_ids)
+            elif name in self.single_child:
+                properties["child"] = child_ids[0]
+            component = self.layout.wrap(component_id, name, properties)
+            try:
+                self.validator.validate_component(component)
+                return component
+            except A2uiValidationError:
+                continue
+        raise RuntimeError(f"Could not sample a valid {name} component")
+
+    def _data_model(self) -> Any:
+        if self.version == "0.8":
+            entry = self.sampler.resolve(
+                self.schema["properties"]["dataModelUpdate"]["properties"]["contents"]["items"]
+            )
+            return [self._entry(entry, f"field-{index}", 0) for index in range(self.data_items)]
+        return {
+            "items": [
+                {"name": self.sampler.string(), "rating": round(self.rng.uniform(1, 5), 1), "open": self.rng.random() < 0.5}
+                for _ in range(self.data_items)
+            ]
+        }
+
+    def _entry(self, schema: dict, key: str, depth: int) -> dict:
+        value_names = [name for name in schema["properties"] if name.startswith("value")]
+        if depth > 0:
+            value_names = [name for name in value_names if name != "valueMap"]
+        name = self.rng.choice(value_names)
+        value_schema = self.sampler.resolve(schema["properties"][name])
+        if name == "valueMap":
+            item = self.sampler.resolve(value_schema["items"])
+            value = [self._entry(item, f"{key}-{index}", depth + 1) for index in range(self.rng.randint(1, 4))]
+        else:
+            value = self.sampler.sample(value_schema, depth + 1)
+        return {"key": key, name: value}
+
+def _component_type(version: str, component: dict) -> str:
+    return next(iter(component["component"])) if version == "0.8" else component["component"]
+
+def _component_properties(version: str, component: dict) -> dict:
+    return next(iter(component["component"].values())) if version == "0.8" else component
+
+def _property_names(sampler: SchemaSampler, schema: dict) -> set[str]:
+    schema = sampler.resolve(schema)
+    names = set(schema.get("properties", ()))
+    for part in schema.get("allOf", ()):
+        names |= _property_names(sampler, part)
+    return names
+
+def _required_names(sampler: SchemaSampler, schema: dict) -> set[str]:
+    schema = sampler.resolve(schema)
+    names = set(schema.get("required", ()))
+    for part in schema.get("allOf", ()):
+        names |= _required_names(sampler, part)
+    return names
+
+def generate(args: argparse.Namespace) -> Iterator[dict]:
+    generator = CorpusGenerator(
+        args.a2ui_version, not args.lenient, args.seed, args.components, args.depth, args.data_items
+    )
+    for index in range(args.sequences):
+        messages = generator.surface(index)
+        mutation = generator.mutate(messages) if generator.rng.random() < args.invalid_ratio else None
+        damage = generator.rng.choice(DAMAGES) if generator.rng.random() < args.damaged_ratio else None
+        yield {
+            "index": index,
+            "valid": mutation is None,
+            "mutation": mutation,
+            "damage": damage,
+            "messages": messages,
+            "text": generator.response_text(messages, damage),
+        }
+
+def main(args: argparse.Namespace):
+    out = open(args.out, "w") if args.out else sys.stdout
+    counts = {"sequences": 0, "messages": 0, "invalid": 0, "damaged": 0}
+    try:
+        for sequence in generate(args):
+            counts["sequences"] += 1
+            counts["messages"] += len(sequence["messages"])
+            counts["invalid"] += not sequence["valid"]
+            counts["damaged"] += sequence["damage"] is not None
+            if args.format == "sequences":
+                out.write(json.dumps(sequence) + "\n")
+            else:
+                out.writelines(json.dumps(message) + "\n" for message in sequence["messages"])
+    finally:
+        if args.out:
+            out.close()
+    print(", ".join(f"{count} {name}" for name, count in counts.items()), file=sys.stderr)
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sequences", type=int, default=100)
+    parser.add_argument("--components", type=int, default=20, help="Components per surface")
+    parser.add_argument("--depth", type=int, default=4, help="Maximum nesting depth of the component tree")
+    parser.add_argument("--data-items", type=int, default=10, help="Data model entries per surface")
+    parser.add_argument("--invalid-ratio", type=float, default=0.1)
+    parser.add_argument("--damaged-ratio", type=float, default=0.1, help="Share of damaged response texts")
+    parser.add_argument("--a2ui-version", default=A2UI_VERSION, choices=sorted(LAYOUTS))
+    parser.add_argument("--lenient", action="store_true", help="Sample against the schema without closed objects")
+    parser.add_argument("--format", default="messages", choices=("messages", "sequences"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Output file, stdout by default")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,80 @@
+""" Streaming overhead of RestaurantGraph.call_restaurant_graph with scripted models.
+
+Compares node tracking through a get_state snapshot per streamed chunk (the previous approach)
+with the namespace and updates metadata of a multi-mode stream. Request times also include the
+in-process tool calls and A2UI validation, the node lookup column isolates the tracking cost. E.g.:
+    uv run python -m benchmarks.graph_stream --requests 50 --tool-turns 4
+"""
+import os
+os.environ.setdefault("MCP_TRANSPORT", "in_process")
+
+import argparse
+import asyncio
+import statistics
+import time
+from langchain.messages import HumanMessage
+
+from agent.graph.restaurant_graph import RestaurantGraph
+from agent.graph.tool_registry import tool_registry
+from benchmarks.scripted_graph import build_scripted_graph
+
+QUERY = "Top 5 chinese restaurants in New York"
+
+async def _stream_with_get_state(graph: RestaurantGraph, session_id: str) -> tuple[int, float]:
+    """ Previous loop: values stream plus a state snapshot per chunk to find the running node """
+    graph_app = graph._restaurant_graph
+    config = {"configurable": {"thread_id": session_id}}
+    chunks = 0
+    snapshot_seconds = 0.0
+    try:
+        async for _, state_values in graph_app.astream(
+            {"messages": [HumanMessage(QUERY)], "user_query": QUERY},
+            config=config, stream_mode="values", subgraphs=True,
+        ):
+            state_values["messages"][-1]
+            start = time.perf_counter()
+            state = graph_app.get_state(config=config, subgraphs=True)
+            str(state.next[0]) if state.next else "GRAPH"
+            snapshot_seconds += time.perf_counter() - start
+            chunks += 1
+    finally:
+        await graph._checkpointer.adelete_thread(session_id)
+    return chunks, snapshot_seconds
+
+async def _stream_with_metadata(graph: RestaurantGraph, session_id: str) -> tuple[int, float]:
+    chunks = 0
+    async for item in graph.call_restaurant_graph(QUERY, session_id):
+        chunks += not item["is_task_complete"]
+    # Node names are read from the chunk namespaces, there is no separate lookup to time
+    return chunks, 0.0
+
+async def _run(label: str, stream, graph: RestaurantGraph, requests: int) -> None:
+    await stream(graph, "warmup")
+    durations = []
+    lookups = []
+    chunks = 0
+    for i in range(requests):
+        start = time.perf_counter()
+        chunks, lookup_seconds = await stream(graph, f"{label}-{i}")
+        durations.append(time.perf_counter() - start)
+        lookups.append(lookup_seconds)
+    mean = statistics.mean(durations)
+    print(
+        f"{label:<20} requests={requests:<4} chunks/request={chunks:<4} mean={mean * 1000:8.2f}ms "
+        f"node lookup per chunk={statistics.mean(lookups) / chunks * 1000:6.3f}ms"
+    )
+
+async def main(requests: int, tool_turns: int):
+    graph = await build_scripted_graph(use_ui=True, tool_turns=tool_turns)
+    try:
+        await _run("get_state per chunk", _stream_with_get_state, graph, requests)
+        await _run("stream metadata", _stream_with_metadata, graph, requests)
+    finally:
+        await tool_registry.aclose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--tool-turns", type=int, default=1, help="data agent tool calls per request")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.tool_turns))
@@ -0,0 +1,54 @@
+""" CPU time and event counts per request of the "values" and "delta" graph stream modes,
+with many concurrent sessions on one scripted graph. Tools run in-process, e.g.:
+    uv run python -m benchmarks.graph_stream_modes --sessions 50 --tool-turns 4
+"""
+import os
+os.environ.setdefault("MCP_TRANSPORT", "in_process")
+
+import argparse
+import asyncio
+import logging
+import time
+
+from agent.graph.restaurant_graph import STREAM_MODES, RestaurantGraph
+from agent.graph.tool_registry import tool_registry
+from benchmarks.scripted_graph import build_scripted_graph
+
+QUERY = "Top 5 chinese restaurants in New York"
+
+async def _session(graph: RestaurantGraph, session_id: str, stream_mode: str) -> int:
+    events = 0
+    async for _ in graph.call_restaurant_graph(QUERY, session_id, stream_mode):
+        events += 1
+    return events
+
+async def _run(graph: RestaurantGraph, stream_mode: str, sessions: int) -> None:
+    await _session(graph, f"warmup-{stream_mode}", stream_mode)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    events = await asyncio.gather(*(
+        _session(graph, f"{stream_mode}-{i}", stream_mode) for i in range(sessions)
+    ))
+    cpu_seconds = time.process_time() - cpu_start
+    wall_seconds = time.perf_counter() - wall_start
+    print(
+        f"{stream_mode:<7} sessions={sessions:<4} wall={wall_seconds:7.2f}s "
+        f"cpu/request={cpu_seconds / sessions * 1000:8.2f}ms events/request={sum(events) / sessions:6.1f}"
+    )
+
+async def main(sessions: int, tool_turns: int):
+    graph = await build_scripted_graph(use_ui=True, tool_turns=tool_turns)
+    try:
+        for stream_mode in STREAM_MODES:
+            await _run(graph, stream_mode, sessions)
+    finally:
+        await tool_registry.aclose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--tool-turns", type=int, default=1, help="data agent tool calls per request")
+    args = parser.parse_args()
+    # Per step agent logging would dominate the measurement
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.sessions, args.tool_turns))
@@ -0,0 +1,66 @@
+""" Per-call latency of MCP tool calls, one session per call versus pooled warm sessions
+and the in-process transport.
+
+Requires the MCP servers running locally, e.g.:
+    uv run python -m agent.mcp.data_server
+    uv run python -m benchmarks.mcp_session_pool --calls 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from langchain_mcp_adapters.client import MultiServerMCPClient
+
+from agent.graph.tool_registry import MCP_IN_PROCESS_SERVERS, MCP_SERVERS, McpToolRegistry
+
+TOOL_NAME = "get_restaurant_data"
+TOOL_ARGS = {"restaurant_names": "Han Dynasty, RedFarm"}
+
+async def _time_calls(tool, calls: int, concurrency: int) -> list[float]:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_call():
+        async with semaphore:
+            start = time.perf_counter()
+            await tool.ainvoke(TOOL_ARGS)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(timed_call() for _ in range(calls)))
+    return latencies
+
+def _report(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<22} calls={len(ordered):<5} mean={statistics.mean(ordered) * 1000:7.2f}ms "
+        f"p50={statistics.median(ordered) * 1000:7.2f}ms p95={p95 * 1000:7.2f}ms"
+    )
+
+async def main(calls: int, concurrency: int):
+    connections = {
+        name: {k: v for k, v in connection.items() if k != "pool_size"}
+        for name, connection in MCP_SERVERS.items()
+    }
+
+    # Baseline: the adapter opens and initializes a new session for every call
+    per_call_tools = await MultiServerMCPClient(connections).get_tools()
+    per_call_tool = next(tool for tool in per_call_tools if tool.name == TOOL_NAME)
+    await per_call_tool.ainvoke(TOOL_ARGS)
+    _report("session per call", await _time_calls(per_call_tool, calls, concurrency))
+
+    for label, servers in (("pooled sessions", MCP_SERVERS), ("in-process", MCP_IN_PROCESS_SERVERS)):
+        registry = McpToolRegistry(servers)
+        try:
+            tool = (await registry.get_tools([TOOL_NAME]))[0]
+            await tool.ainvoke(TOOL_ARGS)
+            _report(label, await _time_calls(tool, calls, concurrency))
+        finally:
+            await registry.aclose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.concurrency))
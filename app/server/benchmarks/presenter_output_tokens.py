@@ -0,0 +1,160 @@
+""" Presenter output tokens per request with the full A2UI output and with the compact UI output
+("compact_ui_output": true), on the same query set: list requests of 1 to 10 catalog restaurants
+plus a booking and a confirmation request.
+
+By default the response each format asks the model for is built from the templates and counted
+with the approximate token counter, and the compact one is checked to expand into exactly the full
+messages. --live runs the presenter node with its configured model instead, on the free-form path
+that still calls the model, and reports the output tokens the presenter added to the metrics. E.g.:
+    uv run python -m benchmarks.presenter_output_tokens
+    uv run python -m benchmarks.presenter_output_tokens --live --repeat 3
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import pathlib
+import statistics
+from langchain.messages import AIMessage, HumanMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.graph import StateGraph, START, END
+
+from agent.a2ui_templates import (
+    BOOKING_FORM,
+    CONFIRMATION,
+    list_template,
+    parse_compact_response,
+    render_booking_form,
+    render_confirmation,
+    render_restaurant_list,
+)
+from agent.graph.presenter_agent import PresenterAgent
+from agent.graph.struct import DEFAULT_CONFIG, RestaurantGraphState
+from agent.metrics import metrics
+from agent.response_streaming import A2UI_DELIMITER
+
+CATALOGS = ("chinese_data.json", "italian_data.json", "caffeteria_data.json")
+LIST_SIZES = (1, 3, 5, 6, 8, 10)
+TEXT = "Here are the places I found for you."
+
+@dataclasses.dataclass
+class Query:
+    name: str
+    text: str
+    # The template the presenter should pick and the values it fills in
+    template: str
+    title: str
+    items: list[dict]
+
+def _catalog() -> list[dict]:
+    catalog_dir = pathlib.Path(__file__).parents[1] / "agent" / "mcp"
+    records = []
+    for name in CATALOGS:
+        records.extend(json.loads((catalog_dir / name).read_text()))
+    return records
+
+def query_set() -> list[Query]:
+    records = _catalog()
+    queries = [
+        Query(
+            f"list-{size}", f"Show me {size} places to eat.\n\nRestaurant data:\n{json.dumps(records[:size])}",
+            list_template(size), f"{size} places to eat", records[:size],
+        )
+        for size in LIST_SIZES
+    ]
+    restaurant = records[0]
+    booking = {"restaurantName": restaurant["name"], "address": restaurant["address"], "imageUrl": restaurant["imageUrl"]}
+    queries.append(Query(
+        "booking",
+        f"USER_WANTS_TO_BOOK: {booking['restaurantName']}, Address: {booking['address']}, ImageURL: {booking['imageUrl']}",
+        BOOKING_FORM, "", [booking],
+    ))
+    confirmation = {
+        "restaurantName": restaurant["name"], "partySize": "4", "reservationTime": "2025-06-01 19:30",
+        "dietary": "vegetarian", "imageUrl": restaurant["imageUrl"],
+    }
+    queries.append(Query(
+        "confirmation",
+        f"User submitted a booking for {restaurant['name']} for 4 people at 2025-06-01 19:30 with dietary "
+        f"requirements: vegetarian. The image URL is {restaurant['imageUrl']}",
+        CONFIRMATION, "", [confirmation],
+    ))
+    return queries
+
+def full_messages(query: Query) -> list[dict]:
+    if query.template == BOOKING_FORM:
+        item = query.items[0]
+        return render_booking_form(item["restaurantName"], item["address"], item["imageUrl"])
+    if query.template == CONFIRMATION:
+        item = query.items[0]
+        return render_confirmation(
+            item["restaurantName"], item["partySize"], item["reservationTime"], item["dietary"], item["imageUrl"]
+        )
+    return render_restaurant_list(query.items, query.title)
+
+def expected_responses(query: Query) -> tuple[str, str]:
+    """ The full and the compact response the model is asked for """
+    messages = full_messages(query)
+    compact = {"template": query.template, "title": query.title, "items": query.items}
+    full_response = f"{TEXT}\n{A2UI_DELIMITER}\n{json.dumps(messages, ensure_ascii=False)}"
+    compact_response = f"{TEXT}\n{A2UI_DELIMITER}\n{json.dumps(compact, ensure_ascii=False)}"
+    _, expanded, _ = parse_compact_response(compact_response)
+    assert expanded == messages, f"{query.name}: the compact UI does not expand into the full messages"
+    return full_response, compact_response
+
+def _tokens(text: str) -> int:
+    return count_tokens_approximately([AIMessage(text)])
+
+def _report(rows: list[tuple[str, float, float]]):
+    print(f"{'query':<14} {'full':>8} {'compact':>8} {'saved':>7}")
+    for name, full, compact in rows:
+        print(f"{name:<14} {full:>8.0f} {compact:>8.0f} {1 - compact / full:>7.0%}")
+    full_mean = statistics.mean(full for _, full, _ in rows)
+    compact_mean = statistics.mean(compact for _, _, compact in rows)
+    print(f"{'mean':<14} {full_mean:>8.0f} {compact_mean:>8.0f} {1 - compact_mean / full_mean:>7.0%}")
+
+def main_offline():
+    rows = []
+    for query in query_set():
+        full_response, compact_response = expected_responses(query)
+        rows.append((query.name, _tokens(full_response), _tokens(compact_response)))
+    print("approximate output tokens per request, expected responses")
+    _report(rows)
+
+def _presenter_graph(compact: bool):
+    config = dataclasses.replace(DEFAULT_CONFIG["presenter_agent"], compact_ui_output=compact)
+    presenter = PresenterAgent(base_url="http://localhost:10002", use_ui=True, config=config)
+    graph_builder = StateGraph(RestaurantGraphState)
+    graph_builder.add_node("presenter_agent", presenter)
+    graph_builder.add_edge(START, "presenter_agent")
+    graph_builder.add_edge("presenter_agent", END)
+    return graph_builder.compile(), f"presenter.{config.name}.output_tokens"
+
+async def _live_tokens(graph, counter: str, query: Query) -> int:
+    """ Output tokens of one request, retries included. Without records in the state the presenter
+    takes the free-form path and calls its model. """
+    before = metrics.snapshot()["counters"].get(counter, 0)
+    await graph.ainvoke({"messages": [HumanMessage(query.text)], "user_query": query.text})
+    return metrics.snapshot()["counters"].get(counter, 0) - before
+
+async def main_live(repeat: int):
+    graphs = {compact: _presenter_graph(compact) for compact in (False, True)}
+    rows = []
+    for query in query_set():
+        tokens = {compact: [] for compact in graphs}
+        for _ in range(repeat):
+            for compact, (graph, counter) in graphs.items():
+                tokens[compact].append(await _live_tokens(graph, counter, query))
+        rows.append((query.name, statistics.mean(tokens[False]), statistics.mean(tokens[True])))
+    print(f"output tokens per request reported by the model, mean of {repeat}")
+    _report(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="Call the presenter model for every query")
+    parser.add_argument("--repeat", type=int, default=1, help="Live requests per query and format")
+    args = parser.parse_args()
+    if args.live:
+        asyncio.run(main_live(args.repeat))
+    else:
+        main_offline()
@@ -0,0 +1,118 @@
+""" Per-response cost of A2UI schema validation, validating the single and two column list examples
+with a fresh jsonschema.validate call (the previous approach) and with the cached validators of the
+shared registry, and with the catalog validator that checks each component only against the schema
+of its own type. The large surface payloads hold --components Text components, in v0.8 against the
+inline schema and in v0.9 against the specification schemas, whose components are a oneOf over the
+whole catalog.
+The fast row needs the optional fastjsonschema package. E.g.:
+    uv run python -m benchmarks.schema_validation --iterations 200 --components 500
+"""
+import argparse
+import json
+import re
+import time
+import jsonschema
+
+from a2ui.a2ui_catalog_validator import CatalogValidator
+from a2ui.a2ui_schema_utils import wrap_as_json_array
+from a2ui.a2ui_spec_registry import A2uiSpecRegistry
+from a2ui.a2ui_validator_registry import A2uiValidatorRegistry, fastjsonschema
+from agent.a2ui_components import RESTAURANT_UI_EXAMPLES
+from agent.prompt_builder import A2UI_STRICT_SCHEMA, A2UI_VERSION
+
+PAYLOADS = ("SINGLE_COLUMN_LIST_EXAMPLE", "TWO_COLUMN_LIST_EXAMPLE")
+
+def _example(name: str) -> list[dict]:
+    # The examples are format strings, braces are doubled
+    examples = RESTAURANT_UI_EXAMPLES.replace("{{", "{").replace("}}", "}")
+    body = re.search(rf"---BEGIN {name}---\n(.*?)---END {name}---", examples, re.S).group(1)
+    return json.loads(body)
+
+def _large_surface(components: int) -> list[dict]:
+    return [
+        {"beginRendering": {"surfaceId": "large", "root": "root"}},
+        {"surfaceUpdate": {"surfaceId": "large", "components": [
+            {"id": "root", "component": {"Column": {"children": {"explicitList": [
+                f"text-{index}" for index in range(components)
+            ]}}}},
+            *(
+                {"id": f"text-{index}", "component": {"Text": {"text": {"literalString": f"Row {index}"}}}}
+                for index in range(components)
+            ),
+        ]}},
+    ]
+
+def _large_surface_v0_9(components: int) -> list[dict]:
+    return [
+        {"createSurface": {"surfaceId": "large", "catalogId": "a2ui.dev:standard"}},
+        {"updateComponents": {"surfaceId": "large", "components": [
+            {"id": "root", "component": "Column", "children": [f"text-{index}" for index in range(components)]},
+            *(
+                {"id": f"text-{index}", "component": "Text", "text": f"Row {index}"}
+                for index in range(components)
+            ),
+        ]}},
+    ]
+
+def _report(payload_name: str, backends: dict, payload, iterations: int):
+    for name, validate in backends.items():
+        validate(payload)
+        print(
+            f"{payload_name:<27} {name:<20} "
+            f"{_per_call_ms(validate, payload, iterations):8.3f}ms/validation"
+        )
+
+def _main_v0_9(iterations: int, components: int):
+    registry = A2uiValidatorRegistry(use_fast_validator=False)
+    spec_registry = A2uiSpecRegistry(registry=registry)
+    try:
+        message_validator = registry.get_validator(spec_registry.get_schema("0.9"))
+    except FileNotFoundError as e:
+        print(f"v0.9: skipped, {e}")
+        return
+    backends = {
+        "registry": lambda payload: [message_validator(message) for message in payload],
+        "catalog": spec_registry.get_validator("0.9").validate_messages,
+    }
+    _report(f"V0_9 LARGE_SURFACE ({components})", backends, _large_surface_v0_9(components), iterations)
+
+def _per_call_ms(validate, payload, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        validate(payload)
+    return (time.perf_counter() - start) / iterations * 1000
+
+def main(iterations: int, components: int):
+    parse_start = time.perf_counter()
+    schema = wrap_as_json_array(A2uiSpecRegistry().get_schema(A2UI_VERSION, strict=A2UI_STRICT_SCHEMA))
+    parse_ms = (time.perf_counter() - parse_start) * 1000
+    print(f"schema load: {parse_ms:.2f}ms once per process by the spec registry")
+
+    backends = {"jsonschema.validate": lambda payload: jsonschema.validate(instance=payload, schema=schema)}
+    for name, use_fast in (("registry", False), ("registry fast", True)):
+        if use_fast and fastjsonschema is None:
+            print(f"{name}: skipped, fastjsonschema is not installed")
+            continue
+        registry = A2uiValidatorRegistry(use_fast_validator=use_fast)
+        compile_start = time.perf_counter()
+        backends[name] = registry.get_validator(schema)
+        print(f"{name}: compiled once in {(time.perf_counter() - compile_start) * 1000:.2f}ms")
+
+    compile_start = time.perf_counter()
+    backends["catalog"] = CatalogValidator.from_resolved_schema(
+        schema["items"], A2uiValidatorRegistry(use_fast_validator=False)
+    ).validate_messages
+    print(f"catalog: compiled once in {(time.perf_counter() - compile_start) * 1000:.2f}ms")
+
+    payloads = {name: _example(name) for name in PAYLOADS}
+    payloads[f"LARGE_SURFACE ({components})"] = _large_surface(components)
+    for payload_name, payload in payloads.items():
+        _report(payload_name, backends, payload, iterations)
+    _main_v0_9(iterations, components)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--components", type=int, default=500)
+    args = parser.parse_args()
+    main(args.iterations, args.components)
@@ -0,0 +1,96 @@
+""" RestaurantGraph wired to scripted chat models, so graph and streaming overhead can be
+measured without LLM calls. Tools run on the in-process MCP servers. """
+import json
+from contextlib import contextmanager
+from typing import Any
+from unittest import mock
+from langchain.agents import create_agent
+from langchain_core.language_models.chat_models import BaseChatModel
+import re
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from agent.graph.data_agent import DataAgent
+from agent.graph.food_place_agent import RestaurantFinderAgent
+from agent.graph.presenter_agent import PresenterAgent
+from agent.graph.restaurant_graph import RestaurantGraph
+from agent.graph.struct import DEFAULT_CONFIG
+
+RESTAURANT_NAMES = ["Xi'an Famous Foods", "Han Dynasty", "RedFarm", "Mott 32", "Hwa Yuan Szechuan"]
+
+UI_RESPONSE = "Here are the top Chinese restaurants in New York.\n---a2ui_JSON---\n" + json.dumps([
+    {"beginRendering": {"surfaceId": "default", "root": "root-column"}},
+    {"surfaceUpdate": {"surfaceId": "default", "components": [
+        {"id": "root-column", "component": {"Column": {"children": {"explicitList": ["title-heading"]}}}},
+        {"id": "title-heading", "component": {"Text": {"usageHint": "h1", "text": {"path": "title"}}}},
+    ]}},
+    {"dataModelUpdate": {"surfaceId": "default", "path": "/", "contents": [
+        {"key": "title", "valueString": "Top Chinese Restaurants"},
+    ]}},
+])
+
+class ScriptedChatModel(BaseChatModel):
+    """ Calls a tool until the conversation holds tool_turns results, then answers.
+    The script only depends on the input messages, so concurrent sessions can share it. """
+
+    tool_name: str | None = None
+    tool_args: dict = {}
+    tool_turns: int = 0
+    final_text: str = ""
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _next_message(self, messages: list[BaseMessage]) -> AIMessage:
+        tool_results = sum(isinstance(message, ToolMessage) for message in messages)
+        if self.tool_name and tool_results < self.tool_turns:
+            return AIMessage("", tool_calls=[{
+                "name": self.tool_name, "args": self.tool_args, "id": f"call_{tool_results}"
+            }])
+        return AIMessage(self.final_text)
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+    def _stream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any):
+        message = self._next_message(messages)
+        if message.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk("", tool_calls=message.tool_calls))
+            return
+        # Word sized chunks, roughly what a model streams per token
+        for token in re.findall(r"\S+\s*|\s+", message.content):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+@contextmanager
+def scripted_graph_agents(tool_turns: int = 1, final_text: str = UI_RESPONSE):
+    """ Patches the graph agents to use scripted models while the context is open """
+    place_model = ScriptedChatModel(
+        tool_name="get_restaurants", tool_args={"cuisine_type": "chinese", "city": "New York"},
+        tool_turns=1, final_text=", ".join(RESTAURANT_NAMES),
+    )
+    data_model = ScriptedChatModel(
+        tool_name="get_restaurant_data_batch", tool_args={"restaurant_names": RESTAURANT_NAMES},
+        tool_turns=tool_turns, final_text="Data found for every restaurant.",
+    )
+    presenter_model = ScriptedChatModel(final_text=final_text)
+
+    with mock.patch.object(RestaurantFinderAgent, "_init_oci_client", lambda self: place_model), \
+            mock.patch.object(DataAgent, "_init_oci_client", lambda self: data_model), \
+            mock.patch.object(
+                PresenterAgent, "_build_agent",
+                lambda self: create_agent(model=presenter_model, tools=[], name=self.agent_name),
+            ):
+        yield
+
+async def build_scripted_graph(use_ui: bool = True, tool_turns: int = 1) -> RestaurantGraph:
+    with scripted_graph_agents(tool_turns, UI_RESPONSE if use_ui else "Han Dynasty and RedFarm."):
+        graph = RestaurantGraph(base_url="http://localhost:10002", use_ui=use_ui, graph_configuration=DEFAULT_CONFIG)
+        await graph.build_graph()
+    return graph
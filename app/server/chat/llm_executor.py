@@ -16,6 +16,7 @@ from a2a.utils import (
     new_task,
 )
 from a2a.utils.errors import ServerError
+from agent.response_streaming import create_response_delta_part
 from chat.oci_llm import OCIRestaurantLLM
 
 logger = logging.getLogger(__name__)
@@ -73,6 +74,16 @@ class RestaurantLLMExecutor(AgentExecutor):
         # async for item in agent.stream(query, task.context_id):
         async for item in agent.oci_stream(query, task.context_id):
             is_task_complete = item["is_task_complete"]
+            if not is_task_complete and "response_delta" in item:
+                await updater.update_status(
+                    TaskState.working,
+                    new_agent_parts_message(
+                        [create_response_delta_part(item["response_delta"], item["message_id"])],
+                        task.context_id, task.id
+                    ),
+                )
+                continue
+
             if not is_task_complete:
                 await updater.update_status(
                     TaskState.working,
@@ -4,7 +4,7 @@ from collections.abc import AsyncIterable
 from typing import Any
 from langchain.agents import create_agent
 from langchain_oci import ChatOCIGenAI
-from langchain.messages import HumanMessage, AIMessage, AnyMessage, ToolMessage
+from langchain.messages import HumanMessage, AIMessage, AIMessageChunk, AnyMessage, ToolMessage
 from langgraph.graph.state import CompiledStateGraph
 from langchain_core.runnables import RunnableConfig
 
@@ -47,11 +47,22 @@ class OCIRestaurantLLM:
         final_model_state = None
         model_token_count = 0
 
-        async for event in self._agent.astream(
+        async for mode, event in self._agent.astream(
             input=current_message,
-            stream_mode="values",
+            stream_mode=["values", "messages"],
             config=config
         ):
+            if mode == "messages":
+                # Answer tokens go out as they arrive, tool call chunks carry no text
+                chunk, metadata = event
+                if isinstance(chunk, AIMessageChunk) and metadata.get("langgraph_node") == "model" and chunk.text:
+                    yield {
+                        "is_task_complete": False,
+                        "response_delta": chunk.text,
+                        "message_id": chunk.id
+                    }
+                continue
+
             latest_update:AnyMessage = event['messages'][-1]
             final_response_content = latest_update.content
 
@@ -0,0 +1,13 @@
+import pytest_asyncio
+
+from agent.graph import data_agent, food_place_agent
+from agent.graph.tool_registry import MCP_IN_PROCESS_SERVERS, McpToolRegistry
+
+@pytest_asyncio.fixture
+async def in_process_tools(monkeypatch):
+    """ Agents built in the test discover their tools from the MCP servers running in-process """
+    registry = McpToolRegistry(MCP_IN_PROCESS_SERVERS)
+    for module in (data_agent, food_place_agent):
+        monkeypatch.setattr(module, "tool_registry", registry)
+    yield registry
+    await registry.aclose()
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from a2ui.a2ui_spec_registry import spec_registry
+from a2ui.a2ui_validator_registry import A2uiValidationError
+
+from agent.response_streaming import A2UI_DELIMITER
+from benchmarks.a2ui_corpus import LAYOUTS, generate, main, parse_args
+
+def _corpus(*argv: str) -> list[dict]:
+    return list(generate(parse_args(["--sequences", "20", "--components", "8", *argv])))
+
+def _is_valid(version: str, messages: list[dict]) -> bool:
+    validator = spec_registry.get_validator(version, strict=True)
+    try:
+        for message in messages:
+            validator(message)
+    except (A2uiValidationError, AttributeError, KeyError, TypeError, ValueError):
+        return False
+    return True
+
+def test_corpus_depends_only_on_the_seed():
+    assert _corpus("--seed", "3") == _corpus("--seed", "3")
+    assert _corpus("--seed", "3") != _corpus("--seed", "4")
+
+@pytest.mark.parametrize("version", sorted(LAYOUTS))
+def test_surfaces_are_valid_unless_mutated(version):
+    sequences = _corpus("--a2ui-version", version, "--invalid-ratio", "0.5", "--damaged-ratio", "0")
+    assert {sequence["valid"] for sequence in sequences} == {True, False}
+    for sequence in sequences:
+        assert _is_valid(version, sequence["messages"]) == sequence["valid"]
+        assert sequence["valid"] == (sequence["mutation"] is None)
+
+def test_surface_size_follows_the_options():
+    for sequence in _corpus("--a2ui-version", "0.8", "--invalid-ratio", "0", "--data-items", "3"):
+        begin, update, data = sequence["messages"]
+        assert len(update["surfaceUpdate"]["components"]) == 8
+        assert len(data["dataModelUpdate"]["contents"]) == 3
+
+def test_damaged_texts():
+    sequences = _corpus("--invalid-ratio", "0", "--damaged-ratio", "1")
+    assert {sequence["damage"] for sequence in sequences} <= {"trailing_comma", "unquoted_key", "comment", "truncated"}
+    for sequence in sequences:
+        text, body = sequence["text"].split(A2UI_DELIMITER)
+        assert text.strip() == "Here is what I found."
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(body)
+
+def test_main_writes_one_message_per_line(tmp_path):
+    out = tmp_path / "corpus.jsonl"
+    main(parse_args(["--sequences", "3", "--components", "5", "--out", str(out)]))
+    lines = out.read_text().splitlines()
+    assert len(lines) == 9
+    assert "beginRendering" in json.loads(lines[0])
@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from agent.a2ui_templates import (
+    BOOKING_FORM,
+    CONFIRMATION,
+    SINGLE_COLUMN_LIST,
+    SINGLE_COLUMN_MAX_ITEMS,
+    TWO_COLUMN_LIST,
+    CompactUiError,
+    data_entry,
+    expand_compact_ui,
+    parse_compact_response,
+    render_booking_form,
+    render_confirmation,
+    render_restaurant_list,
+)
+from agent.response_streaming import A2UI_DELIMITER
+
+RECORD = {
+    "name": "Han Dynasty", "rating": "★★★★☆", "detail": "Sichuan", "infoLink": "https://example.com",
+    "imageUrl": "https://example.com/han.jpg", "address": "90 3rd Ave",
+}
+
+def _component_ids(messages: list[dict]) -> list[str]:
+    return [component["id"] for component in messages[1]["surfaceUpdate"]["components"]]
+
+@pytest.mark.parametrize("count", [1, SINGLE_COLUMN_MAX_ITEMS, SINGLE_COLUMN_MAX_ITEMS + 1, 10])
+def test_list_columns_follow_item_count(count):
+    messages = render_restaurant_list([RECORD] * count, "Top picks")
+    ids = _component_ids(messages)
+    if count > SINGLE_COLUMN_MAX_ITEMS:
+        assert "item-list" not in ids
+        assert f"item-card-{count}" in ids
+        assert f"restaurant-row-{(count + 1) // 2}" in ids
+    else:
+        assert "item-card-template" in ids
+        assert "item-card-1" not in ids
+
+def test_list_data_model():
+    messages = render_restaurant_list([RECORD, {"name": "RedFarm"}], "Top picks")
+    title, items = messages[2]["dataModelUpdate"]["contents"]
+    assert title == {"key": "title", "valueString": "Top picks"}
+    first, second = items["valueMap"]
+    assert first["key"] == "0"
+    assert {"key": "name", "valueString": "Han Dynasty"} in first["valueMap"]
+    # Missing fields render empty instead of leaving the binding unresolved
+    assert {"key": "imageUrl", "valueString": ""} in second["valueMap"]
+
+def test_booking_form():
+    messages = render_booking_form("Han Dynasty", "90 3rd Ave", "https://example.com/han.jpg")
+    assert messages[0]["beginRendering"]["root"] == "booking-form-column"
+    contents = messages[2]["dataModelUpdate"]["contents"]
+    assert {"key": "title", "valueString": "Book a Table at Han Dynasty"} in contents
+    assert {"key": "restaurantName", "valueString": "Han Dynasty"} in contents
+
+def test_confirmation():
+    messages = render_confirmation("Han Dynasty", "4", "7pm", "None", "")
+    assert messages[0]["beginRendering"]["root"] == "confirmation-card"
+    contents = messages[2]["dataModelUpdate"]["contents"]
+    assert {"key": "bookingDetails", "valueString": "4 people at 7pm"} in contents
+
+@pytest.mark.parametrize("value, expected", [
+    (True, {"key": "k", "valueBoolean": True}),
+    (4.5, {"key": "k", "valueNumber": 4.5}),
+    (None, {"key": "k", "valueString": ""}),
+    (["a"], {"key": "k", "valueMap": [{"key": "0", "valueString": "a"}]}),
+    ({"name": "a"}, {"key": "k", "valueMap": [{"key": "name", "valueString": "a"}]}),
+])
+def test_data_entry(value, expected):
+    assert data_entry("k", value) == expected
+
+@pytest.mark.parametrize("template", [SINGLE_COLUMN_LIST, TWO_COLUMN_LIST])
+@pytest.mark.parametrize("count", [SINGLE_COLUMN_MAX_ITEMS, SINGLE_COLUMN_MAX_ITEMS + 1])
+def test_expand_list_follows_item_count(template, count):
+    # Either list template renders the column count of its item count
+    records = [RECORD] * count
+    spec = {"template": template, "title": "Top picks", "items": records}
+    assert expand_compact_ui(spec) == render_restaurant_list(records, "Top picks")
+
+def test_expand_booking_form():
+    item = {"restaurantName": "Han Dynasty", "address": "90 3rd Ave", "imageUrl": "https://example.com/han.jpg"}
+    messages = expand_compact_ui({"template": BOOKING_FORM, "items": [item]})
+    assert messages == render_booking_form("Han Dynasty", "90 3rd Ave", "https://example.com/han.jpg")
+
+def test_expand_confirmation():
+    item = {"restaurantName": "Han Dynasty", "partySize": 4, "reservationTime": "7pm", "dietary": None, "imageUrl": ""}
+    messages = expand_compact_ui({"template": CONFIRMATION, "items": [item]})
+    assert messages == render_confirmation("Han Dynasty", "4", "7pm", "None", "")
+
+@pytest.mark.parametrize("spec, error", [
+    (["not", "an", "object"], "must be a JSON object"),
+    ({"template": SINGLE_COLUMN_LIST, "items": ["Han Dynasty"]}, "list of objects"),
+    ({"template": "CAROUSEL", "items": [RECORD]}, "Unknown template"),
+    ({"template": BOOKING_FORM, "items": []}, "needs one item"),
+])
+def test_expand_rejects_invalid_spec(spec, error):
+    with pytest.raises(CompactUiError, match=error):
+        expand_compact_ui(spec)
+
+def test_parse_compact_response():
+    spec = {"template": SINGLE_COLUMN_LIST, "title": "Top picks", "items": [RECORD]}
+    text = f"Here you go.\n{A2UI_DELIMITER}\n```json\n{json.dumps(spec)}\n```"
+    response_text, messages, repaired = parse_compact_response(text)
+    assert response_text == "Here you go."
+    assert messages == render_restaurant_list([RECORD], "Top picks")
+    assert not repaired
+
+def test_parse_compact_response_repairs_json():
+    text = f'Here you go.\n{A2UI_DELIMITER}\n{{"template": "SINGLE_COLUMN_LIST", "title": "Top picks", "items": [],}}'
+    _, messages, repaired = parse_compact_response(text)
+    assert repaired
+    assert messages == render_restaurant_list([], "Top picks")
+
+@pytest.mark.parametrize("text, error", [
+    ("Here you go.", "no '---a2ui_JSON---' delimiter"),
+    (f"Here you go.\n{A2UI_DELIMITER}\nnot json at all", "not valid JSON"),
+])
+def test_parse_compact_response_errors(text, error):
+    with pytest.raises(CompactUiError, match=error):
+        parse_compact_response(text)
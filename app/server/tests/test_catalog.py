@@ -0,0 +1,88 @@
+import json
+import os
+
+import pytest
+
+from agent.mcp.catalog import Catalog, normalize_name
+
+RESTAURANTS = [
+    {"name": "Xi'an Famous Foods", "address": "81 St Marks Pl, New York, NY 10003"},
+    {"name": "Han Dynasty", "address": "90 3rd Ave, New York, NY 10003"},
+    {"name": "RedFarm", "address": "529 Hudson St, New York, NY 10014"},
+    {"name": "Mott 32", "address": "135 W 56th St, New York, NY 10019"},
+    {"name": "Carbone", "address": "181 Thompson St, New York, NY 10012"},
+]
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "restaurants.json"
+    path.write_text(json.dumps(RESTAURANTS))
+    catalog = Catalog({"restaurants": str(path)})
+    catalog.reload_if_changed()
+    return catalog
+
+def _rewrite(path, records):
+    """ Writes new records and moves the mtime forward, a rewrite within the same clock tick would look unchanged """
+    mtime = os.stat(path).st_mtime
+    path.write_text(json.dumps(records))
+    os.utime(path, (mtime + 1, mtime + 1))
+
+def test_reload_only_when_changed(tmp_path):
+    path = tmp_path / "restaurants.json"
+    path.write_text(json.dumps(RESTAURANTS))
+    catalog = Catalog({"restaurants": str(path)})
+    assert catalog.reload_if_changed()
+    assert not catalog.reload_if_changed()
+    assert len(catalog.records) == len(RESTAURANTS)
+
+    _rewrite(path, RESTAURANTS + [{"name": "Joe's Shanghai"}])
+    assert catalog.reload_if_changed()
+    assert catalog.match("joe's shanghai") == ({"name": "Joe's Shanghai"}, 1.0)
+
+def test_reload_keeps_previous_data_on_invalid_json(catalog, tmp_path):
+    path = tmp_path / "restaurants.json"
+    mtime = os.stat(path).st_mtime
+    path.write_text('[{"name": "Half written')
+    os.utime(path, (mtime + 1, mtime + 1))
+    assert not catalog.reload_if_changed()
+    assert catalog.match("Han Dynasty")[1] == 1.0
+
+def test_first_load_raises_on_missing_file(tmp_path):
+    catalog = Catalog({"restaurants": str(tmp_path / "missing.json")})
+    with pytest.raises(OSError):
+        catalog.reload_if_changed()
+
+def _names(matches):
+    return sorted(record["name"] for record, _ in matches)
+
+@pytest.mark.parametrize("text, expected", [
+    ("Xian Famous Foods and Han Dynasty", ["Han Dynasty", "Xi'an Famous Foods"]),
+    ("The restaurants are Xian Famous Foods and Carbone.", ["Carbone", "Xi'an Famous Foods"]),
+    ("1. Xi'an Famous Foods 2. Red Farm 3. Mott 32", ["Mott 32", "RedFarm", "Xi'an Famous Foods"]),
+])
+def test_find_misspelled_next_to_exact(catalog, text, expected):
+    assert _names(catalog.find(text)) == expected
+
+def test_find_scores(catalog):
+    scores = {record["name"]: score for record, score in catalog.find("Han Dynasty, Red Farm")}
+    assert scores["Han Dynasty"] == 1.0
+    assert 0.8 <= scores["RedFarm"] < 1.0
+
+def test_find_ignores_unrelated_text(catalog):
+    assert catalog.find("The best food in town") == []
+
+@pytest.mark.parametrize("name, expected", [
+    ("Xi’an Famous-Foods", "xi an famous foods"),
+    ("Café Olé", "cafe ole"),
+    ("Crème Brûlée Bar", "creme brulee bar"),
+])
+def test_normalize_name_folds_accents(name, expected):
+    assert normalize_name(name) == expected
+
+def test_accented_names_stay_distinct(tmp_path):
+    path = tmp_path / "cafes.json"
+    path.write_text(json.dumps([{"name": "Café Olé"}, {"name": "Café Éclair"}]), encoding="utf-8")
+    catalog = Catalog({"cafe": str(path)})
+    catalog.reload_if_changed()
+    assert catalog.match("cafe ole")[0]["name"] == "Café Olé"
+    assert catalog.match("Cafe Eclair") == ({"name": "Café Éclair"}, 1.0)
@@ -0,0 +1,66 @@
+import json
+import re
+
+from langchain_core.messages import ToolMessage
+
+from agent.graph.compact_encoding import compact_tool_message, encode_compact, encode_rows
+
+RECORDS = [
+    {"name": "Han Dynasty", "rating": 4.5, "open": True, "detail": "Spicy | Sichuan\nnoodles"},
+    {"name": "RedFarm", "rating": 4, "open": False, "detail": None},
+]
+
+_SEPARATOR = re.compile(r"(?<!\\)\|")
+
+def _decode_rows(text: str) -> list[dict]:
+    """ Reads the header and rows back, cells as the strings the encoder wrote """
+    header, *lines = text.split("\n")
+    count, columns = re.match(r"\[(\d+) rows\] (.*)", header).groups()
+    assert int(count) == len(lines)
+    columns = columns.split("|")
+    return [
+        dict(zip(columns, (cell.replace("\\|", "|") for cell in _SEPARATOR.split(line))))
+        for line in lines
+    ]
+
+def test_encode_rows_round_trip():
+    assert _decode_rows(encode_rows(RECORDS)) == [
+        {"name": "Han Dynasty", "rating": "4.5", "open": "true", "detail": "Spicy | Sichuan noodles"},
+        {"name": "RedFarm", "rating": "4", "open": "false", "detail": ""},
+    ]
+
+def test_encode_rows_flattens_nested_records():
+    records = [
+        {"query": "han dynasty", "record": {"name": "Han Dynasty", "matchScore": 1.0}},
+        {"query": "red frm", "record": None},
+    ]
+    assert _decode_rows(encode_rows(records)) == [
+        {"query": "han dynasty", "name": "Han Dynasty", "matchScore": "1.0"},
+        {"query": "red frm", "name": "", "matchScore": ""},
+    ]
+
+def test_encode_rows_rejects_non_tabular_records():
+    assert encode_rows([]) is None
+    assert encode_rows([{"name": "Han Dynasty", "tags": ["sichuan"]}]) is None
+    # A nested field that would overwrite a top level one
+    assert encode_rows([{"name": "a", "record": {"name": "b"}}]) is None
+
+def test_encode_compact_wrapper():
+    encoded = encode_compact({"records": RECORDS, "notFound": [], "city": "New York"})
+    sections = encoded.split("\n")
+    assert sections[-2:] == ["notFound: none", 'city: "New York"']
+    assert _decode_rows("\n".join(sections[1:-2]))[1]["name"] == "RedFarm"
+    assert encode_compact({"city": "New York"}) is None
+    assert encode_compact(["Han Dynasty", "RedFarm"]) == "Han Dynasty\nRedFarm"
+
+def test_compact_tool_message_saves_tokens():
+    records = RECORDS * 5
+    message = ToolMessage(content=json.dumps(records), tool_call_id="call-1", name="get_restaurant_data_batch")
+    compacted, tokens_before, tokens_after = compact_tool_message(message)
+    assert tokens_after < tokens_before
+    assert compacted.tool_call_id == "call-1"
+    assert len(_decode_rows(compacted.content)) == len(records)
+
+def test_compact_tool_message_keeps_plain_text():
+    message = ToolMessage(content="No restaurants found in Boston", tool_call_id="call-1")
+    assert compact_tool_message(message)[0] is message
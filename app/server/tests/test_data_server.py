@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from agent.a2ui_components import RESTAURANT_RECORD_FIELDS, bound_item_fields
+from agent.graph.mcp_session_pool import IN_PROCESS_TRANSPORT, open_mcp_session
+from agent.mcp.catalog import Catalog
+from agent.mcp.data_server import batch_lookup, format_matches, project
+
+RESTAURANTS = [
+    {"name": "Han Dynasty", "rating": "★★★★☆", "address": "90 3rd Ave"},
+    {"name": "RedFarm", "rating": "★★★★☆", "address": "529 Hudson St"},
+]
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "restaurants.json"
+    path.write_text(json.dumps(RESTAURANTS), encoding="utf-8")
+    catalog = Catalog({"restaurants": str(path)})
+    catalog.reload_if_changed()
+    return catalog
+
+def test_batch_lookup_reports_every_name(catalog):
+    result = batch_lookup(catalog, ["Han Dynasty", "Red Farm", "Nowhere Diner"])
+    han, red_farm, nowhere = result["results"]
+    assert han == {"query": "Han Dynasty", "found": True, "matchScore": 1.0, "record": RESTAURANTS[0]}
+    assert red_farm["found"] and red_farm["record"]["name"] == "RedFarm"
+    assert 0.8 <= red_farm["matchScore"] < 1.0
+    assert nowhere == {"query": "Nowhere Diner", "found": False, "matchScore": 0.0, "record": None}
+    assert result["notFound"] == ["Nowhere Diner"]
+
+def test_format_matches_without_matches_is_a_final_answer():
+    assert format_matches([], "Nowhere Diner").startswith("No catalog data found for: Nowhere Diner.")
+
+@pytest.mark.asyncio
+async def test_batch_tool_returns_structured_content():
+    connection = {"transport": IN_PROCESS_TRANSPORT, "module": "agent.mcp.data_server"}
+    async with open_mcp_session(connection) as session:
+        result = await session.call_tool(
+            "get_restaurant_data_batch", {"restaurant_names": ["Han Dynasty", "Nowhere Diner"]}
+        )
+    content = result.structuredContent
+    assert [item["found"] for item in content["results"]] == [True, False]
+    assert content["results"][0]["record"]["name"] == "Han Dynasty"
+    assert content["notFound"] == ["Nowhere Diner"]
+
+def test_record_fields_are_the_ones_the_templates_bind():
+    assert bound_item_fields('{"path": "/items/0/name"}, {"path": "/items/12/rating"}, {"path": "/items/1/name"}') == [
+        "name", "rating",
+    ]
+    assert sorted(RESTAURANT_RECORD_FIELDS) == ["address", "detail", "imageUrl", "infoLink", "name", "rating"]
+
+def test_projection_drops_fields_the_ui_does_not_bind():
+    record = {"name": "Han Dynasty", "rating": "★★★★☆", "menu": ["Dan dan noodles"], "phone": "555"}
+    assert project(record) == {"name": "Han Dynasty", "rating": "★★★★☆"}
+    assert project(record, ["name", "phone"]) == {"name": "Han Dynasty", "phone": "555"}
+
+def test_batch_lookup_projects_the_requested_fields(catalog):
+    result = batch_lookup(catalog, ["Han Dynasty"], ["name", "address"])
+    assert result["results"][0]["record"] == {"name": "Han Dynasty", "address": "90 3rd Ave"}
+
+def test_text_results_keep_unicode():
+    text = format_matches([(RESTAURANTS[0], 1.0)], "Han Dynasty", ["name", "rating"])
+    assert json.loads(text) == [{"name": "Han Dynasty", "rating": "★★★★☆", "matchScore": 1.0}]
+    # Escaped stars cost several tokens each
+    assert "★" in text
@@ -0,0 +1,122 @@
+import asyncio
+
+import json
+import uuid
+
+import pytest
+from a2a.server.agent_execution import RequestContext
+from a2a.types import DataPart, Message, MessageSendParams, Part, Role, TaskState, TaskStatusUpdateEvent, TextPart
+from a2ui.a2ui_extension import A2UI_EXTENSION_URI
+
+from agent import graph_executor
+from agent.graph_executor import RestaurantGraphExecutor
+from agent.metrics import metrics
+from agent.response_streaming import A2UI_DELIMITER, RESPONSE_DELTA_METADATA_KEY
+from benchmarks.scripted_graph import UI_RESPONSE, scripted_graph_agents
+
+def _counter(name: str) -> int:
+    return metrics.snapshot()["counters"].get(name, 0)
+
+@pytest.fixture
+def executor(in_process_tools, monkeypatch):
+    monkeypatch.setattr(graph_executor, "tool_registry", in_process_tools)
+    return RestaurantGraphExecutor(base_url="http://localhost:10002")
+
+@pytest.mark.asyncio
+async def test_graphs_are_built_once_per_config(executor):
+    misses = _counter("graph_cache.misses")
+    with scripted_graph_agents():
+        graphs = await asyncio.gather(*(executor._get_graph(use_ui=True) for _ in range(4)))
+        text_graph = await executor._get_graph(use_ui=False)
+    assert all(graph is graphs[0] for graph in graphs)
+    assert text_graph is not graphs[0]
+    assert _counter("graph_cache.misses") == misses + 2
+
+@pytest.mark.asyncio
+async def test_config_change_builds_a_new_graph(executor):
+    with scripted_graph_agents():
+        graph = await executor._get_graph(use_ui=True)
+
+        config = executor.get_config()
+        config["data_finder_agent"]["temperature"] = 0.2
+        assert executor.update_config(config) == (True, "")
+        changed = await executor._get_graph(use_ui=True)
+
+        executor.reset_config()
+        reset = await executor._get_graph(use_ui=True)
+
+    assert changed is not graph
+    # Back to the default fingerprint, the graph is still cached
+    assert reset is graph
+
+def test_fingerprint_follows_the_config_values(executor):
+    fingerprint = executor._config_fingerprint
+    config = executor.get_config()
+    config["presenter_agent"]["compact_ui_output"] = True
+    executor.update_config(config)
+    assert executor._config_fingerprint != fingerprint
+
+def test_invalid_config_keeps_the_current_graphs(executor):
+    fingerprint = executor._config_fingerprint
+    config = executor.get_config()
+    config["place_finder_agent"]["temperature"] = 5
+    success, error = executor.update_config(config)
+    assert not success
+    assert "validation failed" in error
+    assert executor._config_fingerprint == fingerprint
+
+@pytest.mark.asyncio
+async def test_cache_keeps_the_most_recent_graphs(executor, monkeypatch):
+    monkeypatch.setattr(RestaurantGraphExecutor, "GRAPH_CACHE_SIZE", 2)
+    with scripted_graph_agents():
+        first = await executor._get_graph(use_ui=True)
+        await executor._get_graph(use_ui=False)
+        config = executor.get_config()
+        config["data_finder_agent"]["temperature"] = 0.2
+        executor.update_config(config)
+        await executor._get_graph(use_ui=True)
+        executor.reset_config()
+        # Evicted by the two newer graphs
+        assert await executor._get_graph(use_ui=True) is not first
+    assert len(executor._graph_cache) == 2
+
+class _EventQueue:
+    """ Keeps the events the executor enqueues """
+
+    def __init__(self):
+        self.events = []
+
+    async def enqueue_event(self, event):
+        self.events.append(event)
+
+async def _execute(executor, text: str) -> list[TaskStatusUpdateEvent]:
+    message = Message(
+        role=Role.user, message_id=str(uuid.uuid4()), parts=[Part(root=TextPart(text=text))],
+        extensions=[A2UI_EXTENSION_URI],
+    )
+    queue = _EventQueue()
+    await executor.execute(RequestContext(request=MessageSendParams(message=message)), queue)
+    return [event for event in queue.events if isinstance(event, TaskStatusUpdateEvent)]
+
+@pytest.mark.asyncio
+async def test_response_tokens_stream_as_working_updates(executor):
+    # Without data records the presenter model streams UI_RESPONSE
+    with scripted_graph_agents(tool_turns=0):
+        updates = await _execute(executor, "Top chinese restaurants in New York")
+
+    working = [update.status.message.parts[0].root for update in updates if update.status.state == TaskState.working]
+    deltas = [part for part in working if (part.metadata or {}).get(RESPONSE_DELTA_METADATA_KEY)]
+    streamed_ui = [part for part in working if isinstance(part, DataPart)]
+    text, ui_json = UI_RESPONSE.split(A2UI_DELIMITER)
+    assert "".join(part.text for part in deltas).strip() == text.strip()
+    assert len(deltas) > 1
+    assert [part.data for part in streamed_ui] == json.loads(ui_json)
+    message_id = deltas[0].metadata["message_id"]
+    assert all(part.metadata["message_id"] == message_id for part in deltas + streamed_ui)
+
+    final = updates[-1]
+    assert final.final and final.status.state == TaskState.completed
+    # Every A2UI message was streamed, the final message points at them instead of repeating them
+    assert final.status.message.metadata == {"a2ui_streamed": message_id}
+    assert not any(isinstance(part.root, DataPart) for part in final.status.message.parts)
+    assert final.status.message.parts[0].root.text == text.strip()
@@ -0,0 +1,42 @@
+import json
+
+from langchain.messages import AIMessage, HumanMessage, ToolMessage
+
+from agent.graph.handoff import extract_place_names, extract_records, new_messages
+
+def _tool(value, status="success") -> ToolMessage:
+    return ToolMessage(json.dumps(value), tool_call_id="call", status=status)
+
+def test_place_names_from_tool_results_narrowed_by_answer():
+    messages = [
+        _tool(["Han Dynasty", "RedFarm", "Mott 32"]),
+        AIMessage("The top 2 are Han Dynasty and RedFarm."),
+    ]
+    assert extract_place_names(messages) == ["Han Dynasty", "RedFarm"]
+
+def test_place_names_skip_not_found_results():
+    messages = [
+        _tool(["No restaurants found in Boston"]),
+        AIMessage("No restaurants found in Boston."),
+    ]
+    assert extract_place_names(messages) == []
+
+    messages = [_tool(["No restaurants found in Boston"]), _tool(["Marte", "Starbucks"]), AIMessage("Marte, Starbucks")]
+    assert extract_place_names(messages) == ["Marte", "Starbucks"]
+
+def test_place_names_skip_error_results():
+    messages = [_tool("Error: tool failed", status="error"), AIMessage("Han Dynasty\nRedFarm")]
+    assert extract_place_names(messages) == ["Han Dynasty", "RedFarm"]
+
+def test_records_from_batch_and_list_results():
+    batch = {"results": [
+        {"query": "Han Dynasty", "found": True, "matchScore": 1.0, "record": {"name": "Han Dynasty"}},
+        {"query": "Nowhere", "found": False, "matchScore": 0.0, "record": None},
+    ], "notFound": ["Nowhere"]}
+    messages = [_tool(batch), _tool([{"name": "RedFarm"}, {"name": "Han Dynasty", "rating": "★"}])]
+    assert extract_records(messages) == [{"name": "Han Dynasty", "rating": "★"}, {"name": "RedFarm"}]
+
+def test_new_messages_drop_agent_input():
+    agent_input = [HumanMessage("top chinese")]
+    answer = AIMessage("Han Dynasty")
+    assert new_messages([*agent_input, answer], agent_input) == [answer]
@@ -0,0 +1,27 @@
+import pytest
+
+from agent.graph.handoff import tool_result_value
+from agent.graph.mcp_session_pool import IN_PROCESS_TRANSPORT, open_mcp_session
+from agent.graph.tool_registry import MCP_IN_PROCESS_SERVERS, McpToolRegistry
+
+@pytest.mark.asyncio
+async def test_session_against_an_in_process_server():
+    connection = {"transport": IN_PROCESS_TRANSPORT, "module": "agent.mcp.food_place_server"}
+    async with open_mcp_session(connection) as session:
+        tools = await session.list_tools()
+        result = await session.call_tool("get_restaurants", {"cuisine_type": "Chinese", "city": "New York"})
+    assert sorted(tool.name for tool in tools.tools) == ["get_cafes", "get_restaurants"]
+    assert result.structuredContent["result"][:2] == ["Xi'an Famous Foods", "Han Dynasty"]
+
+@pytest.mark.asyncio
+async def test_registry_binds_the_in_process_tools():
+    registry = McpToolRegistry(MCP_IN_PROCESS_SERVERS)
+    try:
+        tools = {tool.name: tool for tool in await registry.get_tools()}
+        message = await tools["get_cafes"].ainvoke(
+            {"type": "tool_call", "id": "call-1", "name": "get_cafes", "args": {"city": "New York"}}
+        )
+    finally:
+        await registry.aclose()
+    assert {"get_restaurants", "get_cafes", "get_restaurant_data_batch", "get_cafe_data_batch"} <= set(tools)
+    assert tool_result_value(message) == ["Marte", "Starbucks", "ItalianCoffe"]
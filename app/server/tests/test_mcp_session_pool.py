@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from mcp import ClientSession
+from mcp.server.fastmcp import FastMCP
+
+from agent.graph import mcp_session_pool
+from agent.graph.mcp_session_pool import IN_PROCESS_TRANSPORT, McpSessionPool, _PooledSession
+from agent.metrics import metrics
+
+# In-process server the pools connect to
+mcp = FastMCP("pool_test_server")
+_running = 0
+_max_running = 0
+
+@mcp.tool()
+async def slow_echo(text: str) -> str:
+    """ Echoes the text after a short wait, counting the calls running at once """
+    global _running, _max_running
+    _running += 1
+    _max_running = max(_max_running, _running)
+    await asyncio.sleep(0.01)
+    _running -= 1
+    return text
+
+CONNECTION = {"transport": IN_PROCESS_TRANSPORT, "module": __name__}
+
+def _counter(name: str) -> int:
+    return metrics.snapshot()["counters"].get(f"mcp_pool.pool_test_server.{name}", 0)
+
+def _text(result) -> str:
+    return result.content[0].text
+
+@pytest_asyncio.fixture
+async def pool():
+    pool = McpSessionPool("pool_test_server", CONNECTION, size=2)
+    yield pool
+    await pool.aclose()
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """ Backoff delays the pool waited for, without waiting. Patches asyncio.sleep everywhere, so the
+    tests using it do not call slow_echo """
+    delays = []
+
+    async def sleep(seconds):
+        delays.append(seconds)
+
+    monkeypatch.setattr(mcp_session_pool.asyncio, "sleep", sleep)
+    return delays
+
+@pytest.mark.asyncio
+async def test_sessions_are_reused(pool):
+    reused = _counter("reused")
+    for text in ("a", "b", "c"):
+        assert _text(await pool.call_tool("slow_echo", {"text": text})) == text
+    assert _counter("reused") == reused + 2
+    assert len(pool._open) == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_bounded_by_the_pool_size(pool):
+    global _max_running
+    _max_running = 0
+    results = await asyncio.gather(*(pool.call_tool("slow_echo", {"text": str(i)}) for i in range(6)))
+    assert [_text(result) for result in results] == [str(i) for i in range(6)]
+    assert _max_running == 2
+    assert len(pool._open) == 2
+
+@pytest.mark.asyncio
+async def test_connect_retries_with_exponential_backoff(pool, sleeps, monkeypatch):
+    open_session = _PooledSession.open
+    failures = iter([ConnectionError("refused"), ConnectionError("refused")])
+
+    async def flaky_open(self, connection):
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        await open_session(self, connection)
+
+    monkeypatch.setattr(_PooledSession, "open", flaky_open)
+    connect_failures = _counter("connect_failures")
+    tools = await pool.list_tools()
+    assert [tool.name for tool in tools.tools] == ["slow_echo"]
+    assert sleeps == [0.5, 1.0]
+    assert _counter("connect_failures") == connect_failures + 2
+
+@pytest.mark.asyncio
+async def test_connect_gives_up_after_the_last_attempt(sleeps):
+    pool = McpSessionPool("pool_test_server", {"transport": IN_PROCESS_TRANSPORT, "module": "tests.no_such_server"})
+    with pytest.raises(ModuleNotFoundError):
+        await pool.list_tools()
+    assert sleeps == [0.5, 1.0, 2.0]
+    assert not pool._open
+
+@pytest.mark.asyncio
+async def test_broken_session_is_replaced_and_the_call_retried(pool, monkeypatch):
+    await pool.call_tool("slow_echo", {"text": "warm"})
+    broken = next(iter(pool._open))
+    call_tool = ClientSession.call_tool
+    failed = []
+
+    async def fail_once(self, *args, **kwargs):
+        if not failed:
+            failed.append(self)
+            raise ConnectionError("connection reset")
+        return await call_tool(self, *args, **kwargs)
+
+    monkeypatch.setattr(ClientSession, "call_tool", fail_once)
+    call_retries = _counter("call_retries")
+    assert _text(await pool.call_tool("slow_echo", {"text": "a"})) == "a"
+    assert _counter("call_retries") == call_retries + 1
+    assert broken not in pool._open
+    assert len(pool._open) == 1
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_health_checked(pool, monkeypatch):
+    await pool.call_tool("slow_echo", {"text": "warm"})
+    stale = next(iter(pool._open))
+    monkeypatch.setattr(McpSessionPool, "HEALTH_CHECK_INTERVAL_SECONDS", 0)
+
+    # A healthy idle session answers the ping and is reused
+    reused = _counter("reused")
+    await pool.call_tool("slow_echo", {"text": "a"})
+    assert _counter("reused") == reused + 1
+
+    async def no_answer(self):
+        raise ConnectionError("no answer")
+
+    monkeypatch.setattr(ClientSession, "send_ping", no_answer)
+    health_check_failures = _counter("health_check_failures")
+    assert _text(await pool.call_tool("slow_echo", {"text": "b"})) == "b"
+    assert _counter("health_check_failures") == health_check_failures + 1
+    assert stale not in pool._open
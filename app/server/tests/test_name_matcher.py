@@ -0,0 +1,62 @@
+import random
+import string
+
+import pytest
+
+from agent.mcp.name_matcher import NameMatch, NameMatcher
+
+NAMES = ["han dynasty", "redfarm", "mott 32", "xi an famous foods", "carbone"]
+
+@pytest.fixture
+def matcher():
+    return NameMatcher(NAMES)
+
+def test_exact_mentions_score_one(matcher):
+    assert matcher.find_mentions("try han dynasty or mott 32 tonight") == [
+        NameMatch("han dynasty", 1.0),
+        NameMatch("mott 32", 1.0),
+    ]
+
+def test_mentions_are_whole_words(matcher):
+    assert matcher.find_mentions("carbonera and han dynasty2") == []
+
+def test_closest_scores_near_misses(matcher):
+    match = matcher.closest("xian famous foods")
+    assert match.key == "xi an famous foods"
+    assert matcher.MIN_FUZZY_SCORE <= match.score < 1.0
+
+def test_closest_rejects_dissimilar_text(matcher):
+    assert matcher.closest("pizza place") is None
+
+def test_match_text_keeps_text_order(matcher):
+    matches = matcher.match_text("red farm then han dynasty then carbon")
+    assert [match.key for match in matches] == ["redfarm", "han dynasty", "carbone"]
+    assert matches[1].score == 1.0
+    assert all(matcher.MIN_FUZZY_SCORE <= match.score < 1.0 for match in (matches[0], matches[2]))
+
+def test_empty_matcher():
+    matcher = NameMatcher([])
+    assert matcher.match_text("han dynasty") == []
+    assert matcher.closest("han dynasty") is None
+
+def _synthetic_names(count: int) -> list[str]:
+    """ Distinct "the <word> <word> cafe" names, so the common trigrams are in every name """
+    rng = random.Random(0)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 8))) for _ in range(count)]
+    return [f"the {words[i]} {words[(i * 7 + 1) % count]} cafe" for i in range(count)]
+
+def test_lookup_cost_does_not_grow_with_the_catalog():
+    names = _synthetic_names(5000)
+    matcher = NameMatcher(names + ["the blue moon cafe"])
+    query = "the blu moon cafe"
+
+    shared = matcher._candidates(query)
+    postings_scanned = sum(shared.values())
+    assert len(shared) < matcher.MAX_CANDIDATE_POOL + matcher.MAX_TRIGRAM_POSTINGS
+    assert postings_scanned <= len(set(NameMatcher._trigrams_of(query))) * matcher.MAX_TRIGRAM_POSTINGS
+    # A full scan visits every name for the common trigrams alone
+    assert postings_scanned < len(names)
+
+    match = matcher.closest(query)
+    assert match.key == "the blue moon cafe"
+    assert match.score >= matcher.MIN_FUZZY_SCORE
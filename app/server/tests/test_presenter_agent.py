@@ -0,0 +1,94 @@
+import dataclasses
+import json
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+
+from agent.a2ui_templates import render_booking_form, render_confirmation, render_restaurant_list
+from agent.graph.presenter_agent import PresenterAgent
+from agent.graph.struct import DEFAULT_CONFIG, RestaurantGraphState
+from agent.metrics import metrics
+
+RECORDS = [
+    {"name": "Han Dynasty", "rating": "★★★★☆", "detail": "Sichuan", "infoLink": "", "imageUrl": "", "address": "90 3rd Ave"},
+    {"name": "RedFarm", "rating": "★★★★☆", "detail": "Dim sum", "infoLink": "", "imageUrl": "", "address": "529 Hudson St"},
+]
+
+def _presenter(monkeypatch, responses: list[str], config=DEFAULT_CONFIG["presenter_agent"]) -> PresenterAgent:
+    """ Presenter whose model answers with the responses in order """
+    model = GenericFakeChatModel(messages=iter(AIMessage(response) for response in responses))
+    monkeypatch.setattr(
+        PresenterAgent, "_build_agent", lambda self: create_agent(model=model, tools=[], name=self.agent_name)
+    )
+    return PresenterAgent(base_url="http://localhost:10002", use_ui=True, config=config)
+
+async def _present(presenter: PresenterAgent, state: dict) -> tuple[dict, list[dict]]:
+    """ Final state and the A2UI messages published on the custom stream """
+    graph_builder = StateGraph(RestaurantGraphState)
+    graph_builder.add_node("presenter_agent", presenter)
+    graph_builder.add_edge(START, "presenter_agent")
+    graph_builder.add_edge("presenter_agent", END)
+    graph = graph_builder.compile()
+    published = []
+    async for mode, chunk in graph.astream(state, stream_mode=["custom", "values"]):
+        if mode == "custom":
+            published.append(chunk["a2ui_message"])
+        else:
+            final_state = chunk
+    return final_state, published
+
+@pytest.mark.asyncio
+async def test_records_render_the_list_template_without_the_model(monkeypatch):
+    # Any model call would fail, the fake model has no responses
+    presenter = _presenter(monkeypatch, [])
+    state, published = await _present(presenter, {
+        "messages": [HumanMessage("top chinese restaurants in NY?")],
+        "user_query": "top chinese restaurants in NY?",
+        "restaurant_records": RECORDS,
+    })
+    expected = render_restaurant_list(RECORDS, "Top chinese restaurants in NY")
+    assert state["a2ui_messages"] == expected
+    assert published == expected
+    assert state["response_text"] == "Here are 2 places I found for you."
+
+@pytest.mark.asyncio
+async def test_ui_actions_render_booking_and_confirmation(monkeypatch):
+    presenter = _presenter(monkeypatch, [])
+    context = {"restaurantName": "Han Dynasty", "address": "90 3rd Ave", "imageUrl": "han.jpg"}
+    state, _ = await _present(presenter, {
+        "messages": [HumanMessage("USER_WANTS_TO_BOOK: Han Dynasty")],
+        "ui_action": {"name": "book_restaurant", "context": context},
+    })
+    assert state["a2ui_messages"] == render_booking_form("Han Dynasty", "90 3rd Ave", "han.jpg")
+
+    context = {"restaurantName": "Han Dynasty", "partySize": "4", "reservationTime": "7pm", "imageUrl": "han.jpg"}
+    state, _ = await _present(presenter, {
+        "messages": [HumanMessage("User submitted a booking for Han Dynasty")],
+        "ui_action": {"name": "submit_booking", "context": context},
+    })
+    assert state["a2ui_messages"] == render_confirmation("Han Dynasty", "4", "7pm", "None", "han.jpg")
+
+@pytest.mark.asyncio
+async def test_free_form_request_calls_the_model(monkeypatch):
+    presenter = _presenter(monkeypatch, ["No places found.\n---a2ui_JSON---\n[]"])
+    state, published = await _present(presenter, {"messages": [HumanMessage("Anything good?")]})
+    assert state["response_text"].strip() == "No places found."
+    assert state["a2ui_messages"] == []
+    assert published == []
+
+@pytest.mark.asyncio
+async def test_compact_output_is_expanded_after_a_retry(monkeypatch):
+    config = dataclasses.replace(DEFAULT_CONFIG["presenter_agent"], compact_ui_output=True)
+    compact = {"template": "SINGLE_COLUMN_LIST", "title": "Top picks", "items": RECORDS}
+    presenter = _presenter(monkeypatch, [
+        'Here you go.\n---a2ui_JSON---\n{"template": "CAROUSEL", "items": []}',
+        f"Here you go.\n---a2ui_JSON---\n{json.dumps(compact)}",
+    ], config)
+    before = metrics.snapshot()["counters"].get("a2ui_validation.presenter_agent.retried", 0)
+    state, _ = await _present(presenter, {"messages": [HumanMessage("Anything good?")]})
+    assert state["response_text"] == "Here you go."
+    assert state["a2ui_messages"] == render_restaurant_list(RECORDS, "Top picks")
+    assert metrics.snapshot()["counters"]["a2ui_validation.presenter_agent.retried"] == before + 1
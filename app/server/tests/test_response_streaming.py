@@ -0,0 +1,32 @@
+import pytest
+
+from agent.response_streaming import A2UI_DELIMITER, ResponseTextStreamer
+
+RESPONSE = f"Here are the places.\n{A2UI_DELIMITER}\n[]"
+
+def _stream(chunks: list[str]) -> tuple[str, str]:
+    streamer = ResponseTextStreamer()
+    text, payload = "", ""
+    for chunk in chunks:
+        text_delta, payload_delta = streamer.feed(chunk)
+        text += text_delta
+        payload += payload_delta
+    return text, payload
+
+@pytest.mark.parametrize("size", [1, 2, 5, 16, len(RESPONSE)])
+def test_text_and_payload_split_at_the_delimiter(size):
+    chunks = [RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]
+    assert _stream(chunks) == ("Here are the places.\n", "\n[]")
+
+def test_delimiter_prefix_is_held_back_until_settled():
+    streamer = ResponseTextStreamer()
+    assert streamer.feed("Rated 4 --") == ("Rated 4 ", "")
+    # Not the delimiter after all, the held back dashes are text
+    assert streamer.feed("- stars") == ("--- stars", "")
+    assert streamer.feed(f" {A2UI_DELIMITER[:5]}") == (" ", "")
+    assert streamer.feed(f"{A2UI_DELIMITER[5:]}[") == ("", "[")
+    assert streamer.done
+    assert streamer.feed("]") == ("", "]")
+
+def test_text_without_delimiter():
+    assert _stream(["Han Dynasty ", "and RedFarm."]) == ("Han Dynasty and RedFarm.", "")
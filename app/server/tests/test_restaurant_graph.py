@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from agent.graph.restaurant_graph import STREAM_MODES
+from agent.response_streaming import A2UI_DELIMITER
+from benchmarks.scripted_graph import UI_RESPONSE, build_scripted_graph
+
+QUERY = "Top 5 chinese restaurants in New York"
+
+async def _events(graph, stream_mode: str | None = None) -> list[dict]:
+    return [event async for event in graph.call_restaurant_graph(QUERY, "session", stream_mode)]
+
+def _timeline(events: list[dict]) -> list[str]:
+    return [event["updates"] for event in events if "updates" in event]
+
+@pytest.mark.asyncio
+async def test_stream_modes_end_with_the_same_response(in_process_tools):
+    graph = await build_scripted_graph(use_ui=True)
+    finals = []
+    for stream_mode in STREAM_MODES:
+        final = (await _events(graph, stream_mode))[-1]
+        assert final["is_task_complete"]
+        finals.append((final["content"], final["a2ui_messages"]))
+    assert finals[0] == finals[1]
+    assert finals[0][0] == "Here are 5 places I found for you."
+
+@pytest.mark.asyncio
+async def test_delta_stream_reports_each_step_once(in_process_tools):
+    graph = await build_scripted_graph(use_ui=True)
+    assert _timeline(await _events(graph, "delta")) == [
+        "Current query: place_finder_agent",
+        "place_finder_agent called tool: get_restaurants",
+        "Tool get_restaurants responded",
+        "place_finder_agent responded",
+        "Current query: place_data_agent",
+        "data_finder_agent called tool: get_restaurant_data_batch",
+        "Tool get_restaurant_data_batch responded",
+        "data_finder_agent responded",
+        "Current query: presenter_agent",
+        # The templated answer is added by the node itself, without an agent
+        "presenter_agent responded",
+    ]
+
+@pytest.mark.asyncio
+async def test_unknown_stream_mode_argument(in_process_tools):
+    graph = await build_scripted_graph(use_ui=True)
+    with pytest.raises(ValueError, match="Unknown graph stream mode 'delt'"):
+        await _events(graph, "delt")
+
+def test_unknown_stream_mode_setting_fails_on_import():
+    result = subprocess.run(
+        [sys.executable, "-c", "import agent.graph.restaurant_graph"],
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        env={**os.environ, "GRAPH_STREAM_MODE": "delt"},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode != 0
+    assert "Unknown graph stream mode 'delt'" in result.stderr
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream_mode", STREAM_MODES)
+async def test_final_event_carries_the_validated_ui(in_process_tools, stream_mode):
+    # Without data records the presenter model answers with UI_RESPONSE
+    graph = await build_scripted_graph(use_ui=True, tool_turns=0)
+    final = (await _events(graph, stream_mode))[-1]
+    text, ui_json = UI_RESPONSE.split(A2UI_DELIMITER)
+    assert final["content"] == text.strip()
+    assert final["a2ui_messages"] == json.loads(ui_json)
+
+@pytest.mark.asyncio
+async def test_values_stream_labels_nodes_without_state_snapshots(in_process_tools, monkeypatch):
+    graph = await build_scripted_graph(use_ui=True)
+
+    def no_snapshots(*args, **kwargs):
+        raise AssertionError("get_state called while streaming")
+
+    monkeypatch.setattr(graph._restaurant_graph, "get_state", no_snapshots)
+    monkeypatch.setattr(graph._restaurant_graph, "aget_state", no_snapshots)
+    timeline = _timeline(await _events(graph, "values"))
+    assert timeline[:2] == ["Current query: START", "Current query: place_finder_agent"]
+    assert "Current query: place_data_agent" in timeline
+    assert timeline.index("Current query: place_data_agent") > timeline.index("place_finder_agent responded")
+    assert timeline[-1] == "presenter_agent responded"
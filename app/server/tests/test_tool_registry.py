@@ -0,0 +1,113 @@
+import pytest
+import pytest_asyncio
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+from agent import graph_executor
+from agent.graph import data_agent, food_place_agent
+from agent.graph import tool_registry
+from agent.graph.mcp_session_pool import IN_PROCESS_TRANSPORT
+from agent.graph.tool_registry import McpToolRegistry
+from agent.graph_executor import RestaurantGraphExecutor
+from agent.metrics import metrics
+from benchmarks.scripted_graph import scripted_graph_agents
+
+# In-process server the registry connects to, replaced by every test
+mcp = FastMCP("test_server")
+
+CONNECTIONS = {"test_server": {"transport": IN_PROCESS_TRANSPORT, "module": __name__, "pool_size": 1}}
+
+def get_restaurants(cuisine_type: str, city: str) -> list[str]:
+    """ Finds restaurants """
+    return ["Han Dynasty"]
+
+def get_restaurant_data_batch(restaurant_names: list[str]) -> list[dict]:
+    """ Finds restaurant data """
+    return [{"name": name} for name in restaurant_names]
+
+def get_cafe_data_batch(cafe_names: list[str]) -> list[dict]:
+    """ Finds cafe data """
+    return [{"name": name} for name in cafe_names]
+
+@pytest_asyncio.fixture
+async def registry():
+    global mcp
+    mcp = FastMCP("test_server")
+    for tool in (get_restaurants, get_restaurant_data_batch):
+        mcp.add_tool(tool)
+    registry = McpToolRegistry(CONNECTIONS)
+    yield registry
+    await registry.aclose()
+
+def _refreshes(reason: str) -> int:
+    return metrics.snapshot()["counters"].get(f"mcp_tools.refresh.{reason}", 0)
+
+def _list_changed() -> types.ServerNotification:
+    return types.ServerNotification(types.ToolListChangedNotification(method="notifications/tools/list_changed"))
+
+@pytest.mark.asyncio
+async def test_tools_are_cached_until_the_ttl_expires(registry):
+    tools = await registry.get_tools(["get_restaurant_data_batch"])
+    assert [tool.name for tool in tools] == ["get_restaurant_data_batch"]
+    generation = await registry.get_generation()
+
+    refreshes = _refreshes("ttl_expired")
+    await registry.get_tools()
+    assert _refreshes("ttl_expired") == refreshes
+
+    registry.ttl_seconds = 0
+    await registry.get_tools()
+    assert _refreshes("ttl_expired") == refreshes + 1
+    # The same tools discovered again keep their generation
+    assert await registry.get_generation() == generation
+
+@pytest.mark.asyncio
+async def test_list_changed_notification_refreshes_the_tools(registry):
+    generation = await registry.get_generation()
+    mcp.add_tool(get_cafe_data_batch)
+    # Still cached, the server did not report the change yet
+    assert len(await registry.get_tools()) == 2
+
+    await registry._handle_message(_list_changed())
+    assert await registry.get_generation() == generation + 1
+    assert [tool.name for tool in await registry.get_tools()] == [
+        "get_restaurants", "get_restaurant_data_batch", "get_cafe_data_batch",
+    ]
+
+@pytest.mark.asyncio
+async def test_failed_refresh_serves_the_last_tools(registry, monkeypatch):
+    tools = await registry.get_tools()
+
+    async def unreachable(*args, **kwargs):
+        raise ConnectionError("server down")
+
+    monkeypatch.setattr(tool_registry, "load_mcp_tools", unreachable)
+    registry.ttl_seconds = 0
+    stale_served = metrics.snapshot()["counters"].get("mcp_tools.stale_served", 0)
+    assert await registry.get_tools() == tools
+    assert metrics.snapshot()["counters"]["mcp_tools.stale_served"] == stale_served + 1
+
+    with pytest.raises(ConnectionError):
+        await McpToolRegistry(CONNECTIONS).get_tools()
+
+@pytest.mark.asyncio
+async def test_changed_tools_reach_the_next_graph(registry, monkeypatch):
+    for module in (graph_executor, data_agent, food_place_agent):
+        monkeypatch.setattr(module, "tool_registry", registry)
+    executor = RestaurantGraphExecutor(base_url="http://localhost:10002")
+
+    with scripted_graph_agents():
+        graph = await executor._get_graph(use_ui=True)
+        assert await executor._get_graph(use_ui=True) is graph
+        assert _data_tools(graph) == ["get_restaurant_data_batch"]
+
+        mcp.add_tool(get_cafe_data_batch)
+        await registry._handle_message(_list_changed())
+        next_graph = await executor._get_graph(use_ui=True)
+
+    assert next_graph is not graph
+    assert _data_tools(next_graph) == ["get_cafe_data_batch", "get_restaurant_data_batch"]
+
+def _data_tools(graph) -> list[str]:
+    """ Tools bound to the data finder agent of a built graph """
+    return sorted(graph._data_finder.agent.nodes["tools"].bound.tools_by_name)
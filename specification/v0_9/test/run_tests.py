@@ -1,16 +1,34 @@
 #!/usr/bin/env python3
 
+"""Validates the A2UI v0.9 test cases against the schemas in ../json.
+
+All schemas are loaded and compiled once, with draft 2020-12 `$ref` resolution
+across the schema files, and every test case and JSONL line is validated in
+memory. `--workers` spreads the suites over a process pool, `--ajv` runs each
+case through ajv-cli instead to cross-check the results.
+"""
+
+import argparse
 import json
-import subprocess
 import os
 import glob
+import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import jsonschema
+    import referencing
+    import referencing.jsonschema
+except ImportError:
+    jsonschema = None
 
 # Constants
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 SCHEMA_DIR = os.path.abspath(os.path.join(TEST_DIR, "../json"))
 CASES_DIR = os.path.join(TEST_DIR, "cases")
-TEMP_FILE = os.path.join(TEST_DIR, "temp_data.json")
 
 # Map of schema filenames to their full paths
 SCHEMAS = {
@@ -20,16 +38,62 @@ SCHEMAS = {
     "client_to_server.json": os.path.join(SCHEMA_DIR, "client_to_server.json"),
 }
 
-def validate_ajv(schema_path, data_path, all_schemas):
+# Compiled once per process, see get_validators
+_validators = None
+
+def load_validators():
+    """Compiles a draft 2020-12 validator per schema, sharing one $ref registry."""
+    schemas = {}
+    for name, path in SCHEMAS.items():
+        with open(path, 'r') as f:
+            schemas[name] = json.load(f)
+
+    registry = referencing.Registry().with_resources(
+        (
+            schema["$id"],
+            referencing.Resource.from_contents(
+                schema, default_specification=referencing.jsonschema.DRAFT202012
+            ),
+        )
+        for schema in schemas.values()
+        if "$id" in schema
+    )
+    validators = {}
+    for name, schema in schemas.items():
+        jsonschema.Draft202012Validator.check_schema(schema)
+        validators[name] = jsonschema.Draft202012Validator(schema, registry=registry)
+    return validators
+
+def get_validators():
+    global _validators
+    if _validators is None:
+        _validators = load_validators()
+    return _validators
+
+def validate_in_process(schema_name, data):
+    """Validates data with the compiled validator of a schema."""
+    error = jsonschema.exceptions.best_match(get_validators()[schema_name].iter_errors(data))
+    if error is None:
+        return True, ""
+    return False, f"{error.json_path}: {error.message}"
+
+def validate_ajv(schema_name, data):
     """Runs ajv validate via subprocess."""
+    schema_path = SCHEMAS[schema_name]
     local_ajv = os.path.join(TEST_DIR, "node_modules", ".bin", "ajv")
     if os.path.exists(local_ajv):
-        cmd = [local_ajv, "validate", "-s", schema_path, "--spec=draft2020", "--strict=false", "-d", data_path]
+        cmd = [local_ajv]
     else:
-        cmd = ["pnpm", "dlx", "ajv-cli", "validate", "-s", schema_path, "--spec=draft2020", "--strict=false", "-d", data_path]
+        cmd = ["pnpm", "dlx", "ajv-cli"]
+
+    # A file per case, so runs do not share state
+    with tempfile.NamedTemporaryFile('w', suffix=".json", delete=False) as f:
+        json.dump(data, f)
+        data_path = f.name
+    cmd.extend(["validate", "-s", schema_path, "--spec=draft2020", "--strict=false", "-d", data_path])
 
     # Add all other schemas as references
-    for name, path in all_schemas.items():
+    for name, path in SCHEMAS.items():
         if path != schema_path:
             cmd.extend(["-r", path])
 
@@ -39,63 +103,58 @@ def validate_ajv(schema_path, data_path, all_schemas):
     except FileNotFoundError:
         print("Error: 'ajv' command not found. Please ensure dependencies are installed (e.g., 'pnpm install').")
         sys.exit(1)
-
-def run_suite(suite_path):
+    finally:
+        os.remove(data_path)
+
+def run_suite(suite_path, validate):
+    result = {
+        "title": f"Running suite: {os.path.basename(suite_path)}",
+        "schema": None,
+        "passed": 0,
+        "failed": 0,
+        "output": [],
+    }
     with open(suite_path, 'r') as f:
         try:
             suite = json.load(f)
         except json.JSONDecodeError as e:
-            print(f"Error parsing JSON in {suite_path}: {e}")
-            return 0, 0
+            result["output"].append(f"Error parsing JSON in {suite_path}: {e}")
+            return result
 
     schema_name = suite.get("schema", "server_to_client.json")
     if schema_name not in SCHEMAS:
-        print(f"Error: Unknown schema '{schema_name}' referenced in {suite_path}")
-        return 0, 0
+        result["output"].append(f"Error: Unknown schema '{schema_name}' referenced in {suite_path}")
+        return result
 
-    schema_path = SCHEMAS[schema_name]
+    result["schema"] = schema_name
     tests = suite.get("tests", [])
-
-    print(f"\nRunning suite: {os.path.basename(suite_path)} ({len(tests)} tests)")
-    print(f"Target Schema: {schema_name}")
-
-    passed = 0
-    failed = 0
+    result["title"] += f" ({len(tests)} tests)"
 
     for i, test in enumerate(tests):
         description = test.get("description", f"Test #{i+1}")
         expect_valid = test.get("valid", True)
-        data = test.get("data")
-
-        # Write data to temp file
-        with open(TEMP_FILE, 'w') as f:
-            json.dump(data, f)
 
-        is_valid, output = validate_ajv(schema_path, TEMP_FILE, SCHEMAS)
+        is_valid, output = validate(schema_name, test.get("data"))
 
         if is_valid == expect_valid:
-            passed += 1
-            # print(f"  [PASS] {description}")
+            result["passed"] += 1
         else:
-            failed += 1
-            print(f"  [FAIL] {description}")
-            print(f"         Expected Valid: {expect_valid}, Got Valid: {is_valid}")
+            result["failed"] += 1
+            result["output"].append(f"  [FAIL] {description}")
+            result["output"].append(f"         Expected Valid: {expect_valid}, Got Valid: {is_valid}")
             if not is_valid:
-                 print(f"         Output: {output.strip()}")
-
-    return passed, failed
+                result["output"].append(f"         Output: {output.strip()}")
 
-def validate_jsonl_example(jsonl_path):
-    if not os.path.exists(jsonl_path):
-        print(f"Error: Example file not found: {jsonl_path}")
-        return 0, 1
+    return result
 
-    print(f"\nValidating JSONL example: {os.path.basename(jsonl_path)}")
-    print(f"Target Schema: server_to_client.json")
-
-    passed = 0
-    failed = 0
-    schema_path = SCHEMAS["server_to_client.json"]
+def validate_jsonl_example(jsonl_path, validate):
+    result = {
+        "title": f"Validating JSONL example: {os.path.basename(jsonl_path)}",
+        "schema": "server_to_client.json",
+        "passed": 0,
+        "failed": 0,
+        "output": [],
+    }
 
     with open(jsonl_path, 'r') as f:
         for i, line in enumerate(f):
@@ -103,49 +162,79 @@ def validate_jsonl_example(jsonl_path):
             if not line:
                 continue
 
-            # Use temp file for each line
-            with open(TEMP_FILE, 'w') as tf:
-                tf.write(line)
-
-            is_valid, output = validate_ajv(schema_path, TEMP_FILE, SCHEMAS)
+            try:
+                is_valid, output = validate(result["schema"], json.loads(line))
+            except json.JSONDecodeError as e:
+                is_valid, output = False, f"Invalid JSON: {e}"
             if is_valid:
-                passed += 1
-                # print(f"  [PASS] Line {i+1}")
+                result["passed"] += 1
             else:
-                failed += 1
-                print(f"  [FAIL] Line {i+1}")
-                print(f"         Output: {output.strip()}")
-
-    return passed, failed
+                result["failed"] += 1
+                result["output"].append(f"  [FAIL] Line {i+1}")
+                result["output"].append(f"         Output: {output.strip()}")
+
+    return result
+
+def run_file(path, use_ajv):
+    """Runs one suite or JSONL example, timing it. Runs in pool workers too."""
+    validate = validate_ajv if use_ajv else validate_in_process
+    start = time.perf_counter()
+    if path.endswith(".jsonl"):
+        result = validate_jsonl_example(path, validate)
+    else:
+        result = run_suite(path, validate)
+    result["seconds"] = time.perf_counter() - start
+    return result
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Processes to validate suites in, 0 for one per CPU (default: 1)")
+    parser.add_argument(
+        "--ajv", action="store_true",
+        help="Validate each case with ajv-cli instead of in process")
+    args = parser.parse_args()
+
     if not os.path.exists(CASES_DIR):
         print(f"No cases directory found at {CASES_DIR}")
         return
+    if jsonschema is None and not args.ajv:
+        print("Error: the 'jsonschema' package is required (e.g., 'pip install jsonschema').")
+        sys.exit(1)
 
-    test_files = glob.glob(os.path.join(CASES_DIR, "*.json"))
+    # 1. Standard test suites, 2. .jsonl examples
+    paths = sorted(glob.glob(os.path.join(CASES_DIR, "*.json")))
+    paths += sorted(glob.glob(os.path.join(CASES_DIR, "*.jsonl")))
 
-    total_passed = 0
-    total_failed = 0
+    start = time.perf_counter()
+    if not args.ajv:
+        compile_start = time.perf_counter()
+        get_validators()
+        print(f"Compiled {len(SCHEMAS)} schemas in {(time.perf_counter() - compile_start) * 1000:.1f}ms")
 
-    # 1. Run standard test suites
-    for test_file in sorted(test_files):
-        p, f = run_suite(test_file)
-        total_passed += p
-        total_failed += f
+    workers = args.workers or os.cpu_count()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_file, paths, [args.ajv] * len(paths)))
+    else:
+        results = [run_file(path, args.ajv) for path in paths]
 
-    # 2. Run .jsonl example validation
-    example_path = os.path.join(CASES_DIR, "contact_form_example.jsonl")
-    p, f = validate_jsonl_example(example_path)
-    total_passed += p
-    total_failed += f
+    total_passed = 0
+    total_failed = 0
+    for result in results:
+        print(f"\n{result['title']} in {result['seconds'] * 1000:.1f}ms")
+        if result["schema"]:
+            print(f"Target Schema: {result['schema']}")
+        for line in result["output"]:
+            print(line)
+        total_passed += result["passed"]
+        total_failed += result["failed"]
 
     print("\n" + "="*30)
     print(f"Total Passed: {total_passed}")
     print(f"Total Failed: {total_failed}")
-
-    if os.path.exists(TEMP_FILE):
-        os.remove(TEMP_FILE)
+    print(f"Total Time: {(time.perf_counter() - start) * 1000:.1f}ms")
 
     if total_failed > 0:
         sys.exit(1)